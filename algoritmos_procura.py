@@ -1,134 +1,70 @@
 import math
+import registo
+import metricas
 from queue import Queue
-from collections import deque
 import random
 import numpy as np
 from grafo import Grafo  
 import time 
 from queue import Queue
 import heapq
+from concurrent.futures import ProcessPoolExecutor
+from recozimento import CadeiaRecozimento
+from nucleo_procura import NucleoProcura, AprofundamentoIterativo, PILHA, FILA, HEAP
 
-def procura_DFS(grafo, inicio, fim):
+def _validar_caminho(grafo, veiculo, caminho, custo_acumulado_arestas):
     """
-    Realiza a busca em profundidade (DFS) para encontrar o melhor caminho
-    considerando todos os veículos disponíveis no nó inicial.
-    Retorna o melhor caminho com base no custo mais baixo.
+    Valida a solução de uma procura para o veículo: combustível e velocidade (com a soma das
+    arestas) para a janela de tempo do destino, e custo final finito.
+    Retorna (custo_final, pessoas_socorridas), ou None se o veículo não puder fazer o caminho.
     """
-    start_time = time.time()
-
-    no_origem = grafo.get_node_by_name(inicio)
-    if no_origem.janela_tempo == 0:
-        print(f"[ERRO] O nó de origem '{inicio}' não pode ser utilizado porque o tempo esgotou.")
+    if custo_acumulado_arestas == float('inf') or custo_acumulado_arestas > veiculo.get_combustivel_disponivel():
+        registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho por falta de combustível: %s.",
+            veiculo.get_tipo(), caminho)
         return None
 
-    if no_origem.get_medicamento() == 0:
-        print(f"[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '{inicio}'")
+    tempo_destino = grafo.get_node_by_name(caminho[-1]).janela_tempo
+    if tempo_destino > 0 and (custo_acumulado_arestas / tempo_destino) > veiculo.get_velocidade():
+        registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho por velocidade insuficiente: %s.",
+            veiculo.get_tipo(), caminho)
         return None
 
-    veiculos_disponiveis = grafo.get_veiculos_no(inicio)
-    if not veiculos_disponiveis:
-        print(f"Nó {inicio} não possui veículos disponíveis.")
+    custo_final, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
+    if custo_final == float('inf'):
+        registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho: %s.", veiculo.get_tipo(), caminho)
         return None
 
-    melhores_caminhos = []
-
-    for veiculo in veiculos_disponiveis:
-        if veiculo.get_velocidade() == 0:
-            print(f"[AVISO] Veículo {veiculo.get_tipo()} ignorado devido à velocidade ser 0.")
-            continue
-
-        print(f"Usando veículo: {veiculo.get_tipo()} (Velocidade: {veiculo.get_velocidade()})")
-        stack = [(inicio, [inicio])]  # Pilha para DFS (nó atual, caminho até agora)
-        visited = set()
-
-        while stack:
-            nodo_atual, caminho = stack.pop()
-            if nodo_atual in visited:
-                continue
-
-            visited.add(nodo_atual)
-            print(f"DFS: Visitando {nodo_atual}, Caminho atual: {caminho}")
-
-            # Se o destino foi alcançado
-            if nodo_atual == fim:
-                custo_acumulado_arestas = grafo.calcula_acumulado_arestas(caminho, veiculo)
-                if custo_acumulado_arestas == float('inf') or custo_acumulado_arestas > veiculo.get_combustivel_disponivel():
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por falta de combustível: {caminho}. ")
-                else:
-                    destino = grafo.get_node_by_name(fim)
-                    tempo_destino = destino.janela_tempo
-                    if tempo_destino > 0 and (custo_acumulado_arestas / tempo_destino) > veiculo.get_velocidade():
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por velocidade insuficiente: {caminho}. ")
-                        continue
-
-                    custo_final, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
-
-                    if custo_final == float('inf'):
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho: {caminho}.")
-                    else:
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} PODE COMPLETAR o caminho: {caminho}. Custo final: {custo_final}")
-
-                        melhores_caminhos.append((veiculo, caminho, custo_final, pessoas_socorridas))
-                continue
-
-            # Adicionar vizinhos acessíveis à pilha
-            vizinhos = [
-                (adjacente, caminho + [adjacente])
-                for adjacente, peso, bloqueada, permitidos in grafo.m_graph[nodo_atual]
-                if adjacente not in visited and veiculo.get_tipo() in permitidos and not bloqueada
-            ]
-            vizinhos.sort(key=lambda x: x[0])  # Ordenar alfabeticamente os vizinhos
-            for adjacente, novo_caminho in reversed(vizinhos):
-                stack.append((adjacente, novo_caminho))
-                print(f"Vizinho {adjacente} adicionado à pilha com caminho: {novo_caminho}")
-
-    if melhores_caminhos:
-        melhor_caminho = min(melhores_caminhos, key=lambda x: x[2])  # Ordenar pelo custo
-        veiculo, caminho, custo, pessoas_socorridas = melhor_caminho
-
-        end_time = time.time()
-        print(f"Melhor caminho: {caminho} com veículo {veiculo.get_tipo()} e custo {custo}")
-
-        # Transferir valores apenas para o melhor veículo
-        grafo.transferir_valores(pessoas_socorridas, caminho[0], fim)
-
-        capacidade_restante = veiculo.get_limite_carga() - pessoas_socorridas
-
-        nos_intermediarios = sorted(
-            caminho[1:-1],
-            key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()
-        )
-
-        for no_intermediario in nos_intermediarios:
-            if capacidade_restante <= 0:
-                break
-
-            no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
-            if no_intermediario_obj.populacao == 0 or no_intermediario_obj.janela_tempo == 0:
-                continue
+    registo.debug("[DEBUG] Veículo: %s PODE COMPLETAR o caminho: %s. Custo final: %s",
+        veiculo.get_tipo(), caminho, custo_final)
+    return custo_final, pessoas_socorridas
 
-            medicamentos_para_transferir = min(
-                capacidade_restante,
-                no_intermediario_obj.populacao
-            )
+def procura_DFS(grafo, inicio, fim):
+    """
+    Realiza a busca em profundidade (DFS) para encontrar o melhor caminho
+    considerando todos os veículos disponíveis no nó inicial.
+    Retorna o melhor caminho com base no custo mais baixo.
+    """
+    return concluir_procura(grafo, escolher_rota(grafo, inicio, fim, lambda: _caminhos_DFS(grafo, inicio, fim)))
 
-            if medicamentos_para_transferir > 0:
-                grafo.transferir_valores(
-                    medicamentos_para_transferir,
-                    caminho[0],
-                    no_intermediario
-                )
-                capacidade_restante -= medicamentos_para_transferir
+def _caminhos_DFS(grafo, inicio, fim):
+    id_inicio, id_fim = grafo.get_id(inicio), grafo.get_id(fim)
+    caminhos = []
 
-        grafo.desenha()
+    for veiculo in grafo.get_veiculos_no(inicio):
+        if veiculo.get_velocidade() == 0:
+            registo.resumo("[AVISO] Veículo %s ignorado devido à velocidade ser 0.", veiculo.get_tipo())
+            continue
 
-        print(f"Melhor caminho: {caminho} com veículo {veiculo.get_tipo()} e custo {custo}")
-        print(f"Tempo total de execução: {end_time - start_time:.6f} segundos")
+        registo.debug("Usando veículo: %s (Velocidade: %s)", veiculo.get_tipo(), veiculo.get_velocidade())
+        # Pilha, com os vizinhos expandidos por ordem alfabética
+        nucleo = NucleoProcura(grafo, veiculo.get_tipo(), PILHA, ordenar_sucessores=True, rotulo="DFS")
+        if nucleo.executar(id_inicio, id_fim) is None:
+            continue
 
-        return {veiculo.get_tipo(): (caminho, custo)}
+        caminho = nucleo.caminho(id_fim)
+        caminhos.append((veiculo, caminho, grafo.calcula_acumulado_arestas(caminho, veiculo)))
 
-    print("Nenhum caminho válido encontrado.")
-    return None
+    return caminhos
 
 def procura_BFS(grafo, inicio, fim):
     """
@@ -136,280 +72,249 @@ def procura_BFS(grafo, inicio, fim):
     considerando todos os veículos disponíveis no nó inicial.
     Retorna o melhor caminho com base no custo mais baixo.
     """
-    import time
-    start_time = time.time()
-
-    no_origem = grafo.get_node_by_name(inicio)
-    if no_origem.janela_tempo == 0:
-        print(f"[ERRO] O nó de origem '{inicio}' não pode ser utilizado porque o tempo esgotou.")
-        return None
-
-    if no_origem.get_medicamento() == 0:
-        print(f"[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '{inicio}'")
-        return None
-
-    veiculos_disponiveis = grafo.get_veiculos_no(inicio)
-    if not veiculos_disponiveis:
-        print(f"Nó {inicio} não possui veículos disponíveis.")
-        return None
+    return concluir_procura(grafo, escolher_rota(grafo, inicio, fim, lambda: _caminhos_BFS(grafo, inicio, fim)))
 
-    melhores_caminhos = []
+def _caminhos_BFS(grafo, inicio, fim):
+    id_inicio, id_fim = grafo.get_id(inicio), grafo.get_id(fim)
+    caminhos = []
 
-    for veiculo in veiculos_disponiveis:
+    for veiculo in grafo.get_veiculos_no(inicio):
         if veiculo.get_velocidade() == 0:
-            print(f"[AVISO] Veículo {veiculo.get_tipo()} ignorado devido à velocidade ser 0.")
+            registo.resumo("[AVISO] Veículo %s ignorado devido à velocidade ser 0.", veiculo.get_tipo())
             continue
 
-        print(f"Usando veículo: {veiculo.get_tipo()} (Velocidade: {veiculo.get_velocidade()})")
-        queue = [(inicio, [inicio])]  # Fila para BFS (nó atual, caminho até agora)
-        visited = set()
-
-        while queue:
-            nodo_atual, caminho = queue.pop(0)
-            if nodo_atual in visited:
-                continue
-
-            visited.add(nodo_atual)
-            print(f"BFS: Visitando {nodo_atual}, Caminho atual: {caminho}")
-
-            # Se o destino foi alcançado
-            if nodo_atual == fim:
-                custo_acumulado_arestas = grafo.calcula_acumulado_arestas(caminho, veiculo)
-                print(f"[DEBUG] Caminho completo para veículo {veiculo.get_tipo()}: {caminho} com custo acumulado: {custo_acumulado_arestas}")
-
-                if custo_acumulado_arestas == float('inf') or custo_acumulado_arestas > veiculo.get_combustivel_disponivel():
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por falta de combustível: {caminho}.")
-                else:
-                    destino = grafo.get_node_by_name(fim)
-                    tempo_destino = destino.janela_tempo
-                    if tempo_destino > 0 and (custo_acumulado_arestas / tempo_destino) > veiculo.get_velocidade():
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por velocidade insuficiente: {caminho}.")
-                        continue
+        registo.debug("Usando veículo: %s (Velocidade: %s)", veiculo.get_tipo(), veiculo.get_velocidade())
+        nucleo = NucleoProcura(grafo, veiculo.get_tipo(), FILA, rotulo="BFS")
+        if nucleo.executar(id_inicio, id_fim) is None:
+            continue
 
-                    custo_final, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
+        caminho = nucleo.caminho(id_fim)
+        custo_acumulado_arestas = grafo.calcula_acumulado_arestas(caminho, veiculo)
+        registo.debug("[DEBUG] Caminho completo para veículo %s: %s com custo acumulado: %s",
+            veiculo.get_tipo(), caminho, custo_acumulado_arestas)
+        caminhos.append((veiculo, caminho, custo_acumulado_arestas))
 
-                    if custo_final == float('inf'):
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho: {caminho}.")
-                    else:
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} PODE COMPLETAR o caminho: {caminho}. Custo final: {custo_final}")
+    return caminhos
 
-                        melhores_caminhos.append((veiculo, caminho, custo_final, pessoas_socorridas))
-                continue
-
-            # Adicionar vizinhos acessíveis à fila
-            vizinhos = [
-                (adjacente, caminho + [adjacente])
-                for adjacente, peso, bloqueada, permitidos in grafo.m_graph[nodo_atual]
-                if adjacente not in visited and veiculo.get_tipo() in permitidos and not bloqueada
-            ]
-            for adjacente, novo_caminho in vizinhos:
-                queue.append((adjacente, novo_caminho))
-                print(f"Vizinho {adjacente} adicionado à fila com caminho: {novo_caminho}")
-
-    if melhores_caminhos:
-        melhor_caminho = min(melhores_caminhos, key=lambda x: x[2])  # Ordenar pelo custo
-        veiculo, caminho, custo, pessoas_socorridas = melhor_caminho
+def procura_Iterativa(grafo, inicio, fim, max_profundidade, max_expansoes=None):
+    """
+    Procura em profundidade com aprofundamento iterativo (limites de 0 a max_profundidade
+    arestas), em memória proporcional à profundidade (ver AprofundamentoIterativo), para cada
+    veículo disponível no nó inicial. Retorna o melhor caminho com base no custo mais baixo.
+    max_expansoes limita o trabalho por veículo (None para não limitar); uma procura
+    interrompida é indicada como tal, e não como a falta de caminho.
+    """
+    return concluir_procura(grafo, escolher_rota(
+        grafo, inicio, fim, lambda: _caminhos_Iterativa(grafo, inicio, fim, max_profundidade, max_expansoes)))
 
-        end_time = time.time()
-        print(f"Melhor caminho: {caminho} com veículo {veiculo.get_tipo()} e custo {custo}")
-        print(f"Tempo total de execução: {end_time - start_time:.6f} segundos")
+def _caminhos_Iterativa(grafo, inicio, fim, max_profundidade, max_expansoes=None):
+    id_inicio, id_fim = grafo.get_id(inicio), grafo.get_id(fim)
+    caminhos = []
 
-        # Transferir valores para o destino e nós intermediários
-        grafo.transferir_valores(pessoas_socorridas, caminho[0], fim)
+    #Fazer procura por veículo
+    for veiculo in grafo.get_veiculos_no(inicio):
+        registo.debug("Usando veículo: %s (Velocidade: %s)", veiculo.get_tipo(), veiculo.get_velocidade())
+        combustivel = veiculo.get_combustivel_disponivel()
+        procura = AprofundamentoIterativo(grafo, veiculo.get_tipo(), aceitar=lambda atual, vizinho, peso, g: g <= combustivel,
+                                          max_expansoes=max_expansoes, rotulo="Iterativo")
+        resultado = procura.executar(id_inicio, id_fim, max_profundidade)
+        if procura.interrompida:
+            caminhos.append((veiculo, None, None))
+        if resultado is None:
+            continue
 
-        capacidade_restante = veiculo.get_limite_carga() - pessoas_socorridas
+        caminho = procura.nomes(resultado)
+        registo.debug("Solução encontrada com profundidade %s", len(caminho) - 1)
+        caminhos.append((veiculo, caminho, grafo.calcula_acumulado_arestas(caminho, veiculo)))
 
-        # Distribuir medicamentos para nós intermediários
-        nos_intermediarios = sorted(
-            caminho[1:-1],
-            key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()
-        )
+    return caminhos
 
-        for no_intermediario in nos_intermediarios:
-            no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
-            if no_intermediario_obj.janela_tempo == 0:  # Ignorar nós com janela_tempo == 0
-                print(f"[DEBUG] Ignorar nó '{no_intermediario}' devido a janela_tempo = 0.")
-                continue
+def procura_IDAstar(grafo, inicio, fim, heuristica="alt", max_expansoes=None):
+    """
+    IDA*: aprofundamento iterativo com limites em f(n) = g(n) + h(n), com as mesmas
+    heurísticas e validações de combustível e velocidade de procura_aStar. Só guarda o
+    caminho atual (memória proporcional à profundidade, ver AprofundamentoIterativo), o que o
+    torna utilizável em mapas onde a fronteira do A* ou do custo uniforme não cabe em memória,
+    à custa de voltar a expandir nós em cada iteração. max_expansoes limita o trabalho por
+    veículo (None para não limitar); uma procura interrompida é indicada como tal, e não como
+    a falta de caminho.
+
+    Sem limite de expansões, com heuristica="alt" o custo encontrado é o do A* com a mesma
+    heurística (que aplica a mesma regra da janela de tempo da origem em cada aresta).
+    """
+    return concluir_procura(grafo, escolher_rota(
+        grafo, inicio, fim, lambda: _caminhos_IDAstar(grafo, inicio, fim, heuristica, max_expansoes)))
 
-            if capacidade_restante <= 0:
-                break
+def _caminhos_IDAstar(grafo, inicio, fim, heuristica="alt", max_expansoes=None):
+    no_origem = grafo.get_node_by_name(inicio)
+    no_destino = grafo.get_node_by_name(fim)
+    id_inicio, id_fim = grafo.get_id(inicio), grafo.get_id(fim)
+    if heuristica != "alt":
+        h_euclidiana = [grafo.calcula_heuristica(no, no_destino) for no in grafo.m_nodes]
 
-            if no_intermediario_obj.populacao == 0:
-                continue
+    caminhos = []
 
-            medicamentos_para_transferir = min(
-                capacidade_restante,
-                no_intermediario_obj.populacao
-            )
+    for veiculo in grafo.get_veiculos_no(inicio):
+        if veiculo.get_velocidade() == 0:
+            registo.resumo("[AVISO] Veículo %s ignorado devido à velocidade ser 0.", veiculo.get_tipo())
+            continue
 
-            if medicamentos_para_transferir > 0:
-                grafo.transferir_valores(
-                    medicamentos_para_transferir,
-                    caminho[0],
-                    no_intermediario
-                )
-                capacidade_restante -= medicamentos_para_transferir
+        registo.debug("Usando veículo: %s (Velocidade: %s, Combustível: %s)",
+            veiculo.get_tipo(), veiculo.get_velocidade(), veiculo.get_combustivel_disponivel())
+
+        # h(n) por id: cada nó é avaliado muitas vezes ao longo das iterações
+        if heuristica == "alt":
+            h = grafo.get_marcos().heuristica_ids(veiculo.get_tipo(), fim)
+        else:
+            h = h_euclidiana
+
+        def aceitar(atual, vizinho, peso, novo_custo):
+            return (novo_custo <= veiculo.get_combustivel_disponivel()
+                    and peso / veiculo.get_velocidade() <= no_origem.janela_tempo)
+
+        procura = AprofundamentoIterativo(grafo, veiculo.get_tipo(), h=h.__getitem__, aceitar=aceitar,
+                                          max_expansoes=max_expansoes, rotulo="IDA*")
+        # Com h admissível (ALT), nenhum caminho com f acima do combustível cabe no combustível;
+        # a euclidiana não é um limite inferior, e o combustível só é verificado em aceitar
+        limite = veiculo.get_combustivel_disponivel() if heuristica == "alt" else float('inf')
+        resultado = procura.executar(id_inicio, id_fim, limite)
+        if procura.interrompida:
+            caminhos.append((veiculo, None, None))
+        if resultado is None:
+            continue
 
-        grafo.desenha()
+        caminho = procura.nomes(resultado)
+        registo.debug("[SUCESSO] Caminho encontrado: %s em %s iterações", caminho, procura.iteracoes)
+        caminhos.append((veiculo, caminho, procura.custo))
 
-        return {veiculo.get_tipo(): (caminho, custo)}
+    return caminhos
 
-    print("Nenhum caminho válido encontrado.")
-    return None
+def escolher_rota(grafo, inicio, fim, calcular_caminhos):
+    """
+    Escolhe a rota de uma procura entre os caminhos de cada veículo disponível em inicio,
+    dados por calcular_caminhos() -> [(veiculo, caminho, soma das arestas)] (caminho None se
+    a procura do veículo parou no limite de expansões). A origem é validada antes de calcular
+    os caminhos, e cada caminho com _validar_caminho; as duas validações leem os medicamentos,
+    a população e as janelas de tempo atuais, que os caminhos não usam (ver ETAPAS_PROCURA).
+    Retorna (veiculo, caminho, custo, pessoas_socorridas) do caminho de menor custo, ou None.
+    """
+    start_time = time.time()
 
-def procura_Iterativa(grafo, inicio, fim, max_profundidade):
-    
-    veiculos_disponiveis = grafo.get_veiculos_no(inicio)
-    if not veiculos_disponiveis:
-        print(f"Nó {inicio} não possui veículos disponíveis.")
+    if not _validar_origem(grafo, inicio):
+        return None
+    if grafo.get_node_by_name(fim) is None:
+        registo.resumo("[ERRO] O nó de destino '%s' não existe.", fim)
         return None
 
-    caminhos = {}
-
-    #Fazer procura por veículo
-    for veiculo in veiculos_disponiveis:
-        
-        #Aumentar a profundidade iterativamente
-        for profundidade in range(max_profundidade + 1):
+    melhores_caminhos = []
+    interrompidas = []
 
-            resultado = procura_Iterativa_aux(grafo, inicio, fim, veiculo.get_tipo(), profundidade)
+    for veiculo, caminho, distancia in calcular_caminhos():
+        if caminho is None:
+            interrompidas.append(veiculo.get_tipo())
+            continue
+        solucao = _validar_caminho(grafo, veiculo, caminho, distancia)
+        if solucao is not None:
+            melhores_caminhos.append((veiculo, caminho) + solucao)
 
-            #Encontrou a solução, retorna-a
-            if resultado:
-                print("Solução encontrada")
-                caminhos[(veiculo.get_tipo(),profundidade)] = resultado
-                break
-    
-    if caminhos:
-        #return caminhos
-    
-        melhores_caminhos = []
-        for k,v in caminhos.items():
-            melhores_caminhos.append(v)    
-        
+    if melhores_caminhos:
         melhor_caminho = min(melhores_caminhos, key=lambda x: x[2])  # Ordenar pelo custo
-        veiculo, caminho, custo, pessoas_socorridas, distancia, end_time, start_time = melhor_caminho
-
-        print(f"Melhor caminho: {caminho} com veículo {veiculo.get_tipo()} e custo {custo}")
-        print(f"Distância percorrida: {distancia}")
-        print(f"Tempo de execução: {end_time - start_time:.6f} segundos")
-        
-        # Transferir valores apenas para o melhor veículo
-        grafo.transferir_valores(pessoas_socorridas, caminho[0], fim)
-
-        capacidade_restante = veiculo.get_limite_carga() - pessoas_socorridas
-
-        nos_intermediarios = sorted(
-            caminho[1:-1],
-            key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()
-        )
-
-        for no_intermediario in nos_intermediarios:
-            if capacidade_restante <= 0:
-                break
-
-            no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
-            if no_intermediario_obj.populacao == 0 or no_intermediario_obj.janela_tempo == 0:
-                continue
+        veiculo, caminho, custo, pessoas_socorridas = melhor_caminho
 
-            medicamentos_para_transferir = min(
-                capacidade_restante,
-                no_intermediario_obj.populacao
-            )
+        end_time = time.time()
+        registo.resumo("Melhor caminho: %s com veículo %s e custo %s", caminho, veiculo.get_tipo(), custo)
+        registo.resumo("Tempo total de execução: %.6f segundos", end_time - start_time)
 
-            if medicamentos_para_transferir > 0:
-                grafo.transferir_valores(
-                    medicamentos_para_transferir,
-                    caminho[0],
-                    no_intermediario
-                )
-                capacidade_restante -= medicamentos_para_transferir
+        return veiculo, caminho, custo, pessoas_socorridas
 
-        grafo.desenha()
-        
-        return {veiculo.get_tipo(): (caminho,custo)}
+    if interrompidas:
+        registo.resumo("[AVISO] Procura interrompida pelo limite de expansões (veículos: %s), "
+            "sem saber se existe caminho. Aumente o limite de expansões.", ", ".join(interrompidas))
+        return None
 
-    else:
-        print("[ERRO] Não foi achado solução :/")
-        return None 
+    registo.resumo("Nenhum caminho válido encontrado.")
+    return None
 
-def procura_Iterativa_aux(grafo, inicio, fim, veiculoAtual, limite):
+def _validar_origem(grafo, inicio):
     """
-    Realiza a busca em profundidade (Iterativa) para encontrar o melhor caminho.
+    Valida o nó de origem de uma procura (existência, janela de tempo, medicamentos e veículos).
+    Retorna a lista de veículos disponíveis no nó, ordenada por custo, ou None se a origem for inválida.
     """
-    
-    profundidade = limite
-    
-    start_time = time.time()
     no_origem = grafo.get_node_by_name(inicio)
+    if no_origem is None:
+        registo.resumo("[ERRO] O nó de origem '%s' não existe.", inicio)
+        return None
+
     if no_origem.janela_tempo == 0:
-        print(f"[ERRO] O nó de origem '{inicio}' não pode ser utilizado porque o tempo esgotou.")
+        registo.resumo("[ERRO] O nó de origem '%s' não pode ser utilizado porque o tempo esgotou.", inicio)
         return None
 
     if no_origem.get_medicamento() == 0:
-        print(f"[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '{inicio}'")
+        registo.resumo("[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '%s'", inicio)
         return None
 
     veiculos_disponiveis = grafo.get_veiculos_no(inicio)
     if not veiculos_disponiveis:
-        print(f"Nó {inicio} não possui veículos disponíveis.")
+        registo.resumo("Nó %s não possui veículos disponíveis.", inicio)
         return None
 
-    melhores_caminhos = []
+    return veiculos_disponiveis
 
-    for veiculo in veiculos_disponiveis:
-        
-        if veiculoAtual != veiculo.get_tipo():
-            continue
-        
-        print(f"Usando veículo: {veiculo.get_tipo()} (Velocidade: {veiculo.get_velocidade()})")
-        stack = [(inicio, [inicio])]  # Pilha para DFS (nó atual, caminho até agora)
-        visited = set()
+def _distribuir_medicamentos(grafo, veiculo, caminho, pessoas_socorridas):
+    """
+    Transfere os medicamentos da origem para o destino do caminho e, com a capacidade
+    restante do veículo, para os nós intermédios por ordem de prioridade.
+    """
+    # Transferir valores para o destino e nós intermediários
+    grafo.transferir_valores(pessoas_socorridas, caminho[0], caminho[-1])
 
-        while stack:
-            nodo_atual, caminho = stack.pop()
-            if nodo_atual in visited:
-                continue
+    capacidade_restante = veiculo.get_limite_carga() - pessoas_socorridas
 
-            visited.add(nodo_atual)
-            print(f"Iterativo: Visitando {nodo_atual}, Profundidade: {profundidade}, Caminho atual: {caminho}")
+    # Distribuir medicamentos para nós intermediários
+    nos_intermediarios = sorted(
+        caminho[1:-1],
+        key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()
+    )
 
-            if nodo_atual == fim:
-                custo_acumulado_arestas = grafo.calcula_acumulado_arestas(caminho, veiculo)
-                if custo_acumulado_arestas == float('inf') or custo_acumulado_arestas > veiculo.get_combustivel_disponivel():
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por falta de combustível: {caminho}.")
-                    continue
+    for no_intermediario in nos_intermediarios:
+        no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
+        if no_intermediario_obj.janela_tempo == 0:  # Ignorar nós com janela_tempo = 0
+            registo.debug("[DEBUG] Ignorar nó '%s' devido a janela_tempo = 0.", no_intermediario)
+            continue
 
-                destino = grafo.get_node_by_name(fim)
-                tempo_destino = destino.janela_tempo
-                if tempo_destino > 0 and (custo_acumulado_arestas / tempo_destino) > veiculo.get_velocidade():
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por velocidade insuficiente: {caminho}.")
-                    continue
+        if capacidade_restante <= 0:
+            break
 
-                custo_final, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
+        if no_intermediario_obj.populacao == 0:
+            continue
 
-                if custo_final != float('inf'):
-                    melhores_caminhos.append((veiculo, caminho, custo_final, pessoas_socorridas, custo_acumulado_arestas))
-                continue
+        medicamentos_para_transferir = min(
+            capacidade_restante,
+            no_intermediario_obj.populacao
+        )
 
-            vizinhos = [
-                (adjacente, caminho + [adjacente])
-                for adjacente, peso, bloqueada, permitidos in grafo.m_graph[nodo_atual]
-                if adjacente not in visited and veiculo.get_tipo() in permitidos and not bloqueada
-            ]
-            if limite > 0:
-                limite = limite - 1
-                for adjacente, novo_caminho in reversed(vizinhos):
-                    stack.append((adjacente, novo_caminho))
-                    print(f"Vizinho {adjacente} adicionado à pilha com caminho: {novo_caminho}")
+        if medicamentos_para_transferir > 0:
+            grafo.transferir_valores(
+                medicamentos_para_transferir,
+                caminho[0],
+                no_intermediario
+            )
+            capacidade_restante -= medicamentos_para_transferir
 
-    end_time = time.time()
-    if melhores_caminhos:
-        melhor_caminho = min(melhores_caminhos, key=lambda x: x[2])  # Ordenar pelo custo
-        veiculo, caminho, custo, pessoas_socorridas, distancia = melhor_caminho
-        return (veiculo, caminho, custo_final, pessoas_socorridas, custo_acumulado_arestas,end_time,start_time)
+def concluir_procura(grafo, solucao, distribuir=_distribuir_medicamentos):
+    """
+    Distribui os medicamentos pela rota escolhida por uma procura, (veiculo, caminho, custo,
+    pessoas_socorridas) ou None, e redesenha o grafo.
+    Retorna {tipo_veiculo: (caminho, custo)}, ou None se não houver rota.
+    """
+    if solucao is None:
+        return None
 
-    return None
+    veiculo, caminho, custo, pessoas_socorridas = solucao
+    distribuir(grafo, veiculo, caminho, pessoas_socorridas)
+    grafo.desenha()
+
+    return {veiculo.get_tipo(): (caminho, custo)}
 
 def procura_CustoUniforme(grafo, inicio, fim):
     """
@@ -417,370 +322,546 @@ def procura_CustoUniforme(grafo, inicio, fim):
     considerando todos os veículos disponíveis no nó inicial.
     Retorna o melhor caminho com base no custo mais baixo.
     """
-    start_time = time.time()
+    return concluir_procura(grafo, escolher_rota(grafo, inicio, fim, lambda: _caminhos_CustoUniforme(grafo, inicio, fim)))
 
-    no_origem = grafo.get_node_by_name(inicio)
-    if no_origem.janela_tempo == 0:
-        print(f"[ERRO] O nó de origem '{inicio}' não pode ser utilizado porque o tempo esgotou.")
-        return None
+def _caminhos_CustoUniforme(grafo, inicio, fim):
+    id_inicio, id_fim = grafo.get_id(inicio), grafo.get_id(fim)
+    caminhos = []
 
-    if no_origem.get_medicamento() == 0:
-        print(f"[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '{inicio}'")
-        return None
+    for veiculo in grafo.get_veiculos_no(inicio):
+        registo.debug("Usando veículo: %s (Velocidade: %s)", veiculo.get_tipo(), veiculo.get_velocidade())
 
-    veiculos_disponiveis = grafo.get_veiculos_no(inicio)
-    if not veiculos_disponiveis:
-        print(f"Nó {inicio} não possui veículos disponíveis.")
-        return None
+        # Heap por (custo acumulado, nome); em empate de custo fica o caminho menor por nomes
+        nucleo = NucleoProcura(grafo, veiculo.get_tipo(), HEAP, relaxar=True, desempate_caminhos=True,
+                               rotulo="Custo uniforme")
+        if nucleo.executar(id_inicio, id_fim) is None:
+            continue
 
-    melhores_caminhos = []
+        caminhos.append((veiculo, nucleo.caminho(id_fim), nucleo.custos[id_fim]))
 
-    for veiculo in veiculos_disponiveis:
-        print(f"Usando veículo: {veiculo.get_tipo()} (Velocidade: {veiculo.get_velocidade()})")
+    return caminhos
 
-        heap = [(0, inicio, [])]  # (custo acumulado, nó atual, caminho)
-        visitados = {}
+def procura_multi_veiculo(grafo, inicio, fim):
+    """
+    Procura de custo uniforme única sobre estados (nó, veículo), em vez de uma procura
+    completa por cada veículo disponível no nó inicial.
+
+    O custo final de um caminho (calcula_custo) é a soma das arestas multiplicada por
+    custo_veiculo / pessoas_socorridas, um fator constante por veículo. Por isso, cada etiqueta
+    (nó, veículo) é ordenada pela distância já escalada pelo fator do seu veículo, e a primeira
+    etiqueta do destino a sair da fila é a melhor solução entre todos os veículos. As etiquetas
+    que excedem o combustível ou a janela de tempo do destino são descartadas à partida, e os
+    veículos que não conseguem socorrer ninguém nem chegam a entrar na procura.
+
+    Retorna o mesmo formato que procura_CustoUniforme: {tipo_veiculo: (caminho, custo)}.
+    Entre caminhos de custo igual, o caminho escolhido pode diferir do de procura_CustoUniforme.
+    """
+    return concluir_procura(grafo, _rota_multi_veiculo(grafo, inicio, fim))
 
-        while heap:
-            custo_atual, nodo_atual, caminho = heapq.heappop(heap)
+def _rota_multi_veiculo(grafo, inicio, fim):
+    """
+    Parte de procura_multi_veiculo que escolhe a rota, sem alterar o grafo: retorna
+    (veiculo, caminho, custo, pessoas_socorridas), ou None se não houver caminho válido.
+    """
+    start_time = time.time()
 
-            # Se o nó já foi visitado com um custo menor, ignore
-            if nodo_atual in visitados and visitados[nodo_atual] <= custo_atual:
-                continue
-            visitados[nodo_atual] = custo_atual
+    veiculos_disponiveis = _validar_origem(grafo, inicio)
+    if not veiculos_disponiveis:
+        return None
 
-            caminho = caminho + [nodo_atual]
-            print(f"Custo uniforme: Visitando {nodo_atual}, Custo acumulado: {custo_atual}, Caminho: {caminho}")
+    no_origem = grafo.get_node_by_name(inicio)
+    destino = grafo.get_node_by_name(fim)
+    if destino is None:
+        registo.resumo("[ERRO] O nó de destino '%s' não existe.", fim)
+        return None
 
-            if nodo_atual == fim:
-                custo_acumulado_arestas = custo_atual
-                if custo_acumulado_arestas > veiculo.get_combustivel_disponivel():
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por falta de combustível: {caminho}.")
-                    continue
+    # Fator de custo e distância máxima admissível de cada veículo
+    fatores = []
+    limites = []
+    veiculos = []
+    for veiculo in veiculos_disponiveis:
+        pessoas_socorridas = min(no_origem.get_medicamento(), destino.populacao, veiculo.get_limite_carga())
+        if pessoas_socorridas == 0:
+            registo.debug("[DEBUG] Veículo: %s não consegue socorrer ninguém em %s.", veiculo.get_tipo(), fim)
+            continue
 
-                destino = grafo.get_node_by_name(fim)
-                tempo_destino = destino.janela_tempo
-                if tempo_destino > 0 and (custo_acumulado_arestas / tempo_destino) > veiculo.get_velocidade():
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por velocidade insuficiente: {caminho}.")
-                    continue
+        limite = veiculo.get_combustivel_disponivel()
+        if destino.janela_tempo > 0:
+            limite = min(limite, veiculo.get_velocidade() * destino.janela_tempo)
 
-                custo_final, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
+        veiculos.append(veiculo)
+        fatores.append(veiculo.get_custo() / pessoas_socorridas)
+        limites.append(limite)
 
-                if custo_final == float('inf'):
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho: {caminho}.")
-                else:
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} PODE COMPLETAR o caminho: {caminho}. Custo final: {custo_final}")
+    # Etiquetas: (custo escalado, distância, índice do veículo, nó)
+    heap = [(0, 0, v, inicio) for v in range(len(veiculos))]
+    heapq.heapify(heap)
+    distancias = {(inicio, v): 0 for v in range(len(veiculos))}
+    pais = {}
+    fechados = set()
 
-                    melhores_caminhos.append((veiculo, caminho, custo_final, pessoas_socorridas))
+    while heap:
+        _, distancia, v, nodo_atual = heapq.heappop(heap)
+        if (nodo_atual, v) in fechados:
+            continue
+        fechados.add((nodo_atual, v))
+        metricas.nos_expandidos += 1
+        registo.trace("Multi-veículo: Visitando %s com %s, Distância: %s", nodo_atual, veiculos[v].get_tipo(), distancia)
+
+        if nodo_atual == fim:
+            veiculo = veiculos[v]
+            caminho = [fim]
+            while caminho[-1] != inicio:
+                caminho.append(pais[(caminho[-1], v)])
+            caminho.reverse()
+
+            custo, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
+            end_time = time.time()
+            registo.resumo("Melhor caminho: %s com veículo %s e custo %s", caminho, veiculo.get_tipo(), custo)
+            registo.resumo("Tempo total de execução: %.6f segundos", end_time - start_time)
+
+            return veiculo, caminho, custo, pessoas_socorridas
+
+        for adjacente, peso in grafo.getNeighbours(nodo_atual, veiculos[v].get_tipo()):
+            nova_distancia = distancia + peso
+            if nova_distancia > limites[v]:
                 continue
+            if nova_distancia < distancias.get((adjacente, v), float('inf')):
+                distancias[(adjacente, v)] = nova_distancia
+                pais[(adjacente, v)] = nodo_atual
+                heapq.heappush(heap, (nova_distancia * fatores[v], nova_distancia, v, adjacente))
 
-            for adjacente, peso, bloqueada, permitidos in grafo.m_graph[nodo_atual]:
-                if veiculo.get_tipo() in permitidos and not bloqueada:
-                    novo_custo = custo_atual + peso
-                    heapq.heappush(heap, (novo_custo, adjacente, caminho))
-                    print(f"Vizinho {adjacente} adicionado ao heap com custo acumulado: {novo_custo}")
+    registo.resumo("Nenhum caminho válido encontrado.")
+    return None
 
-    if melhores_caminhos:
-        melhor_caminho = min(melhores_caminhos, key=lambda x: x[2])  # Ordenar pelo custo
-        veiculo, caminho, custo, pessoas_socorridas = melhor_caminho
+def _caminhos_por_veiculo(grafo, inicio, caminho_mais_curto):
+    """
+    Caminhos de cada veículo disponível em inicio dados por caminho_mais_curto(tipo_veiculo)
+    -> (distância, caminho) ou (INF, None), no formato de escolher_rota.
+    """
+    caminhos = []
+    for veiculo in grafo.get_veiculos_no(inicio):
+        distancia, caminho = caminho_mais_curto(veiculo.get_tipo())
+        if caminho is None:
+            registo.debug("[DEBUG] Veículo: %s não tem caminho.", veiculo.get_tipo())
+            continue
+        caminhos.append((veiculo, caminho, distancia))
+    return caminhos
 
-        end_time = time.time()
-        print(f"Melhor caminho: {caminho} com veículo {veiculo.get_tipo()} e custo {custo}")
-        print(f"Tempo total de execução: {end_time - start_time:.6f} segundos")
+def procura_hierarquias(grafo, inicio, fim):
+    """
+    Custo uniforme sobre as hierarquias de contração do grafo (ver hierarquias.py).
+    O caminho mais curto de cada veículo disponível é obtido por uma consulta à hierarquia da
+    sua classe de permissões e desdobrado nos nós originais; a validação (combustível, janela
+    de tempo), o custo e a distribuição de medicamentos são os de procura_CustoUniforme.
+
+    As hierarquias são construídas na primeira consulta e reaproveitadas enquanto as arestas
+    não mudarem, pelo que esta procura se destina ao Ambiente Estático.
+    Retorna o mesmo formato que procura_CustoUniforme: {tipo_veiculo: (caminho, custo)}.
+    """
+    return concluir_procura(grafo, escolher_rota(grafo, inicio, fim, lambda: _caminhos_hierarquias(grafo, inicio, fim)))
 
-        # Transferir valores para o destino e nós intermediários
-        grafo.transferir_valores(pessoas_socorridas, caminho[0], fim)
+def _caminhos_hierarquias(grafo, inicio, fim):
+    return _caminhos_por_veiculo(
+        grafo, inicio, lambda tipo: grafo.get_hierarquias().caminho_mais_curto(inicio, fim, tipo))
 
-        capacidade_restante = veiculo.get_limite_carga() - pessoas_socorridas
+def _caminho_bidirecional(grafo, inicio, fim, tipo, potencial=None):
+    """
+    Dijkstra bidirecional para um tipo de veículo: uma procura avança de inicio pelas arestas
+    de saída (getNeighbours) e outra recua de fim pelas arestas de entrada (getPredecessores),
+    alternando pela fronteira de menor chave, até a soma das duas chaves mínimas atingir o melhor
+    caminho já encontrado entre as duas procuras.
+
+    potencial, se dado, é uma função p(nome) consistente usada como A* bidirecional: a procura
+    direta ordena por d + p e a inversa por d - p (potenciais simétricos), e os nós com
+    p infinito são ignorados.
+    Retorna (distância, caminho) ou (INF, None).
+    """
+    INF = float('inf')
+    if inicio == fim:
+        return 0, [inicio]
+
+    p = potencial or (lambda nome: 0)
+    if INF in (p(inicio), p(fim)):
+        return INF, None
+
+    sinais = (1, -1)
+    vizinhos = (grafo.getNeighbours, grafo.getPredecessores)
+    distancias = ({inicio: 0}, {fim: 0})
+    pais = ({inicio: None}, {fim: None})
+    filas = ([(p(inicio), inicio)], [(-p(fim), fim)])
+    fechados = (set(), set())
+    melhor, ligacao = INF, None  # ligacao: aresta (u, w) em que as procuras se encontram
+
+    while filas[0] and filas[1]:
+        if filas[0][0][0] + filas[1][0][0] >= melhor:
+            break
 
-        # Distribuir medicamentos para nós intermediários
-        nos_intermediarios = sorted(
-            caminho[1:-1],
-            key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()
-        )
+        lado = 0 if filas[0][0][0] <= filas[1][0][0] else 1
+        _, atual = heapq.heappop(filas[lado])
+        if atual in fechados[lado]:
+            continue
+        fechados[lado].add(atual)
+        metricas.nos_expandidos += 1
+        registo.trace("Bidirecional (%s): Visitando %s, Distância: %s",
+            "direta" if lado == 0 else "inversa", atual, distancias[lado][atual])
+
+        for adjacente, peso in vizinhos[lado](atual, tipo):
+            nova = distancias[lado][atual] + peso
+            if nova < distancias[lado].get(adjacente, INF):
+                potencial_adjacente = p(adjacente)
+                if potencial_adjacente == INF:
+                    continue
+                distancias[lado][adjacente] = nova
+                pais[lado][adjacente] = atual
+                heapq.heappush(filas[lado], (nova + sinais[lado] * potencial_adjacente, adjacente))
+
+            outra = distancias[1 - lado].get(adjacente)
+            if outra is not None and distancias[lado][atual] + peso + outra < melhor:
+                melhor = distancias[lado][atual] + peso + outra
+                ligacao = (atual, adjacente) if lado == 0 else (adjacente, atual)
+
+    if ligacao is None:
+        return INF, None
+
+    caminho = [ligacao[0]]
+    while pais[0][caminho[-1]] is not None:
+        caminho.append(pais[0][caminho[-1]])
+    caminho.reverse()
+    caminho.append(ligacao[1])
+    while pais[1][caminho[-1]] is not None:
+        caminho.append(pais[1][caminho[-1]])
+    return melhor, caminho
+
+def procura_CustoUniforme_bidirecional(grafo, inicio, fim):
+    """
+    Variante bidirecional de procura_CustoUniforme: para cada veículo, as procuras a partir
+    da origem e do destino encontram-se a meio, o que reduz muito a fronteira em mapas longos
+    e estreitos. A validação, o custo e a distribuição de medicamentos são os mesmos.
+    Retorna o mesmo formato que procura_CustoUniforme: {tipo_veiculo: (caminho, custo)}.
+    """
+    return concluir_procura(grafo, escolher_rota(
+        grafo, inicio, fim, lambda: _caminhos_CustoUniforme_bidirecional(grafo, inicio, fim)))
 
-        for no_intermediario in nos_intermediarios:
-            no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
-            if no_intermediario_obj.janela_tempo == 0:  # Ignorar nós com janela_tempo = 0
-                print(f"[DEBUG] Ignorar nó '{no_intermediario}' devido a janela_tempo = 0.")
-                continue
+def _caminhos_CustoUniforme_bidirecional(grafo, inicio, fim):
+    return _caminhos_por_veiculo(grafo, inicio, lambda tipo: _caminho_bidirecional(grafo, inicio, fim, tipo))
 
-            if capacidade_restante <= 0:
-                break
+def procura_aStar_bidirecional(grafo, inicio, fim):
+    """
+    Variante bidirecional de procura_aStar com a heurística ALT. Usa a média dos potenciais
+    das duas direções, p(v) = (h_fim(v) - h_inicio(v)) / 2, que é consistente em ambas, pelo
+    que o caminho encontrado é o mais curto de cada veículo, como em procura_CustoUniforme.
+    Retorna o mesmo formato que procura_aStar: {tipo_veiculo: (caminho, custo)}.
+    """
+    return concluir_procura(grafo, escolher_rota(
+        grafo, inicio, fim, lambda: _caminhos_aStar_bidirecional(grafo, inicio, fim)))
 
-            if no_intermediario_obj.populacao == 0:
-                continue
+def _caminhos_aStar_bidirecional(grafo, inicio, fim):
+    def caminho_mais_curto(tipo):
+        marcos = grafo.get_marcos()
+        h_fim = marcos.heuristica(tipo, fim)
+        h_inicio = marcos.heuristica_origem(tipo, inicio)
 
-            medicamentos_para_transferir = min(
-                capacidade_restante,
-                no_intermediario_obj.populacao
-            )
+        def potencial(nome):
+            a, b = h_fim(nome), h_inicio(nome)
+            # Nós que não chegam ao destino, ou a que a origem não chega, ficam de fora
+            return float('inf') if float('inf') in (a, b) else (a - b) / 2
 
-            if medicamentos_para_transferir > 0:
-                grafo.transferir_valores(
-                    medicamentos_para_transferir,
-                    caminho[0],
-                    no_intermediario
-                )
-                capacidade_restante -= medicamentos_para_transferir
+        return _caminho_bidirecional(grafo, inicio, fim, tipo, potencial)
 
-        grafo.desenha()
+    return _caminhos_por_veiculo(grafo, inicio, caminho_mais_curto)
+
+def procura_incremental(grafo, inicio, fim=None):
+    """
+    Custo uniforme com replaneamento incremental (LPA*, ver planeamento_incremental.py).
+    Cada par (origem, veículo) tem um planeador que guarda a sua árvore de procura entre
+    chamadas; as alterações dinâmicas das arestas só invalidam a parte afetada, que é reparada
+    na consulta seguinte. Se fim não for dado, usa o nó de maior prioridade do grafo.
+    Retorna o mesmo formato que procura_CustoUniforme: {tipo_veiculo: (caminho, custo)}.
+    """
+    if fim is None:
+        no_destino = grafo.get_no_maior_prioridade()
+        if no_destino is None:
+            registo.resumo("[INFO] Nenhum nó de maior prioridade disponível no momento.")
+            return None
+        fim = no_destino.getNome()
 
-        return {veiculo.get_tipo(): (caminho, custo)}
+    return concluir_procura(grafo, escolher_rota(grafo, inicio, fim, lambda: _caminhos_incremental(grafo, inicio, fim)))
 
-    print("Nenhum caminho válido encontrado.")
-    return None
+def _caminhos_incremental(grafo, inicio, fim):
+    return _caminhos_por_veiculo(
+        grafo, inicio, lambda tipo: grafo.get_planeador(inicio, tipo).caminho_mais_curto(fim))
 
-def procura_aStar(grafo, inicio, fim):
+def procura_aStar(grafo, inicio, fim, heuristica="alt"):
     """
     Implementação do algoritmo A* com validações de combustível e velocidade,
     e cálculo correto de f(n) = g(n) + h(n).
-    """
-    import heapq
-    import time
-
-    start_time = time.time()
-
-    # Validações iniciais
-    no_origem = grafo.get_node_by_name(inicio)
-    if no_origem.janela_tempo == 0:
-        print(f"[ERRO] O nó de origem '{inicio}' não pode ser utilizado porque o tempo esgotou.")
-        return None
 
-    if no_origem.get_medicamento() == 0:
-        print(f"[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '{inicio}'")
-        return None
+    Com heuristica="alt" (por omissão), h(n) é o limite inferior dado pelos marcos do grafo
+    (Grafo.get_marcos), admissível para a soma das arestas de cada veículo. Com
+    heuristica="euclidiana", usa Grafo.calcula_heuristica (distância vezes prioridade).
 
-    veiculos_disponiveis = grafo.get_veiculos_no(inicio)
-    if not veiculos_disponiveis:
-        print(f"Nó {inicio} não possui veículos disponíveis.")
-        return None
+    O caminho encontrado é validado como em procura_CustoUniforme (_validar_caminho:
+    combustível, velocidade para a janela de tempo do destino e custo final). Durante a
+    procura, só são expandidas as arestas que o veículo percorre dentro da janela de tempo
+    da origem (peso / velocidade), uma regra que procura_CustoUniforme não tem: quando ela
+    exclui o caminho mais curto, o A* escolhe outro caminho ou nenhum.
+    """
+    return concluir_procura(grafo, escolher_rota(
+        grafo, inicio, fim, lambda: _caminhos_aStar(grafo, inicio, fim, heuristica)), _distribuir_aStar)
 
-    melhores_caminhos = []
+def _caminhos_aStar(grafo, inicio, fim, heuristica="alt"):
+    no_origem = grafo.get_node_by_name(inicio)
+    no_destino = grafo.get_node_by_name(fim)
+    id_inicio, id_fim = grafo.get_id(inicio), grafo.get_id(fim)
+    caminhos = []
 
-    for veiculo in veiculos_disponiveis:
+    for veiculo in grafo.get_veiculos_no(inicio):
         if veiculo.get_velocidade() == 0:
-            print(f"[AVISO] Veículo {veiculo.get_tipo()} ignorado devido à velocidade ser 0.")
+            registo.resumo("[AVISO] Veículo %s ignorado devido à velocidade ser 0.", veiculo.get_tipo())
             continue
 
-        print(f"Usando veículo: {veiculo.get_tipo()} (Velocidade: {veiculo.get_velocidade()}, Combustível: {veiculo.get_combustivel_disponivel()})")
-
-        fronteira = []
-        heapq.heappush(fronteira, (0, inicio))  # Fila de prioridade: (f(n), nó)
-        custos_acumulados = {inicio: 0}  # g(n)
-        caminhos = {inicio: [inicio]}  # Caminhos acumulados
-        expandidos = []  # Ordem de expansão
-
-        while fronteira:
-            f_atual, atual = heapq.heappop(fronteira)
-
-            if atual in expandidos:
-                continue
-            expandidos.append(atual)
-            print(f"[EXPANSÃO] Nó atual: {atual}, f(n): {f_atual}")
-
-            if atual == fim:
-                custo_final, pessoas_socorridas = grafo.calcula_custo(caminhos[atual], veiculo)
-                if custo_final == float('inf'):
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho.")
-                else:
-                    print(f"[SUCESSO] Caminho encontrado: {caminhos[atual]} com custo: {custo_final}")
-                    print(f"[INFO] Ordem de expansão dos nós: {expandidos}")
-                    melhores_caminhos.append((veiculo, caminhos[atual], custo_final, pessoas_socorridas))
-                break
-
-            for vizinho, peso in grafo.getNeighbours(atual, veiculo.get_tipo()):
-                novo_custo = custos_acumulados[atual] + peso  # g(n)
-                heuristica = grafo.calcula_heuristica(
-                    grafo.get_node_by_name(vizinho),
-                    grafo.get_node_by_name(fim)
-                )
-                f_novo = novo_custo + heuristica  # f(n)
-
-                # Validação de combustível
-                if novo_custo > veiculo.get_combustivel_disponivel():
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho devido a falta de combustível: {caminhos[atual] + [vizinho]}")
-                    continue
+        registo.debug("Usando veículo: %s (Velocidade: %s, Combustível: %s)",
+            veiculo.get_tipo(), veiculo.get_velocidade(), veiculo.get_combustivel_disponivel())
+
+        if heuristica == "alt":
+            calcula_h = grafo.get_marcos().heuristica(veiculo.get_tipo(), fim)
+        else:
+            calcula_h = lambda nome: grafo.calcula_heuristica(grafo.get_node_by_name(nome), no_destino)
+        h = {}  # h(n) por id, calculado uma vez por nó
+
+        def aceitar(atual, vizinho, peso, novo_custo):
+            if vizinho not in h:
+                h[vizinho] = calcula_h(nucleo.nome(vizinho))
+            if h[vizinho] == float('inf'):
+                return False  # O destino não é alcançável a partir deste vizinho
+
+            # Validação de combustível
+            if novo_custo > veiculo.get_combustivel_disponivel():
+                if registo.ativo(registo.DEBUG):
+                    registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho devido a falta de combustível: %s",
+                        veiculo.get_tipo(), nucleo.caminho(atual) + [nucleo.nome(vizinho)])
+                return False
+
+            # Validação de velocidade
+            tempo_estimado = peso / veiculo.get_velocidade()  # Tempo necessário para a aresta
+            if tempo_estimado > no_origem.janela_tempo:
+                if registo.ativo(registo.DEBUG):
+                    registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho devido à velocidade insuficiente: %s",
+                        veiculo.get_tipo(), nucleo.caminho(atual) + [nucleo.nome(vizinho)])
+                return False
+            return True
+
+        # Heap por (f(n) = g(n) + h(n), nome)
+        nucleo = NucleoProcura(grafo, veiculo.get_tipo(), HEAP, prioridade=lambda vizinho, g: g + h[vizinho],
+                               aceitar=aceitar, relaxar=True, registar_expansoes=registo.ativo(registo.DEBUG),
+                               rotulo="A*")
+        if nucleo.executar(id_inicio, id_fim) is None:
+            continue
 
-                # Validação de velocidade
-                tempo_estimado = peso / veiculo.get_velocidade()  # Tempo necessário para a aresta
-                if tempo_estimado > no_origem.janela_tempo:
-                    print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho devido à velocidade insuficiente: {caminhos[atual] + [vizinho]}")
-                    continue
+        if registo.ativo(registo.DEBUG):
+            registo.debug("[INFO] Ordem de expansão dos nós: %s", [nucleo.nome(id_no) for id_no in nucleo.expandidos])
+        caminhos.append((veiculo, nucleo.caminho(id_fim), nucleo.custos[id_fim]))
 
-                if vizinho not in custos_acumulados or novo_custo < custos_acumulados[vizinho]:
-                    custos_acumulados[vizinho] = novo_custo
-                    heapq.heappush(fronteira, (f_novo, vizinho))
-                    caminhos[vizinho] = caminhos[atual] + [vizinho]
-                    print(f"[VISITA] Vizinho: {vizinho}, g(n): {novo_custo}, h(n): {heuristica}, f(n): {f_novo}")
+    return caminhos
 
-    if melhores_caminhos:
-        melhor_caminho = min(melhores_caminhos, key=lambda x: x[2])  # Selecionar caminho de menor custo
-        veiculo, caminho, custo, pessoas_socorridas = melhor_caminho
+def _distribuir_aStar(grafo, veiculo, caminho, pessoas_socorridas):
+    """
+    Distribuição de procura_aStar: como _distribuir_medicamentos, mas sem ignorar os nós
+    intermédios com a janela de tempo esgotada.
+    """
+    # Transferir valores e ajustar o estado
+    grafo.transferir_valores(pessoas_socorridas, caminho[0], caminho[-1])
 
-        end_time = time.time()
-        print(f"Tempo total de execução: {end_time - start_time:.6f} segundos")
+    capacidade_restante = veiculo.get_limite_carga() - pessoas_socorridas
+    nos_intermediarios = sorted(
+        caminho[1:-1],
+        key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()
+    )
 
-        # Transferir valores e ajustar o estado
-        grafo.transferir_valores(pessoas_socorridas, caminho[0], fim)
+    for no_intermediario in nos_intermediarios:
+        if capacidade_restante <= 0:
+            break
+        no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
+        if no_intermediario_obj.populacao == 0:
+            continue
 
-        capacidade_restante = veiculo.get_limite_carga() - pessoas_socorridas
-        nos_intermediarios = sorted(
-            caminho[1:-1],
-            key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()
+        medicamentos_para_transferir = min(
+            capacidade_restante,
+            no_intermediario_obj.populacao
         )
-
-        for no_intermediario in nos_intermediarios:
-            if capacidade_restante <= 0:
-                break
-            no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
-            if no_intermediario_obj.populacao == 0:
-                continue
-
-            medicamentos_para_transferir = min(
-                capacidade_restante,
-                no_intermediario_obj.populacao
+        if medicamentos_para_transferir > 0:
+            grafo.transferir_valores(
+                medicamentos_para_transferir,
+                caminho[0],
+                no_intermediario
             )
-            if medicamentos_para_transferir > 0:
-                grafo.transferir_valores(
-                    medicamentos_para_transferir,
-                    caminho[0],
-                    no_intermediario
-                )
-                capacidade_restante -= medicamentos_para_transferir
-
-        grafo.desenha()
-
-        print(f"Melhor caminho: {caminho} com veículo {veiculo.get_tipo()} e custo {custo}")
-        return {veiculo.get_tipo(): (caminho, custo)}
-
-    print("Nenhum caminho válido encontrado.")
-    return None
+            capacidade_restante -= medicamentos_para_transferir
 
 def greedy(grafo, inicio, destino):
     """
     Realiza a busca gulosa para encontrar o melhor caminho considerando todos os veículos disponíveis no nó inicial.
     Prioriza o nó com menor heurística em cada iteração.
     """
-    start_time = time.time()
-    
-    no_origem = grafo.get_node_by_name(inicio)
-    no_destino = grafo.get_node_by_name(destino)
+    return concluir_procura(grafo, _rota_greedy(grafo, inicio, destino), _distribuir_guloso)
 
-    if no_origem.janela_tempo == 0:
-        print(f"[ERRO] O nó de origem '{inicio}' não pode ser utilizado porque o tempo esgotou.")
-        return None
-
-    if no_origem.get_medicamento() == 0:
-        print(f"[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '{inicio}'")
-        return None
+def _rota_greedy(grafo, inicio, destino):
+    """
+    Parte de greedy que escolhe a rota, sem alterar o grafo: retorna
+    (veiculo, caminho, custo, pessoas_socorridas), ou None se não houver caminho válido.
+    """
+    start_time = time.time()
 
-    veiculos_disponiveis = grafo.get_veiculos_no(inicio)
+    veiculos_disponiveis = _validar_origem(grafo, inicio)
     if not veiculos_disponiveis:
-        print(f"Nó {inicio} não possui veículos disponíveis.")
         return None
+    no_origem = grafo.get_node_by_name(inicio)
+    no_destino = grafo.get_node_by_name(destino)
+    id_inicio, id_destino = grafo.get_id(inicio), grafo.get_id(destino)
 
     melhores_caminhos = []
 
     grafo.atualizar_heuristicas(no_destino)
+    h = [grafo.m_h[no.getNome()] for no in grafo.m_nodes]
 
     for veiculo in veiculos_disponiveis:
-        print(f"Usando veículo: {veiculo.get_tipo()} (Velocidade: {veiculo.get_velocidade()}, Combustível: {veiculo.get_combustivel_disponivel()})")
-
-        caminho = [inicio]
-        nodo_atual = inicio
-        custo_acumulado = 0
-        visited = set()
-
-        while nodo_atual != destino:
-            visited.add(nodo_atual)
-            print(f"[DEBUG] Gulosa: Visitando {nodo_atual}, Caminho atual: {caminho}, Custo acumulado: {custo_acumulado}")
-
-            vizinhos = [
-                (adjacente, peso)
-                for adjacente, peso, bloqueada, permitidos in grafo.m_graph[nodo_atual]
-                if adjacente not in visited and veiculo.get_tipo() in permitidos and not bloqueada
-            ]
-
-            vizinhos_validos = []
-            for adjacente, peso in vizinhos:
-                novo_custo = custo_acumulado + peso
-                if novo_custo <= veiculo.get_combustivel_disponivel():
-                    vizinhos_validos.append((adjacente, peso))
-
-            if not vizinhos_validos:
-                print(f"[ERRO] Sem vizinhos válidos acessíveis a partir de {nodo_atual}.")
-                break
-
-            vizinho_escolhido, peso = min(
-                vizinhos_validos,
-                key=lambda v: grafo.m_h[v[0]]
-            )
-
-            caminho.append(vizinho_escolhido)
-            nodo_atual = vizinho_escolhido
-            custo_acumulado += peso
+        registo.debug("Usando veículo: %s (Velocidade: %s, Combustível: %s)",
+            veiculo.get_tipo(), veiculo.get_velocidade(), veiculo.get_combustivel_disponivel())
+
+        # Escolha irrevogável do vizinho com menor heurística (o primeiro, em empate) entre os
+        # que ainda cabem no combustível
+        combustivel = veiculo.get_combustivel_disponivel()
+        nucleo = NucleoProcura(grafo, veiculo.get_tipo(), HEAP, prioridade=lambda vizinho, g: h[vizinho],
+                               desempate="ordem", aceitar=lambda atual, vizinho, peso, g: g <= combustivel,
+                               irrevogavel=True, rotulo="Gulosa")
+        if nucleo.executar(id_inicio, id_destino) is None:
+            registo.debug("[ERRO] Sem vizinhos válidos acessíveis para chegar a %s.", destino)
+            continue
 
-        if nodo_atual == destino:
-            tempo_estimado = custo_acumulado / veiculo.get_velocidade()
-            if tempo_estimado > no_destino.janela_tempo:
-                print(f"[AVISO] Veículo {veiculo.get_tipo()} descartado por velocidade insuficiente para cumprir a janela de tempo do destino.")
-                continue
+        caminho = nucleo.caminho(id_destino)
+        custo_acumulado = nucleo.custos[id_destino]
+        tempo_estimado = custo_acumulado / veiculo.get_velocidade()
+        if tempo_estimado > no_destino.janela_tempo:
+            registo.resumo("[AVISO] Veículo %s descartado por velocidade insuficiente para cumprir a janela de tempo do destino.",
+                veiculo.get_tipo())
+            continue
 
-            custo_final, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
-            if custo_final == float('inf'):
-                print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho: {caminho}.")
-            else:
-                print(f"[DEBUG] Veículo: {veiculo.get_tipo()} PODE COMPLETAR o caminho: {caminho}. Custo final: {custo_final}")
-                melhores_caminhos.append((veiculo, caminho, custo_final, pessoas_socorridas))
+        custo_final, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
+        if custo_final == float('inf'):
+            registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho: %s.", veiculo.get_tipo(), caminho)
+        else:
+            registo.debug("[DEBUG] Veículo: %s PODE COMPLETAR o caminho: %s. Custo final: %s", veiculo.get_tipo(), caminho, custo_final)
+            melhores_caminhos.append((veiculo, caminho, custo_final, pessoas_socorridas))
 
     if melhores_caminhos:
         melhor_caminho = min(melhores_caminhos, key=lambda x: x[2])
         veiculo, caminho, custo, pessoas_socorridas = melhor_caminho
 
         end_time = time.time()
-        print(f"Melhor caminho: {caminho} com veículo {veiculo.get_tipo()} e custo {custo}")
-        print(f"Tempo total de execução: {end_time - start_time:.6f} segundos")
+        registo.resumo("Melhor caminho: %s com veículo %s e custo %s", caminho, veiculo.get_tipo(), custo)
+        registo.resumo("Tempo total de execução: %.6f segundos", end_time - start_time)
 
-        capacidade_restante = veiculo.get_limite_carga()
-        medicamentos_disponiveis = no_origem.get_medicamento()
+        return veiculo, caminho, custo, pessoas_socorridas
 
-        medicamentos_para_transferir = min(
-            capacidade_restante,
-            medicamentos_disponiveis,
-            no_destino.populacao
-        )
-        if medicamentos_para_transferir > 0:
-            grafo.transferir_valores(medicamentos_para_transferir, caminho[0], caminho[-1])
-            medicamentos_disponiveis -= medicamentos_para_transferir
-            capacidade_restante -= medicamentos_para_transferir
+    registo.resumo("Nenhum caminho válido encontrado.")
+    return None
 
-        for no_intermediario in sorted(caminho[1:-1], key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()):
-            no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
-            if no_intermediario_obj.populacao > 0 and capacidade_restante > 0 and no_intermediario_obj.janela_tempo > 0:
-                medicamentos_para_transferir = min(
-                    capacidade_restante,
-                    medicamentos_disponiveis,
-                    no_intermediario_obj.populacao
+def _distribuir_guloso(grafo, veiculo, caminho, pessoas_socorridas):
+    """
+    Distribuição de greedy: a carga do veículo vai para o destino e depois para os nós
+    intermédios por prioridade, limitada aos medicamentos da origem, e as heurísticas são
+    recalculadas para o destino. pessoas_socorridas não é usado (a quantidade do destino é
+    a sua população).
+    """
+    no_origem = grafo.get_node_by_name(caminho[0])
+    no_destino = grafo.get_node_by_name(caminho[-1])
+
+    capacidade_restante = veiculo.get_limite_carga()
+    medicamentos_disponiveis = no_origem.get_medicamento()
+
+    medicamentos_para_transferir = min(
+        capacidade_restante,
+        medicamentos_disponiveis,
+        no_destino.populacao
+    )
+    if medicamentos_para_transferir > 0:
+        grafo.transferir_valores(medicamentos_para_transferir, caminho[0], caminho[-1])
+        medicamentos_disponiveis -= medicamentos_para_transferir
+        capacidade_restante -= medicamentos_para_transferir
+
+    for no_intermediario in sorted(caminho[1:-1], key=lambda no: grafo.get_node_by_name(no).calcula_prioridade()):
+        no_intermediario_obj = grafo.get_node_by_name(no_intermediario)
+        if no_intermediario_obj.populacao > 0 and capacidade_restante > 0 and no_intermediario_obj.janela_tempo > 0:
+            medicamentos_para_transferir = min(
+                capacidade_restante,
+                medicamentos_disponiveis,
+                no_intermediario_obj.populacao
+            )
+            if medicamentos_para_transferir > 0:
+                grafo.transferir_valores(
+                    medicamentos_para_transferir,
+                    caminho[0],
+                    no_intermediario
                 )
-                if medicamentos_para_transferir > 0:
-                    grafo.transferir_valores(
-                        medicamentos_para_transferir,
-                        caminho[0],
-                        no_intermediario
-                    )
-                    medicamentos_disponiveis -= medicamentos_para_transferir
-                    capacidade_restante -= medicamentos_para_transferir
-
-        grafo.atualizar_heuristicas(no_destino)
-        grafo.desenha()
+                medicamentos_disponiveis -= medicamentos_para_transferir
+                capacidade_restante -= medicamentos_para_transferir
 
-        return {veiculo.get_tipo(): (caminho, custo)}
+    grafo.atualizar_heuristicas(no_destino)
 
-    print("Nenhum caminho válido encontrado.")
-    return None
+# Procuras que se dividem nos caminhos de cada veículo, que só dependem das arestas, dos
+# veículos e das janelas de tempo, e na escolha da rota e distribuição dos medicamentos, que
+# leem os medicamentos e a população atuais: {procura: (caminhos, distribuição)}. A CacheRotas
+# guarda só os caminhos (ver Grafo.get_versao_rotas). O greedy e a procura multi-veículo
+# ficam de fora, porque a própria procura depende da população ou dos medicamentos.
+ETAPAS_PROCURA = {
+    procura_DFS: (_caminhos_DFS, _distribuir_medicamentos),
+    procura_BFS: (_caminhos_BFS, _distribuir_medicamentos),
+    procura_Iterativa: (_caminhos_Iterativa, _distribuir_medicamentos),
+    procura_IDAstar: (_caminhos_IDAstar, _distribuir_medicamentos),
+    procura_CustoUniforme: (_caminhos_CustoUniforme, _distribuir_medicamentos),
+    procura_hierarquias: (_caminhos_hierarquias, _distribuir_medicamentos),
+    procura_CustoUniforme_bidirecional: (_caminhos_CustoUniforme_bidirecional, _distribuir_medicamentos),
+    procura_aStar_bidirecional: (_caminhos_aStar_bidirecional, _distribuir_medicamentos),
+    procura_incremental: (_caminhos_incremental, _distribuir_medicamentos),
+    procura_aStar: (_caminhos_aStar, _distribuir_aStar),
+}
+
+def caminhos_reutilizaveis(procura, fim, argumentos):
+    """
+    Indica se os caminhos de procura(grafo, inicio, fim, *argumentos) podem ser reutilizados
+    enquanto Grafo.get_versao_rotas não mudar: a procura está em ETAPAS_PROCURA, o destino é
+    dado e a heurística não é a euclidiana, que usa a prioridade (população) dos nós.
+    """
+    return procura in ETAPAS_PROCURA and fim is not None and "euclidiana" not in argumentos
+
+def _distribuir_por_prioridade(grafo, no_origem, veiculo, caminho):
+    """
+    Distribui os medicamentos da origem pelos nós do caminho com população, por prioridade,
+    até ao limite de carga do veículo. Retorna o total de pessoas socorridas.
+    """
+    total_pessoas_socorridas = 0
+    #Distribuição de medicamentos por prioridade
+    medicamentos_disponiveis = min(no_origem.get_medicamento(), veiculo.get_limite_carga())
+
+    #Cria lista de nós que estão no caminho
+    nos_caminho = []
+    for no_nome in caminho[1:]:
+        no = grafo.get_node_by_name(no_nome)
+        if no.janela_tempo > 0 and no.populacao > 0:
+            nos_caminho.append(no)
+
+    # Ordena os nós por prioridade
+    nos_caminho.sort(key=lambda x: x.calcula_prioridade())
+
+    #Distribui, se possível, medicamentos pelos nós
+    for no in nos_caminho:
+        if medicamentos_disponiveis > 0:
+            qtd = min(no.populacao, medicamentos_disponiveis)
+            if grafo.transferir_valores(qtd, no_origem.getNome(), no.getNome()):
+                medicamentos_disponiveis -= qtd
+                total_pessoas_socorridas += qtd
+    return total_pessoas_socorridas
 
-# algorithm simulated annealing
 def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes=10):
     start_time = time.time()
 
@@ -794,27 +875,27 @@ def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes
             
             
         if not nos_disponiveis:
-            print("Nenhum nó inicial disponível.")
+            registo.resumo("Nenhum nó inicial disponível.")
             return None
                 
         # Escolher o nó origem
         no_origem = random.choice(nos_disponiveis)
         escolhidos_nodoOrigem.add(no_origem.getNome())
-        print(f"Ponto inicial aleatório escolhido: {no_origem.getNome()}")
+        registo.debug("Ponto inicial aleatório escolhido: %s", no_origem.getNome())
         
         if no_origem.janela_tempo == 0:
-            print(f"[ERRO] O nó de origem '{no_origem.getNome()}' não pode ser utilizado porque o tempo esgotou.")
+            registo.resumo("[ERRO] O nó de origem '%s' não pode ser utilizado porque o tempo esgotou.", no_origem.getNome())
             no_origem = None
             continue
 
         if no_origem.get_medicamento() == 0:
-            print(f"[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '{no_origem.getNome()}'")
+            registo.resumo("[ERRO] NINGUÉM FOI SOCORRIDO, NÓ ORIGEM SEM MEDICAMENTOS: '%s'", no_origem.getNome())
             no_origem = None
             continue
 
         veiculos_disponiveis = grafo.get_veiculos_no(no_origem.getNome())
         if not veiculos_disponiveis:
-            print(f"Nó {no_origem.getNome()} não possui veículos disponíveis.")
+            registo.resumo("Nó %s não possui veículos disponíveis.", no_origem.getNome())
             no_origem = None
             continue
 
@@ -824,7 +905,7 @@ def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes
     melhores_caminhos = []
 
     for veiculo in veiculos_disponiveis:
-        print(f"Testar o simulated annealing com o veículo: {veiculo.get_tipo()}")
+        registo.debug("Testar o simulated annealing com o veículo: %s", veiculo.get_tipo())
 
         atual = no_origem
         caminho_atual = [no_origem.getNome()]
@@ -835,9 +916,10 @@ def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes
         
 
         for i in range(numero_iteracoes):
+            metricas.nos_expandidos += 1
             # Encerrar se o nó atual for o destino
             if atual.getNome() == destino:
-                print(f"Destino {destino} alcançado na iteração {i}.")
+                registo.trace("Destino %s alcançado na iteração %s.", destino, i)
                 break
 
             # Obter vizinhos acessíveis
@@ -848,7 +930,7 @@ def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes
             ]
 
             if not vizinhos:
-                print(f"Nó {atual.getNome()} não possui vizinhos acessíveis para o veículo {veiculo.get_tipo()}.")
+                registo.trace("Nó %s não possui vizinhos acessíveis para o veículo %s.", atual.getNome(), veiculo.get_tipo())
                 break
 
             # Escolher próximo nó baseado na heurística
@@ -866,10 +948,10 @@ def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes
 
             # Verificar combustível e velocidade
             if custo_acumulado == float('inf') or custo_acumulado > veiculo.get_combustivel_disponivel():
-                print(f"[DEBUG] Veículo {veiculo.get_tipo()} não pode acessar {candidato.getNome()}.")
+                registo.debug("[DEBUG] Veículo %s não pode acessar %s.", veiculo.get_tipo(), candidato.getNome())
                 continue
             if candidato.janela_tempo > 0 and (custo_acumulado / candidato.janela_tempo) > veiculo.get_velocidade():
-                print(f"[DEBUG] Veículo {veiculo.get_tipo()} não pode acessar {candidato.getNome()} devido à velocidade.")
+                registo.debug("[DEBUG] Veículo %s não pode acessar %s devido à velocidade.", veiculo.get_tipo(), candidato.getNome())
                 continue
 
             # Calcular probabilidade de aceitação
@@ -881,10 +963,10 @@ def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes
             probabilidade_aceitacao = np.exp(-diferenca / temperatura) if temperatura > 0 else 0
 
             # Imprimir o nó visitado
-            print(f"Nó atual: {atual.getNome()}, A visitar o nó candidato: {candidato.getNome()}")
+            registo.trace("Nó atual: %s, A visitar o nó candidato: %s", atual.getNome(), candidato.getNome())
 
             if diferenca < 0 or random.random() < probabilidade_aceitacao:
-                print(f"[ACEITO] A mover para {candidato.getNome()} com custo {custo_temporario}")
+                registo.debug("[ACEITO] A mover para %s com custo %s", candidato.getNome(), custo_temporario)
                 atual = candidato
                 caminho_atual.append(candidato.getNome())
                 custo_atual = custo_temporario
@@ -905,53 +987,287 @@ def simulated_annealing(grafo, destino, temperatura_inicial=10, numero_iteracoes
         veiculo, caminho, custo, pessoas_socorridas = melhor_resultado
 
         # Realizar distribuição de medicamentos após determinar o melhor caminho
-        medicamentos_disponiveis = min(no_origem.get_medicamento(), veiculo.get_limite_carga())
-        nos_caminho = [
-            grafo.get_node_by_name(no_nome)
-            for no_nome in caminho[1:]
-            if grafo.get_node_by_name(no_nome).janela_tempo > 0
-            and grafo.get_node_by_name(no_nome).populacao > 0
-        ]
-        nos_caminho.sort(key=lambda x: x.calcula_prioridade())
-        for no in nos_caminho:
-            if medicamentos_disponiveis > 0:
-                qtd = min(no.populacao, medicamentos_disponiveis)
-                if grafo.transferir_valores(qtd, no_origem.getNome(), no.getNome()):
-                    medicamentos_disponiveis -= qtd
+        _distribuir_por_prioridade(grafo, no_origem, veiculo, caminho)
         grafo.desenha()
         melhor_distancia = grafo.calcula_acumulado_arestas(caminho, veiculo)
-        print(f"Melhor caminho: {caminho}")
-        print(f"Veículo: {veiculo.get_tipo()}")
-        print(f"Custo total: {custo}")
-        print(f"Pessoas socorridas: {pessoas_socorridas}")
-        print(f"Distância percorrida: {melhor_distancia}")
-        print(f"Tempo de execução: {end_time - start_time:.6f} segundos")
+        registo.resumo("Melhor caminho: %s", caminho)
+        registo.resumo("Veículo: %s", veiculo.get_tipo())
+        registo.resumo("Custo total: %s", custo)
+        registo.resumo("Pessoas socorridas: %s", pessoas_socorridas)
+        registo.resumo("Distância percorrida: %s", melhor_distancia)
+        registo.resumo("Tempo de execução: %.6f segundos", end_time - start_time)
 
         return (caminho, custo)
 
-    print("Nenhum caminho válido encontrado.")
+    registo.resumo("Nenhum caminho válido encontrado.")
     return None
 
-def hill_climbing(grafo, destino, max_restarts, max_iteracoes):
+def _hill_climbing_veiculo(grafo, destino, no_origem, veiculo, max_iteracoes):
+    """
+    Uma subida de hill climbing a partir de no_origem com o veículo dado, escolhendo em cada
+    passo o vizinho (ainda fora do caminho) com melhor heurística até ao destino.
+    Retorna (custo_final, caminho) se chegar ao destino com combustível e velocidade
+    suficientes, ou None.
+    """
+    destino_node = grafo.get_node_by_name(destino)
+    caminho_atual = [no_origem.getNome()]
+    ultimo_no = no_origem
+    distancia_atual = 5 if (no_origem.populacao == 0 or no_origem.janela_tempo == 0) else grafo.calcula_heuristica(no_origem, destino_node)
+
+    for iteracao in range(max_iteracoes):
+        metricas.nos_expandidos += 1
+        ultimo_no = caminho_atual[-1]
+
+        registo.trace("Iteração %s: Explorar a partir de %s", iteracao, ultimo_no)
+
+        if ultimo_no == destino:
+
+            custo_acumulado = grafo.calcula_acumulado_arestas(caminho_atual, veiculo)
+            if custo_acumulado==float('inf') or custo_acumulado>veiculo.get_combustivel_disponivel():
+                registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho por falta de combustível: %s.",
+                    veiculo.get_tipo(), caminho_atual)
+                continue
+
+            tempo_destino = destino_node.janela_tempo
+            if tempo_destino > 0 and (custo_acumulado / tempo_destino) > veiculo.get_velocidade():
+                registo.debug("[DEBUG] Veículo: %s NÃO PODE COMPLETAR o caminho por velocidade insuficiente: %s.",
+                    veiculo.get_tipo(), caminho_atual)
+                continue
+
+            custo_final, _ = grafo.calcula_custo(caminho_atual, veiculo)
+            return custo_final, caminho_atual
+
+        todos_vizinhos = []
+        for vizinho, peso in grafo.getNeighbours(ultimo_no, veiculo.get_tipo()):
+            if vizinho not in caminho_atual:
+                todos_vizinhos.append((vizinho, peso))
+
+        melhor_vizinho = None
+        menor_distancia = distancia_atual
+
+        for vizinho, _ in todos_vizinhos:
+            vizinho_obj = grafo.get_node_by_name(vizinho)
+            dist = 5 if (vizinho_obj.populacao == 0 or vizinho_obj.janela_tempo == 0) else grafo.calcula_heuristica(vizinho_obj, destino_node)
+            if dist < menor_distancia or (menor_distancia==dist):
+                melhor_vizinho = vizinho
+                menor_distancia = dist
 
+        if melhor_vizinho:
+            caminho_atual.append(melhor_vizinho)
+            distancia_atual = menor_distancia
+        else:
+            break
+
+    return None
+
+def _veiculos_hill_climbing(grafo, no_origem):
+    """
+    Veículos de no_origem que podem ser usados numa tentativa (lista vazia se a origem não serve).
+    """
+    if no_origem.janela_tempo == 0 or no_origem.get_medicamento() == 0:
+        return []
+    return [veiculo for veiculo in grafo.get_veiculos_no(no_origem.getNome()) if veiculo.get_limite_carga() != 0]
+
+# Grafo de cada processo trabalhador das procuras paralelas (cópia só de leitura)
+_grafo_trabalhador = None
+
+def _iniciar_trabalhador(grafo, nivel_registo):
+    global _grafo_trabalhador
+    _grafo_trabalhador = grafo
+    registo.definir_nivel(nivel_registo)
+
+def _tentativa_hill_climbing(destino, max_iteracoes, semente):
+    """
+    Uma tentativa de hill climbing num processo trabalhador: escolhe a origem com a sua própria
+    semente e avalia todos os veículos, sem alterar o grafo.
+    Retorna (custo, origem, índice do veículo, caminho, nós expandidos); custo é inf se falhar.
+    """
+    grafo = _grafo_trabalhador
+    metricas.reiniciar()
+    todos_nos = [no for no in grafo.m_nodes if no.getNome() != destino]
+    no_origem = random.Random(semente).choice(todos_nos)
+    registo.debug("Ponto inicial escolhido: %s (Medicamentos: %s)", no_origem.getNome(), no_origem.get_medicamento())
+
+    melhor = (float('inf'), no_origem.getNome(), None, None)
+    for indice, veiculo in enumerate(_veiculos_hill_climbing(grafo, no_origem)):
+        resultado = _hill_climbing_veiculo(grafo, destino, no_origem, veiculo, max_iteracoes)
+        if resultado is not None and resultado[0] < melhor[0]:
+            melhor = (resultado[0], no_origem.getNome(), indice, resultado[1])
+    return melhor + (metricas.nos_expandidos,)
+
+def _avancar_cadeia(cadeia, destino, passos):
+    """
+    Avança uma cadeia de simulated annealing num processo trabalhador.
+    Retorna (cadeia, nós expandidos).
+    """
+    metricas.reiniciar()
+    cadeia.avancar(_grafo_trabalhador, destino, passos)
+    return cadeia, metricas.nos_expandidos
+
+def _trocar_cadeias(grafo, destino, cadeias, rng, ronda):
+    """
+    Parallel tempering: propõe trocar as caminhadas de cadeias de temperaturas vizinhas
+    (pares pares e ímpares alternadamente), aceitando com probabilidade
+    min(1, exp((1/T_a - 1/T_b) * (E_a - E_b))).
+    """
+    for k in range(ronda % 2, len(cadeias) - 1, 2):
+        a, b = cadeias[k], cadeias[k + 1]
+        energia_a, energia_b = a.energia(grafo, destino), b.energia(grafo, destino)
+        if energia_a is None or energia_b is None:
+            continue
+        delta = (1 / a.temperatura - 1 / b.temperatura) * (energia_a - energia_b)
+        if delta >= 0 or rng.random() < math.exp(delta):
+            registo.debug("Troca de estado entre as cadeias %s e %s", a.indice, b.indice)
+            a.trocar_estado(b)
+
+def simulated_annealing_multicadeia(grafo, destino, n_cadeias=4, temperatura_inicial=10, numero_iteracoes=10,
+                                    razao_temperaturas=2.0, troca_cada=None, n_processos=None, semente=None):
+    """
+    Simulated annealing com várias cadeias em processos trabalhadores.
+
+    A cadeia k usa a temperatura temperatura_inicial * razao_temperaturas ** k e a semente
+    semente + k + 1 (se semente for None, é sorteada), e corre numero_iteracoes iterações,
+    recomeçando de uma nova origem sempre que uma caminhada termina. Sem troca_cada, as
+    cadeias são independentes; com troca_cada, a cada troca_cada iterações as caminhadas de
+    cadeias vizinhas podem ser trocadas (parallel tempering). Com n_processos=1, as cadeias
+    correm no próprio processo.
+
+    Só a distribuição de medicamentos e o desenho do melhor plano são aplicados ao grafo.
+    Retorna (caminho, custo, estatísticas por cadeia), ou None se nenhuma cadeia encontrar
+    um caminho válido.
+    """
+    start_time = time.time()
+    if semente is None:
+        semente = random.randrange(2 ** 32)
+    rng = random.Random(semente)
+
+    cadeias = [
+        CadeiaRecozimento(k, temperatura_inicial * razao_temperaturas ** k, semente + k + 1)
+        for k in range(n_cadeias)
+    ]
+    bloco = troca_cada or numero_iteracoes
+
+    executor = None
+    if n_processos != 1:
+        executor = ProcessPoolExecutor(
+            max_workers=n_processos,
+            initializer=_iniciar_trabalhador,
+            initargs=(grafo.copia_para_processos(), registo.get_nivel()),
+        )
+    try:
+        feitas, ronda = 0, 0
+        while feitas < numero_iteracoes:
+            passos = min(bloco, numero_iteracoes - feitas)
+            if executor is None:
+                for cadeia in cadeias:
+                    cadeia.avancar(grafo, destino, passos)
+            else:
+                resultados = list(executor.map(_avancar_cadeia, cadeias, [destino] * n_cadeias, [passos] * n_cadeias))
+                cadeias = [cadeia for cadeia, _ in resultados]
+                metricas.nos_expandidos += sum(expandidos for _, expandidos in resultados)
+            feitas += passos
+
+            if troca_cada and feitas < numero_iteracoes:
+                _trocar_cadeias(grafo, destino, cadeias, rng, ronda)
+                ronda += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    estatisticas = [cadeia.estatisticas() for cadeia in cadeias]
+    for estatistica in estatisticas:
+        registo.debug("Cadeia %s (T=%s): %s iterações, %s aceitações, %s reinícios, %s trocas, melhor custo %s",
+            estatistica["cadeia"], estatistica["temperatura"], estatistica["iteracoes"], estatistica["aceitacoes"],
+            estatistica["reinicios"], estatistica["trocas"], estatistica["melhor_custo"])
+
+    custo, origem, indice_veiculo, caminho = min(
+        (cadeia.melhor for cadeia in cadeias), key=lambda melhor: melhor[0])
+    end_time = time.time()
+    if caminho is None:
+        registo.resumo("Nenhum caminho válido encontrado.")
+        return None
+
+    no_origem = grafo.get_node_by_name(origem)
+    veiculo = grafo.get_veiculos_no(origem)[indice_veiculo]
+    _, pessoas_socorridas = grafo.calcula_custo(caminho, veiculo)
+    _distribuir_por_prioridade(grafo, no_origem, veiculo, caminho)
+    grafo.desenha()
+
+    registo.resumo("Melhor caminho: %s", caminho)
+    registo.resumo("Veículo: %s", veiculo.get_tipo())
+    registo.resumo("Custo total: %s", custo)
+    registo.resumo("Pessoas socorridas: %s", pessoas_socorridas)
+    registo.resumo("Tempo de execução: %.6f segundos", end_time - start_time)
+
+    return (caminho, custo, estatisticas)
+
+def _hill_climbing_paralelo(grafo, destino, max_restarts, max_iteracoes, n_processos, semente):
+    """
+    Executa as tentativas em paralelo e retorna (custo, origem, veículo, caminho) da melhor,
+    ou None. Cada tentativa i usa a semente semente + i.
+    """
+    if semente is None:
+        semente = random.randrange(2 ** 32)
+
+    with ProcessPoolExecutor(
+        max_workers=n_processos,
+        initializer=_iniciar_trabalhador,
+        initargs=(grafo.copia_para_processos(), registo.get_nivel()),
+    ) as executor:
+        tentativas = list(executor.map(
+            _tentativa_hill_climbing,
+            [destino] * max_restarts,
+            [max_iteracoes] * max_restarts,
+            [semente + i for i in range(max_restarts)],
+        ))
+
+    metricas.nos_expandidos += sum(tentativa[4] for tentativa in tentativas)
+    custo, origem, indice, caminho, _ = min(tentativas, key=lambda tentativa: tentativa[0])
+    if caminho is None:
+        return None
+
+    no_origem = grafo.get_node_by_name(origem)
+    return custo, no_origem, _veiculos_hill_climbing(grafo, no_origem)[indice], caminho
+
+def hill_climbing(grafo, destino, max_restarts, max_iteracoes, paralelo=False, n_processos=None, semente=None):
+    """
+    Hill climbing com reinícios a partir de origens aleatórias.
+
+    Por omissão as tentativas são sequenciais e a procura para na primeira tentativa que
+    encontra um caminho. Com paralelo=True, as max_restarts tentativas são distribuídas por
+    um ProcessPoolExecutor (n_processos, por omissão o número de CPUs), cada uma com a sua
+    semente (semente + i; se semente for None, é sorteada); os trabalhadores usam uma cópia
+    do grafo só de leitura e a melhor de todas as tentativas é a única cuja distribuição de
+    medicamentos e desenho são aplicados ao grafo.
+    """
     start_time = time.time()
     melhor_caminho_global = None
     melhor_custo_global = float('inf')
     melhor_veiculo_global = None
     melhor_pessoas_socorridas = 0
     melhor_distancia = 0
-    
-    destino_node = grafo.get_node_by_name(destino)
+
+    if paralelo:
+        resultado = _hill_climbing_paralelo(grafo, destino, max_restarts, max_iteracoes, n_processos, semente)
+        if resultado is not None:
+            melhor_custo_global, no_origem, melhor_veiculo_global, melhor_caminho_global = resultado
+            registo.debug("\nNovo melhor caminho encontrado!")
+            if registo.ativo(registo.DEBUG):
+                registo.debug("Caminho: %s", ' -> '.join(melhor_caminho_global))
+            registo.debug("Custo: %s", melhor_custo_global)
+            melhor_pessoas_socorridas = _distribuir_por_prioridade(grafo, no_origem, melhor_veiculo_global, melhor_caminho_global)
+            grafo.desenha()
+
     caminho_found = False
-    
-    for tentativa in range(max_restarts):
-        print(f"\n{'=' * 30}")
-        print(f"Tentativa {tentativa+1} de {max_restarts}")
-        
+
+    for tentativa in range(0 if paralelo else max_restarts):
+        registo.trace("\n%s", '=' * 30)
+        registo.debug("Tentativa %s de %s", tentativa+1, max_restarts)
+
         todos_nos = [no for no in grafo.m_nodes if no.getNome()!=destino]
-            
+
         no_origem = random.choice(todos_nos)
-        print(f"Ponto inicial escolhido: {no_origem.getNome()} (Medicamentos: {no_origem.get_medicamento()})")
+        registo.debug("Ponto inicial escolhido: %s (Medicamentos: %s)", no_origem.getNome(), no_origem.get_medicamento())
 
         if no_origem.janela_tempo==0:
             continue
@@ -964,91 +1280,26 @@ def hill_climbing(grafo, destino, max_restarts, max_iteracoes):
             medicamentos_disponiveis = no_origem.get_medicamento()
             if medicamentos_disponiveis == 0 or veiculo.get_limite_carga() == 0:
                 continue
-                
-            print(f"\nA testar {veiculo.get_tipo()}")
-            
-            caminho_atual = [no_origem.getNome()]
-            ultimo_no = no_origem
-            distancia_atual = 5 if (no_origem.populacao == 0 or no_origem.janela_tempo == 0) else grafo.calcula_heuristica(no_origem, destino_node)
-            
-            for iteracao in range(max_iteracoes):
-                ultimo_no = caminho_atual[-1]
-                ultimo_no_obj = grafo.get_node_by_name(ultimo_no)
 
-                print(f"Iteração {iteracao}: Explorar a partir de {ultimo_no}")
-                
-                if ultimo_no == destino:
-
-                    custo_acumulado = grafo.calcula_acumulado_arestas(caminho_atual, veiculo)
-                    if custo_acumulado==float('inf') or custo_acumulado>veiculo.get_combustivel_disponivel():
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por falta de combustível: {caminho_atual}.")
-                        continue
-
-                    tempo_destino = destino_node.janela_tempo
-                    if tempo_destino > 0 and (custo_acumulado / tempo_destino) > veiculo.get_velocidade():
-                        print(f"[DEBUG] Veículo: {veiculo.get_tipo()} NÃO PODE COMPLETAR o caminho por velocidade insuficiente: {caminho_atual}.")
-                        continue
-                    
-                    
-                    custo_final, pessoas_socorridas = grafo.calcula_custo(caminho_atual, veiculo)
-                        
-                    if custo_final < melhor_custo_global:
-                        melhor_caminho_global = caminho_atual.copy()
-                        melhor_custo_global = custo_final
-                        melhor_veiculo_global = veiculo
-                        print(f"\nNovo melhor caminho encontrado!")
-                        print(f"Caminho: {' -> '.join(caminho_atual)}")
-                        print(f"Custo: {custo_final}")
-                        caminho_found = True
-                        
-                        total_pessoas_socorridas = 0
-                        #Distribuição de medicamentos por prioridade
-                        medicamentos_disponiveis = min(no_origem.get_medicamento(), veiculo.get_limite_carga())
-                            
-                        #Cria lista de nós que estão no caminho
-                        nos_caminho = []
-                        for no_nome in caminho_atual[1:]:
-                            no = grafo.get_node_by_name(no_nome)
-                            if no.janela_tempo > 0 and no.populacao > 0:
-                                nos_caminho.append(no)
-                            
-                        # Ordena os nós por prioridade
-                        nos_caminho.sort(key=lambda x: x.calcula_prioridade())
-                            
-                        #Distribui, se possível, medicamentos pelos nós
-                        for no in nos_caminho:
-                            if medicamentos_disponiveis > 0:
-                                qtd = min(no.populacao, medicamentos_disponiveis)
-                                if grafo.transferir_valores(qtd, no_origem.getNome(), no.getNome()):
-                                    medicamentos_disponiveis -= qtd
-                                    total_pessoas_socorridas += qtd
-                        grafo.desenha()
-
-                        melhor_pessoas_socorridas = total_pessoas_socorridas
-                    break
-                
-                todos_vizinhos = []
-                for vizinho, peso, bloqueada, permitidos in grafo.m_graph[ultimo_no]:
-                    if (vizinho not in caminho_atual and 
-                        veiculo.get_tipo() in permitidos and 
-                        not bloqueada):
-                        todos_vizinhos.append((vizinho, peso))
-                
-                melhor_vizinho = None
-                menor_distancia = distancia_atual
-                
-                for vizinho, _ in todos_vizinhos:
-                    vizinho_obj = grafo.get_node_by_name(vizinho)
-                    dist = 5 if (vizinho_obj.populacao == 0 or vizinho_obj.janela_tempo == 0) else grafo.calcula_heuristica(vizinho_obj, destino_node)
-                    if dist < menor_distancia or (menor_distancia==dist):
-                        melhor_vizinho = vizinho
-                        menor_distancia = dist
-                
-                if melhor_vizinho:
-                    caminho_atual.append(melhor_vizinho)
-                    distancia_atual = menor_distancia
-                else:
-                    break
+            registo.debug("\nA testar %s", veiculo.get_tipo())
+
+            resultado = _hill_climbing_veiculo(grafo, destino, no_origem, veiculo, max_iteracoes)
+            if resultado is None:
+                continue
+
+            custo_final, caminho_atual = resultado
+            if custo_final < melhor_custo_global:
+                melhor_caminho_global = caminho_atual.copy()
+                melhor_custo_global = custo_final
+                melhor_veiculo_global = veiculo
+                registo.debug("\nNovo melhor caminho encontrado!")
+                if registo.ativo(registo.DEBUG):
+                    registo.debug("Caminho: %s", ' -> '.join(caminho_atual))
+                registo.debug("Custo: %s", custo_final)
+                caminho_found = True
+
+                melhor_pessoas_socorridas = _distribuir_por_prioridade(grafo, no_origem, veiculo, caminho_atual)
+                grafo.desenha()
         if caminho_found:
             break
     end_time = time.time()
@@ -1056,12 +1307,12 @@ def hill_climbing(grafo, destino, max_restarts, max_iteracoes):
         return None
     else:
         melhor_distancia = grafo.calcula_acumulado_arestas(melhor_caminho_global, melhor_veiculo_global)
-        print(f"\nMelhor caminho: {melhor_caminho_global}")
-        print(f"Veículo: {melhor_veiculo_global.get_tipo()}")
-        print(f"Custo total: {melhor_custo_global}")
-        print(f"Pessoas socorridas: {melhor_pessoas_socorridas}")
-        print(f"Distância percorrida: {melhor_distancia}")
-        print(f"Tempo de execução: {end_time - start_time:.2f} segundos")
-        
-    
-    return {melhor_veiculo_global.get_tipo(): (melhor_caminho_global, melhor_custo_global)}
\ No newline at end of file
+        registo.resumo("\nMelhor caminho: %s", melhor_caminho_global)
+        registo.resumo("Veículo: %s", melhor_veiculo_global.get_tipo())
+        registo.resumo("Custo total: %s", melhor_custo_global)
+        registo.resumo("Pessoas socorridas: %s", melhor_pessoas_socorridas)
+        registo.resumo("Distância percorrida: %s", melhor_distancia)
+        registo.resumo("Tempo de execução: %.2f segundos", end_time - start_time)
+
+
+    return {melhor_veiculo_global.get_tipo(): (melhor_caminho_global, melhor_custo_global)}
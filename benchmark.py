@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+import registo
+import metricas
+from menu import carregar_grafo
+from gerador_mapas import gerar_mapa, guardar_mapa, TIPOS_MAPA
+from algoritmos_procura import (
+    procura_DFS, procura_BFS, procura_Iterativa, procura_CustoUniforme, procura_CustoUniforme_bidirecional,
+    procura_multi_veiculo, procura_hierarquias, procura_incremental, procura_aStar, procura_aStar_bidirecional,
+    procura_IDAstar, greedy, simulated_annealing, simulated_annealing_multicadeia, hill_climbing,
+)
+
+# Cada algoritmo é chamado como f(grafo, origem, destino, opcoes)
+ALGORITMOS = {
+    "dfs": lambda g, o, d, op: procura_DFS(g, o, d),
+    "bfs": lambda g, o, d, op: procura_BFS(g, o, d),
+    "iterativa": lambda g, o, d, op: procura_Iterativa(g, o, d, op["profundidade"], op["expansoes"]),
+    "custo_uniforme": lambda g, o, d, op: procura_CustoUniforme(g, o, d),
+    "multi_veiculo": lambda g, o, d, op: procura_multi_veiculo(g, o, d),
+    "hierarquias": lambda g, o, d, op: procura_hierarquias(g, o, d),
+    "custo_uniforme_bidirecional": lambda g, o, d, op: procura_CustoUniforme_bidirecional(g, o, d),
+    "incremental": lambda g, o, d, op: procura_incremental(g, o, d),
+    "a_estrela": lambda g, o, d, op: procura_aStar(g, o, d),
+    "a_estrela_bidirecional": lambda g, o, d, op: procura_aStar_bidirecional(g, o, d),
+    "ida_estrela": lambda g, o, d, op: procura_IDAstar(g, o, d, max_expansoes=op["expansoes"]),
+    "greedy": lambda g, o, d, op: greedy(g, o, d),
+    "simulated_annealing": lambda g, o, d, op: simulated_annealing(g, d, temperatura_inicial=10, numero_iteracoes=op["iteracoes"]),
+    "simulated_annealing_multicadeia": lambda g, o, d, op: simulated_annealing_multicadeia(
+        g, d, n_cadeias=4, temperatura_inicial=10, numero_iteracoes=op["iteracoes"], troca_cada=max(1, op["iteracoes"] // 5)),
+    "hill_climbing": lambda g, o, d, op: hill_climbing(g, d, max_restarts=6, max_iteracoes=op["iteracoes"]),
+    "hill_climbing_paralelo": lambda g, o, d, op: hill_climbing(g, d, max_restarts=6, max_iteracoes=op["iteracoes"], paralelo=True),
+}
+
+
+def gerar_consultas(grafo, n_consultas, semente):
+    """
+    Escolhe, de forma reprodutível, pares (origem, destino): a origem é um nó com
+    medicamentos e veículos e o destino um nó com população por socorrer.
+    """
+    rng = random.Random(semente)
+    origens = [no.getNome() for no in grafo.m_nodes if no.get_medicamento() > 0 and no.get_veiculos()]
+    destinos = [no.getNome() for no in grafo.m_nodes if no.populacao > 0 and no.janela_tempo > 0]
+    if not origens or not destinos:
+        return []
+    return [(rng.choice(origens), rng.choice(destinos)) for _ in range(n_consultas)]
+
+
+def _guardar_estado(grafo):
+    return [(no.populacao, no.janela_tempo, no.get_medicamento()) for no in grafo.m_nodes]
+
+
+def _repor_estado(grafo, estado):
+    for no, (populacao, janela_tempo, medicamento) in zip(grafo.m_nodes, estado):
+        no.populacao = populacao
+        no.janela_tempo = janela_tempo
+        no.set_medicamento(medicamento)
+
+
+def _executar(funcao, grafo, origem, destino, opcoes, semente, medir_memoria):
+    """
+    Executa uma consulta e retorna (resultado, tempo, nós expandidos, caminhos materializados,
+    pico de memória em bytes).
+    O estado dos nós (alterado pelas transferências de medicamentos) é reposto no fim.
+    """
+    estado = _guardar_estado(grafo)
+    random.seed(semente)
+    metricas.reiniciar()
+
+    if medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        resultado = funcao(grafo, origem, destino, opcoes)
+    finally:
+        tempo = time.perf_counter() - inicio
+        pico = None
+        if medir_memoria:
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        _repor_estado(grafo, estado)
+
+    return resultado, tempo, metricas.nos_expandidos, metricas.caminhos_materializados, pico
+
+
+def executar_benchmark(mapas, algoritmos=None, n_consultas=5, semente=0, opcoes=None, medir_memoria=True):
+    """
+    Mede cada algoritmo em cada mapa sobre o mesmo conjunto de consultas.
+    Retorna uma lista de dicionários, um por (mapa, algoritmo), com tempos, nós expandidos,
+    caminhos materializados e picos de memória. Com medir_memoria, cada consulta é executada
+    uma segunda vez sob tracemalloc, para que a medição de memória não afete os tempos.
+    """
+    algoritmos = algoritmos or list(ALGORITMOS)
+    opcoes = {"profundidade": 10, "iteracoes": 10, "expansoes": 100000, **(opcoes or {})}
+    resultados = []
+
+    for mapa in mapas:
+        inicio_carga = time.perf_counter()
+        grafo = carregar_grafo(mapa)
+        tempo_carga = time.perf_counter() - inicio_carga
+        grafo.desenho_ativo = False
+        consultas = gerar_consultas(grafo, n_consultas, semente)
+
+        for nome in algoritmos:
+            funcao = ALGORITMOS[nome]
+            tempos, expandidos, materializados, picos = [], [], [], []
+            sucessos = 0
+
+            for i, (origem, destino) in enumerate(consultas):
+                semente_consulta = semente + i
+                resultado, tempo, n_expandidos, n_materializados, _ = _executar(
+                    funcao, grafo, origem, destino, opcoes, semente_consulta, False)
+                if medir_memoria:
+                    _, _, _, _, pico = _executar(funcao, grafo, origem, destino, opcoes, semente_consulta, True)
+                    picos.append(pico)
+                tempos.append(tempo)
+                expandidos.append(n_expandidos)
+                materializados.append(n_materializados)
+                sucessos += resultado is not None
+
+            resultados.append({
+                "mapa": os.path.basename(mapa),
+                "nos": len(grafo.m_nodes),
+                "arestas": sum(len(lista) for lista in grafo.m_graph.values()) // (1 if grafo.m_directed else 2),
+                "tempo_carga_s": tempo_carga,
+                "algoritmo": nome,
+                "consultas": len(consultas),
+                "sucessos": sucessos,
+                "tempo_medio_s": sum(tempos) / len(tempos) if tempos else None,
+                "tempo_max_s": max(tempos) if tempos else None,
+                "expandidos_medio": sum(expandidos) / len(expandidos) if expandidos else None,
+                "caminhos_materializados_medio": sum(materializados) / len(materializados) if materializados else None,
+                "memoria_pico_max_bytes": max(picos) if picos else None,
+            })
+
+    return resultados
+
+
+def _memoria_carga(ficheiro):
+    """
+    Retorna (grafo, bytes alocados e ainda em uso depois de carregar o mapa).
+    """
+    tracemalloc.start()
+    try:
+        grafo = carregar_grafo(ficheiro)
+        memoria, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return grafo, memoria
+
+
+def relatorio_memoria(mapa):
+    """
+    Mede a memória ocupada por um mapa carregado, separando a parte dos nós (com veículos e
+    meteorologia) da parte das arestas: o mapa é carregado uma vez completo e outra sem arestas.
+    """
+    with open(mapa) as f:
+        dados = json.load(f)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        sem_arestas = os.path.join(pasta, "sem_arestas.json")
+        with open(sem_arestas, "w") as f:
+            json.dump({**dados, "arestas": []}, f)
+        grafo_nos, memoria_nos = _memoria_carga(sem_arestas)
+        n_nos = len(grafo_nos.m_nodes)
+        del grafo_nos
+
+    grafo, memoria_total = _memoria_carga(mapa)
+    n_arestas = sum(len(lista) for lista in grafo.m_graph.values())
+    memoria_arestas = memoria_total - memoria_nos
+
+    return {
+        "mapa": os.path.basename(mapa),
+        "nos": n_nos,
+        "registos_arestas": n_arestas,
+        "memoria_total_bytes": memoria_total,
+        "bytes_por_no": memoria_nos / n_nos if n_nos else None,
+        "bytes_por_aresta": memoria_arestas / n_arestas if n_arestas else None,
+    }
+
+
+def formatar_relatorio_memoria(relatorios):
+    linhas = ["Memória dos mapas carregados:"]
+    for r in relatorios:
+        por_no = "-" if r["bytes_por_no"] is None else f"{r['bytes_por_no']:.0f}"
+        por_aresta = "-" if r["bytes_por_aresta"] is None else f"{r['bytes_por_aresta']:.0f}"
+        linhas.append(
+            f"  {r['mapa']}: {r['nos']} nós, {r['registos_arestas']} registos de arestas, "
+            f"{r['memoria_total_bytes'] / 1024:.1f} KiB ({por_no} B/nó, {por_aresta} B/aresta)"
+        )
+    return "\n".join(linhas)
+
+
+def formatar_tabela(resultados):
+    """
+    Formata os resultados como uma tabela de texto.
+    """
+    colunas = [
+        ("Mapa", lambda r: r["mapa"]),
+        ("Nós", lambda r: str(r["nos"])),
+        ("Algoritmo", lambda r: r["algoritmo"]),
+        ("Sucessos", lambda r: f"{r['sucessos']}/{r['consultas']}"),
+        ("Tempo médio (ms)", lambda r: "-" if r["tempo_medio_s"] is None else f"{r['tempo_medio_s'] * 1000:.3f}"),
+        ("Tempo máx (ms)", lambda r: "-" if r["tempo_max_s"] is None else f"{r['tempo_max_s'] * 1000:.3f}"),
+        ("Expandidos", lambda r: "-" if r["expandidos_medio"] is None else f"{r['expandidos_medio']:.1f}"),
+        ("Caminhos", lambda r: "-" if r["caminhos_materializados_medio"] is None else f"{r['caminhos_materializados_medio']:.1f}"),
+        ("Memória pico (KiB)", lambda r: "-" if r["memoria_pico_max_bytes"] is None else f"{r['memoria_pico_max_bytes'] / 1024:.1f}"),
+    ]
+    linhas = [[titulo for titulo, _ in colunas]]
+    linhas += [[valor(r) for _, valor in colunas] for r in resultados]
+    larguras = [max(len(linha[i]) for linha in linhas) for i in range(len(colunas))]
+
+    texto = []
+    for n, linha in enumerate(linhas):
+        texto.append("  ".join(celula.ljust(larguras[i]) for i, celula in enumerate(linha)))
+        if n == 0:
+            texto.append("  ".join("-" * largura for largura in larguras))
+    return "\n".join(texto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o desempenho dos algoritmos de procura.")
+    parser.add_argument("mapas", nargs="*", help="Ficheiros JSON de mapas ou pastas de mapas compilados (.mapa)")
+    parser.add_argument("--gerar", action="append", default=[], metavar="TIPO:NOS",
+                        help=f"Gera um mapa sintético antes de medir ({', '.join(TIPOS_MAPA)}), ex.: grelha:1000")
+    parser.add_argument("--algoritmos", nargs="+", choices=list(ALGORITMOS), default=list(ALGORITMOS))
+    parser.add_argument("--consultas", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--profundidade", type=int, default=10, help="Profundidade máxima da procura iterativa")
+    parser.add_argument("--iteracoes", type=int, default=10, help="Iterações do simulated annealing e hill climbing")
+    parser.add_argument("--expansoes", type=int, default=100000, help="Máximo de expansões da procura iterativa e do IDA* por veículo")
+    parser.add_argument("--sem-memoria", action="store_true", help="Não medir o pico de memória")
+    parser.add_argument("--saida", default="benchmark_resultados.json", help="Ficheiro JSON com os resultados")
+    parser.add_argument("--relatorio-memoria", action="store_true",
+                        help="Mede também os bytes por nó e por aresta de cada mapa carregado")
+    args = parser.parse_args()
+
+    registo.definir_nivel(registo.SILENCIOSO)
+
+    mapas = list(args.mapas)
+    with tempfile.TemporaryDirectory() as pasta:
+        for especificacao in args.gerar:
+            tipo, n = especificacao.split(":")
+            ficheiro = os.path.join(pasta, f"{tipo}_{n}.json")
+            guardar_mapa(gerar_mapa(tipo, int(n), semente=args.semente), ficheiro)
+            mapas.append(ficheiro)
+
+        if not mapas:
+            parser.error("Indique pelo menos um mapa ou use --gerar.")
+
+        resultados = executar_benchmark(
+            mapas, args.algoritmos, args.consultas, args.semente,
+            {"profundidade": args.profundidade, "iteracoes": args.iteracoes, "expansoes": args.expansoes},
+            medir_memoria=not args.sem_memoria,
+        )
+        relatorios = [relatorio_memoria(mapa) for mapa in mapas] if args.relatorio_memoria else []
+
+    print(formatar_tabela(resultados))
+    saida = {"semente": args.semente, "resultados": resultados}
+    if relatorios:
+        print()
+        print(formatar_relatorio_memoria(relatorios))
+        saida["memoria_mapas"] = relatorios
+    with open(args.saida, "w") as f:
+        json.dump(saida, f, indent=2)
+    print(f"\nResultados guardados em '{args.saida}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+import registo
+from algoritmos_procura import ETAPAS_PROCURA, caminhos_reutilizaveis, escolher_rota, concluir_procura
+
+
+class CacheRotas:
+    """
+    Cache LRU dos caminhos calculados pelas procuras de um grafo, com chave (algoritmo, origem,
+    destino, argumentos, tipos de veículo da origem, versão das rotas do grafo). Como a versão
+    muda com qualquer alteração que possa mudar os caminhos, as entradas antigas nunca voltam
+    a ser usadas e acabam por sair pela ordem LRU; não há invalidação explícita.
+
+    Só são guardados os caminhos de cada veículo (ver ETAPAS_PROCURA). A escolha da rota entre
+    eles, que valida a origem e cada caminho com os medicamentos e a população atuais, a
+    distribuição dos medicamentos e o desenho correm em todos os pedidos. A distribuição não
+    muda a versão das rotas (Grafo.get_versao_rotas), pelo que repetir um pedido com sucesso
+    reutiliza os caminhos. As procuras cujos caminhos não são reutilizáveis
+    (caminhos_reutilizaveis) correm sempre, sem passar pela cache.
+    """
+
+    def __init__(self, grafo, capacidade=128):
+        self.grafo = grafo
+        self.capacidade = capacidade
+        self.entradas = OrderedDict()  # {chave: [(veiculo, caminho, distância)]}, da menos para a mais recente
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def _chave(self, procura, origem, destino, argumentos):
+        tipos = tuple(sorted(veiculo.get_tipo() for veiculo in self.grafo.get_veiculos_no(origem)))
+        return (procura.__name__, origem, destino, argumentos, tipos, self.grafo.get_versao_rotas())
+
+    def procurar(self, procura, origem, destino, *argumentos):
+        """
+        Retorna procura(grafo, origem, destino, *argumentos), com os caminhos obtidos da cache
+        se o mesmo pedido já foi feito sem alterações dos caminhos entretanto.
+        """
+        if not caminhos_reutilizaveis(procura, destino, argumentos):
+            return procura(self.grafo, origem, destino, *argumentos)
+        calcular_caminhos, distribuir = ETAPAS_PROCURA[procura]
+
+        def caminhos():
+            chave = self._chave(procura, origem, destino, argumentos)
+            if chave in self.entradas:
+                self.entradas.move_to_end(chave)
+                self.acertos += 1
+                registo.debug("[CACHE] Caminhos %s -> %s (%s) obtidos da cache, versão %s",
+                    origem, destino, procura.__name__, chave[-1])
+                return self.entradas[chave]
+
+            self.falhas += 1
+            resultado = calcular_caminhos(self.grafo, origem, destino, *argumentos)
+            self._guardar(chave, resultado)
+            return resultado
+
+        solucao = escolher_rota(self.grafo, origem, destino, caminhos)
+        return concluir_procura(self.grafo, solucao, distribuir)
+
+    def _guardar(self, chave, caminhos):
+        self.entradas[chave] = caminhos
+        self.entradas.move_to_end(chave)
+        while len(self.entradas) > self.capacidade:
+            self.entradas.popitem(last=False)
+            self.remocoes += 1
+
+    def limpar(self):
+        self.entradas.clear()
+
+    def estatisticas(self):
+        pedidos = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acertos": self.acertos / pedidos if pedidos else 0.0,
+            "remocoes": self.remocoes,
+            "entradas": len(self.entradas),
+            "capacidade": self.capacidade,
+            "versao": self.grafo.get_versao_rotas(),
+        }
@@ -2,11 +2,12 @@ import random
 import time
 from grafo import Grafo
 
-def alterar_dinamicamente(grafo, queue):
+def alterar_dinamicamente(grafo, queue, avancar_tempo=True):
     """
     Realiza alterações dinâmicas no grafo e coloca mensagens na fila.
     Utiliza veículos da lista global `grafo.veiculos_carregados`.
-    Aplica uma redução de janela de tempo para nós com população > 0 após cada alteração.
+    Aplica uma redução de janela de tempo para nós com população > 0 após cada alteração,
+    exceto se avancar_tempo for False (modo em lote).
     """
     alteracao = random.choice(["estrada", "veiculo", "populacao"])
     mensagem = ""
@@ -17,11 +18,10 @@ def alterar_dinamicamente(grafo, queue):
             vizinho = random.choice(grafo.m_graph[no.getNome()])
             nome_vizinho = vizinho[0]
             bloqueada = vizinho[2]
-            nova_estrada = (vizinho[0], vizinho[1], not bloqueada, vizinho[3])
-            grafo.m_graph[no.getNome()] = [
-                nova_estrada if v[0] == nome_vizinho else v
-                for v in grafo.m_graph[no.getNome()]
-            ]
+            if bloqueada:
+                grafo.desbloquear_aresta(no.getNome(), nome_vizinho)
+            else:
+                grafo.bloquear_aresta(no.getNome(), nome_vizinho)
             mensagem = (
                 f"[DINÂMICO] A estrada entre {no.getNome()} e {nome_vizinho} "
                 f"ficou {'bloqueada' if not bloqueada else 'livre'}."
@@ -37,12 +37,13 @@ def alterar_dinamicamente(grafo, queue):
             if random.choice([True, False]):  # Decidir se vai adicionar ou remover
                 # Adicionar um veículo da lista global
                 veiculo_adicionado = random.choice(grafo.veiculos_carregados)
-                veiculos.append(veiculo_adicionado)
+                grafo.permitir_veiculo(no.getNome(), nome_vizinho, veiculo_adicionado)
                 mensagem = f"[DINÂMICO] Veículo '{veiculo_adicionado}' adicionado à estrada entre {no.getNome()} e {nome_vizinho}."
             else:
                 # Remover um veículo, se existir algum
                 if veiculos:
-                    veiculo_removido = veiculos.pop(random.randint(0, len(veiculos) - 1))
+                    veiculo_removido = random.choice(veiculos)
+                    grafo.proibir_veiculo(no.getNome(), nome_vizinho, veiculo_removido)
                     mensagem = f"[DINÂMICO] Veículo '{veiculo_removido}' removido da estrada entre {no.getNome()} e {nome_vizinho}."
                 else:
                     mensagem = f"[DINÂMICO] Nenhum veículo para remover na estrada entre {no.getNome()} e {nome_vizinho}."
@@ -54,22 +55,27 @@ def alterar_dinamicamente(grafo, queue):
         mensagem = (
             f"[DINÂMICO] População do nó {no.getNome()} alterada de {no.populacao} para {nova_populacao}."
         )
-        no.populacao = nova_populacao
+        grafo.alterar_no(no.getNome(), populacao=nova_populacao)
 
     if mensagem:
         queue.append(mensagem)
 
     # Reduzir as janelas de tempo após cada alteração dinâmica
-    grafo.ajustar_janelas_de_tempo()
-    grafo.atualizar_medicamentos_e_populacao()
+    if avancar_tempo:
+        grafo.avancar()
 
-def executar_alteracoes_dinamicas(grafo, vezes):
+def executar_alteracoes_dinamicas(grafo, vezes, em_lote=False):
     """
     Executa alterações dinâmicas no grafo um número de vezes especificado pelo utilizador.
+    Em lote, as alterações são todas aplicadas primeiro e o tempo avança depois, de uma só
+    vez, o mesmo número de passos (Grafo.avancar): as alterações de população deixam de ser
+    intercaladas com os passos de tempo.
     """
     queue = []
     for _ in range(vezes):
-        alterar_dinamicamente(grafo, queue)
+        alterar_dinamicamente(grafo, queue, avancar_tempo=not em_lote)
+    if em_lote:
+        grafo.avancar(vezes)
 
     print("\n[RESULTADO] Alterações dinâmicas realizadas:")
     for mensagem in queue:
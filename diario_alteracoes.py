@@ -0,0 +1,161 @@
+import itertools
+from collections import deque
+
+
+class Alteracao:
+    """
+    Alteração registada no DiarioAlteracoes. A versão é atribuída pelo diário no registo.
+    """
+
+    __slots__ = ("versao",)
+
+    CAMPOS = ()
+
+    def __repr__(self):
+        valores = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.CAMPOS)
+        return f"{type(self).__name__}({valores}, versao={self.versao})"
+
+
+class AlteracaoEstadoAresta(Alteracao):
+    """
+    A aresta origem -> destino passou a estar bloqueada (ou desbloqueada).
+    """
+
+    __slots__ = ("origem", "destino", "bloqueada")
+
+    CAMPOS = __slots__
+
+    def __init__(self, origem, destino, bloqueada):
+        self.versao = None
+        self.origem = origem
+        self.destino = destino
+        self.bloqueada = bloqueada
+
+
+class AlteracaoPermitidos(Alteracao):
+    """
+    O veículo tipo passou a ser permitido (ou deixou de o ser) na aresta origem -> destino.
+    """
+
+    __slots__ = ("origem", "destino", "tipo", "permitido")
+
+    CAMPOS = __slots__
+
+    def __init__(self, origem, destino, tipo, permitido):
+        self.versao = None
+        self.origem = origem
+        self.destino = destino
+        self.tipo = tipo
+        self.permitido = permitido
+
+
+class NovaAresta(Alteracao):
+    """
+    Foi acrescentada a aresta origem -> destino.
+    """
+
+    __slots__ = ("origem", "destino", "peso")
+
+    CAMPOS = __slots__
+
+    def __init__(self, origem, destino, peso):
+        self.versao = None
+        self.origem = origem
+        self.destino = destino
+        self.peso = peso
+
+
+class AlteracaoNo(Alteracao):
+    """
+    Mudou o campo (população, janela de tempo, medicamento, coordenadas, uma condição
+    meteorológica ou "no" para um nó novo ou substituído) do nó com o nome dado, ou de todos
+    os nós (no None) numa atualização vetorizada.
+    """
+
+    __slots__ = ("no", "campo")
+
+    CAMPOS = __slots__
+
+    def __init__(self, no, campo):
+        self.versao = None
+        self.no = no
+        self.campo = campo
+
+
+class AlteracaoGeral(Alteracao):
+    """
+    Alteração que não é descrita com mais detalhe (custos dos veículos, arestas reescritas
+    diretamente em m_graph): quem depende do motivo deve descartar o que calculou.
+    """
+
+    __slots__ = ("motivo",)
+
+    CAMPOS = __slots__
+
+    def __init__(self, motivo):
+        self.versao = None
+        self.motivo = motivo
+
+
+# Alterações que mudam as arestas acessíveis a algum veículo (AlteracaoGeral só com motivo "arestas")
+ALTERACOES_ARESTAS = (AlteracaoEstadoAresta, AlteracaoPermitidos, NovaAresta, AlteracaoGeral)
+
+
+class DiarioAlteracoes:
+    """
+    Diário das alterações de um grafo e dos seus nós. Cada alteração recebe a versão seguinte
+    (um inteiro que só cresce, ver Grafo.get_versao), fica guardada nas últimas capacidade
+    entradas e é entregue, por ordem de subscrição, às funções subscritas para o seu tipo.
+
+    As estruturas derivadas do grafo (listas de adjacência por id, marcos, hierarquias,
+    planeadores incrementais) subscrevem apenas os tipos de que dependem e invalidam só o que
+    a alteração afeta; quem não é avisado a cada alteração (por exemplo, uma cache que guarda
+    a versão) pode pedir as alterações desde uma versão com desde().
+    """
+
+    def __init__(self, capacidade=1024):
+        self.versao = 0
+        self.alteracoes = deque(maxlen=capacidade)
+        self.subscritores = []  # [(função, tipos de alteração ou None para todos)]
+
+    def __len__(self):
+        return len(self.alteracoes)
+
+    def __getstate__(self):
+        # Os subscritores são estruturas do processo que os registou e não seguem para outros
+        estado = self.__dict__.copy()
+        estado["subscritores"] = []
+        return estado
+
+    def subscrever(self, funcao, tipos=None):
+        """
+        Regista funcao(alteracao), chamada depois de cada alteração de um dos tipos dados
+        (uma classe ou um tuplo de classes de Alteracao; todas se tipos for None).
+        """
+        self.subscritores.append((funcao, tipos))
+
+    def cancelar(self, funcao):
+        self.subscritores = [(f, tipos) for f, tipos in self.subscritores if f != funcao]
+
+    def registar(self, alteracao):
+        """
+        Atribui a próxima versão à alteração, guarda-a e avisa os subscritores.
+        """
+        self.versao += 1
+        alteracao.versao = self.versao
+        self.alteracoes.append(alteracao)
+        for funcao, tipos in self.subscritores:
+            if tipos is None or isinstance(alteracao, tipos):
+                funcao(alteracao)
+        return alteracao
+
+    def desde(self, versao):
+        """
+        Retorna as alterações com versão maior que a dada, por ordem, ou None se o diário já
+        não guardar todas (a mais antiga pedida saiu pela capacidade).
+        """
+        if versao >= self.versao:
+            return []
+        if not self.alteracoes or self.alteracoes[0].versao > versao + 1:
+            return None
+        return list(itertools.islice(self.alteracoes, versao + 1 - self.alteracoes[0].versao, None))
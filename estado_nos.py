@@ -0,0 +1,142 @@
+import numpy as np
+
+# Atributos guardados no EstadoNos
+CAMPOS_NO = ("x", "y", "populacao", "janela_tempo", "medicamento")
+CAMPOS_METEOROLOGIA = ("chuva", "tempestade", "vento", "nevoeiro")
+CAMPOS = CAMPOS_NO + CAMPOS_METEOROLOGIA
+
+
+class CampoEstado:
+    """
+    Descritor de um atributo de No ou de Meteorologia. Enquanto o nó não estiver ligado a um
+    EstadoNos, o valor fica no próprio objeto (em _<nome>); depois passa a ser lido e escrito
+    na posição do nó (o seu id) no array correspondente.
+
+    O objeto dono implementa _posicao_estado() -> (estado ou None, índice) e
+    _estado_alterado(nome), chamado depois de cada escrita.
+    """
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.privado = "_" + nome
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        estado, indice = obj._posicao_estado()
+        if estado is None:
+            return getattr(obj, self.privado)
+        return estado.ler(self.nome, indice)
+
+    def __set__(self, obj, valor):
+        estado, indice = obj._posicao_estado()
+        if estado is None:
+            setattr(obj, self.privado, valor)
+        else:
+            estado.escrever(self.nome, indice, valor)
+        obj._estado_alterado(self.nome)
+
+
+class EstadoNos:
+    """
+    Estado dos nós de um grafo em estrutura de arrays (struct-of-arrays): um array NumPy por
+    atributo (coordenadas, população, janela de tempo, medicamentos e as quatro condições
+    meteorológicas), indexado pelo id do nó. Os objetos No ligados ao estado passam a ser
+    vistas sobre estes arrays, e as atualizações globais (Grafo.ajustar_janelas_de_tempo e
+    Grafo.atualizar_medicamentos_e_populacao) são feitas de uma só vez sobre as colunas.
+
+    Cada coluna começa com inteiros e passa a float64 quando recebe um valor não inteiro, de
+    modo a que os valores lidos através dos nós mantenham o tipo original.
+    """
+
+    def __init__(self, capacidade=16):
+        self.n = 0
+        self.arrays = {campo: np.zeros(max(capacidade, 1), dtype=np.int64) for campo in CAMPOS}
+
+    @classmethod
+    def a_partir_de_nos(cls, nos):
+        """
+        Cria o estado com os valores atuais dos nós e liga-os a ele (ver ligar).
+        """
+        estado = cls(capacidade=len(nos))
+        for no in nos:
+            estado.ligar(no)
+        return estado
+
+    @classmethod
+    def a_partir_de_colunas(cls, colunas):
+        """
+        Cria o estado a partir de um array por campo (CAMPOS), usados sem cópia: por exemplo,
+        as colunas mapeadas em memória de um mapa compilado. Os nós são ligados depois com
+        Grafo.usar_estado_vetorial(estado=...).
+        """
+        estado = cls(capacidade=0)
+        estado.arrays = {campo: colunas[campo] for campo in CAMPOS}
+        estado.n = len(estado.arrays[CAMPOS[0]])
+        return estado
+
+    def coluna(self, campo):
+        """
+        Vista (sem cópia) dos valores de um atributo para os n nós.
+        """
+        return self.arrays[campo][:self.n]
+
+    def definir_coluna(self, campo, valores):
+        """
+        Substitui os valores de um atributo para os n nós, promovendo a coluna se necessário.
+        """
+        valores = np.asarray(valores)
+        array = self.arrays[campo]
+        if not np.can_cast(valores.dtype, array.dtype, casting="safe"):
+            array = self.arrays[campo] = array.astype(np.result_type(array.dtype, valores.dtype))
+        array[:self.n] = valores
+
+    def ler(self, campo, indice):
+        return self.arrays[campo][indice].item()
+
+    def escrever(self, campo, indice, valor):
+        array = self.arrays[campo]
+        if array.dtype.kind in "iu" and not isinstance(valor, (int, np.integer)):
+            array = self.arrays[campo] = array.astype(np.float64)
+        array[indice] = valor
+
+    def _garantir_capacidade(self, n):
+        capacidade = len(self.arrays[CAMPOS[0]])
+        if n <= capacidade:
+            return
+        nova = max(n, 2 * capacidade)
+        for campo, array in self.arrays.items():
+            maior = np.zeros(nova, dtype=array.dtype)
+            maior[:self.n] = array[:self.n]
+            self.arrays[campo] = maior
+
+    def ligar(self, no):
+        """
+        Copia os valores do nó (e da sua meteorologia) para a posição do seu id e liga o nó
+        ao estado. O id tem de ser uma posição já existente ou a seguinte (id == n).
+        """
+        indice = no.getId()
+        if indice > self.n:
+            raise ValueError(f"O nó {no.getNome()} tem id {indice}, mas o estado só tem {self.n} nós.")
+
+        valores = {campo: getattr(no, campo) for campo in CAMPOS_NO}
+        valores.update({campo: getattr(no.meteorologia, campo) for campo in CAMPOS_METEOROLOGIA})
+
+        if indice == self.n:
+            self._garantir_capacidade(self.n + 1)
+            self.n += 1
+        for campo, valor in valores.items():
+            self.escrever(campo, indice, valor)
+        no.estado = self
+
+    def desligar(self, no):
+        """
+        Copia os valores da posição do nó de volta para o objeto e desliga-o do estado.
+        """
+        valores = {campo: getattr(no, campo) for campo in CAMPOS_NO}
+        meteorologia = {campo: getattr(no.meteorologia, campo) for campo in CAMPOS_METEOROLOGIA}
+        no.estado = None
+        for campo, valor in valores.items():
+            setattr(no, "_" + campo, valor)
+        for campo, valor in meteorologia.items():
+            setattr(no.meteorologia, "_" + campo, valor)
@@ -0,0 +1,146 @@
+import heapq
+import numpy as np
+
+INF = float('inf')
+
+
+class FilaPrioridadesNos:
+    """
+    Fila de prioridade indexada (min-heap endereçável) com as prioridades das zonas de um grafo.
+
+    A chave de cada nó é (No.calcula_prioridade(), id do nó): o topo é o nó de maior prioridade
+    (menor valor) e, em caso de empate, o de menor id, tal como na procura linear por m_nodes.
+    Cada nó guarda a sua posição no heap, pelo que uma alteração da população, da janela de
+    tempo ou da meteorologia de um nó é refletida em O(log V) (ver No.observador_prioridade).
+    """
+
+    def __init__(self, nos=()):
+        self.heap = []  # ids dos nós, organizados como min-heap pelas chaves
+        self.posicoes = {}  # {id: posição em heap}
+        self.chaves = {}  # {id: (prioridade, id)}
+        self.nos = {}  # {id: nó}
+        self.desatualizada = False  # Se True, as chaves não refletem as prioridades atuais
+        for no in nos:
+            self.atualizar(no)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, no):
+        return self.nos.get(no.getId()) is no
+
+    def atualizar(self, no):
+        """
+        Insere o nó ou reposiciona-o depois de a sua prioridade mudar. Também é o observador
+        chamado pelos nós (No.observador_prioridade).
+        """
+        if self.desatualizada:
+            return  # Todas as chaves são recalculadas na reconstrução
+
+        id_no = no.getId()
+        chave = (no.calcula_prioridade(), id_no)
+        self.nos[id_no] = no
+        posicao = self.posicoes.get(id_no)
+        if posicao is None:
+            self.heap.append(id_no)
+            self.chaves[id_no] = chave
+            self.posicoes[id_no] = len(self.heap) - 1
+            self._subir(len(self.heap) - 1)
+            return
+
+        anterior = self.chaves[id_no]
+        self.chaves[id_no] = chave
+        if chave < anterior:
+            self._subir(posicao)
+        elif chave > anterior:
+            self._descer(posicao)
+
+    def invalidar(self):
+        """
+        Marca a fila como desatualizada, depois de uma alteração em bloco das prioridades que
+        não passou pelos nós (ver Grafo.usar_estado_vetorial).
+        """
+        self.desatualizada = True
+
+    def reconstruir(self, nos, prioridades):
+        """
+        Reconstrói a fila com os nós dados e as respetivas prioridades, indexadas pelo id do nó
+        (por exemplo, Grafo.calcula_prioridades). Um array ordenado pelas chaves é um heap válido.
+        """
+        ids = [no.getId() for no in nos]
+        ordem = np.lexsort((ids, prioridades[ids]))
+        self.heap = [ids[i] for i in ordem.tolist()]
+        self.posicoes = {id_no: posicao for posicao, id_no in enumerate(self.heap)}
+        self.chaves = {id_no: (prioridade, id_no) for id_no, prioridade in zip(ids, prioridades[ids].tolist())}
+        self.nos = {no.getId(): no for no in nos}
+        self.desatualizada = False
+
+    def remover(self, no):
+        id_no = no.getId()
+        posicao = self.posicoes.pop(id_no, None)
+        if posicao is None:
+            return
+        del self.chaves[id_no]
+        del self.nos[id_no]
+
+        ultimo = self.heap.pop()
+        if posicao < len(self.heap):
+            self.heap[posicao] = ultimo
+            self.posicoes[ultimo] = posicao
+            self._subir(posicao)
+            self._descer(self.posicoes[ultimo])
+
+    def topo(self):
+        """
+        Retorna o nó de maior prioridade, ou None se nenhum nó tiver prioridade finita.
+        """
+        if not self.heap or self.chaves[self.heap[0]][0] == INF:
+            return None
+        return self.nos[self.heap[0]]
+
+    def menores(self, k=None, incluir_infinitos=True):
+        """
+        Retorna os k nós de maior prioridade, por ordem (todos se k for None), em O(k log k):
+        percorre o heap com uma fila auxiliar dos candidatos, sem o alterar.
+        """
+        if k is None:
+            k = len(self.heap)
+
+        resultado = []
+        candidatos = [(self.chaves[self.heap[0]], 0)] if self.heap else []
+        while candidatos and len(resultado) < k:
+            chave, posicao = heapq.heappop(candidatos)
+            if chave[0] == INF and not incluir_infinitos:
+                break
+            resultado.append(self.nos[self.heap[posicao]])
+            for filho in (2 * posicao + 1, 2 * posicao + 2):
+                if filho < len(self.heap):
+                    heapq.heappush(candidatos, (self.chaves[self.heap[filho]], filho))
+        return resultado
+
+    def _trocar(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.posicoes[heap[i]] = i
+        self.posicoes[heap[j]] = j
+
+    def _subir(self, posicao):
+        while posicao > 0:
+            pai = (posicao - 1) // 2
+            if self.chaves[self.heap[posicao]] >= self.chaves[self.heap[pai]]:
+                return
+            self._trocar(posicao, pai)
+            posicao = pai
+
+    def _descer(self, posicao):
+        n = len(self.heap)
+        while True:
+            menor = posicao
+            for filho in (2 * posicao + 1, 2 * posicao + 2):
+                if filho < n and self.chaves[self.heap[filho]] < self.chaves[self.heap[menor]]:
+                    menor = filho
+            if menor == posicao:
+                return
+            self._trocar(posicao, menor)
+            posicao = menor
+
@@ -0,0 +1,196 @@
+import os
+import json
+import math
+import random
+import argparse
+
+TIPOS_MAPA = ("grelha", "geometrico", "livre_escala")
+VEICULOS_POR_OMISSAO = ("carro", "barco", "aviao")
+
+
+def _gerar_no(nome, x, y, rng, veiculos, prob_deposito, prob_populacao):
+    """
+    Gera os dados de um nó no formato lido por menu.carregar_grafo.
+    """
+    deposito = rng.random() < prob_deposito
+    populacao = rng.randint(10, 1000) if (not deposito and rng.random() < prob_populacao) else 0
+
+    meteorologia = {"chuva": 0, "tempestade": 0, "vento": 0, "nevoeiro": 0}
+    if rng.random() < 0.3:
+        for condicao in meteorologia:
+            if rng.random() < 0.5:
+                meteorologia[condicao] = rng.randint(0, 20)
+
+    if deposito:
+        veiculos_no = list(veiculos)
+    else:
+        veiculos_no = rng.sample(veiculos, rng.randint(1, len(veiculos)))
+
+    return {
+        "nome": nome,
+        "populacao": populacao,
+        "tempo": rng.randint(1, 24),
+        "x": round(x, 3),
+        "y": round(y, 3),
+        "medicamento": rng.randint(500, 20000) if deposito else 0,
+        "meteorologia": meteorologia,
+        "veiculos": veiculos_no,
+    }
+
+
+def _gerar_aresta(origem, destino, peso, rng, veiculos, prob_bloqueio):
+    """
+    Gera os dados de uma aresta no formato lido por menu.carregar_grafo.
+    """
+    permitidos = [tipo for tipo in veiculos if rng.random() < 0.8]
+    if not permitidos:
+        permitidos = [rng.choice(veiculos)]
+
+    return {
+        "origem": origem,
+        "destino": destino,
+        "peso": max(1, int(round(peso))),
+        "bloqueada": rng.random() < prob_bloqueio,
+        "permitidos": permitidos,
+    }
+
+
+def _coordenadas_grelha(n):
+    lado = math.ceil(math.sqrt(n))
+    return [(float(i % lado), float(i // lado)) for i in range(n)], lado
+
+
+def _arestas_grelha(n, lado, rng):
+    """
+    Liga cada nó da grelha ao vizinho da direita e ao de baixo.
+    """
+    for i in range(n):
+        if (i + 1) % lado != 0 and i + 1 < n:
+            yield i, i + 1, rng.randint(1, 10)
+        if i + lado < n:
+            yield i, i + lado, rng.randint(1, 10)
+
+
+def _arestas_geometrico(coordenadas, raio):
+    """
+    Liga todos os pares de nós a distância euclidiana <= raio, usando uma grelha de células
+    de lado raio para evitar comparar todos os pares.
+    """
+    celulas = {}
+    for i, (x, y) in enumerate(coordenadas):
+        celulas.setdefault((int(x // raio), int(y // raio)), []).append(i)
+
+    for (cx, cy), membros in celulas.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                vizinhos = celulas.get((cx + dx, cy + dy))
+                if not vizinhos:
+                    continue
+                for i in membros:
+                    xi, yi = coordenadas[i]
+                    for j in vizinhos:
+                        if j <= i:
+                            continue
+                        xj, yj = coordenadas[j]
+                        distancia = math.hypot(xi - xj, yi - yj)
+                        if distancia <= raio:
+                            yield i, j, distancia * 10
+
+
+def _arestas_livre_escala(n, m, rng):
+    """
+    Modelo de Barabási-Albert: cada novo nó liga-se a m nós existentes escolhidos
+    com probabilidade proporcional ao grau.
+    """
+    extremos = []  # Cada nó aparece uma vez por cada aresta em que participa
+    for i in range(1, min(m + 1, n)):
+        extremos.extend((0, i))
+        yield 0, i, rng.randint(1, 10)
+
+    for i in range(m + 1, n):
+        escolhidos = set()
+        while len(escolhidos) < m:
+            escolhidos.add(rng.choice(extremos))
+        for j in escolhidos:
+            extremos.extend((i, j))
+            yield i, j, rng.randint(1, 10)
+
+
+def gerar_mapa(tipo, n, semente=0, veiculos=VEICULOS_POR_OMISSAO, grau_medio=6,
+               prob_deposito=0.02, prob_populacao=0.6, prob_bloqueio=0.05):
+    """
+    Gera um mapa sintético com n nós no mesmo formato JSON lido por menu.carregar_grafo.
+
+    Tipos suportados:
+    - "grelha": grelha quadrada com ligações aos vizinhos horizontais e verticais;
+    - "geometrico": pontos aleatórios ligados quando estão a menos de um raio escolhido
+      para obter o grau médio pedido;
+    - "livre_escala": grafo de Barabási-Albert (poucos nós muito ligados, como aeroportos).
+    """
+    if tipo not in TIPOS_MAPA:
+        raise ValueError(f"Tipo de mapa desconhecido: '{tipo}'. Use um de {', '.join(TIPOS_MAPA)}.")
+
+    rng = random.Random(semente)
+    veiculos = list(veiculos)
+    nomes = [f"N{i}" for i in range(n)]
+
+    if tipo == "grelha":
+        coordenadas, lado = _coordenadas_grelha(n)
+        arestas = _arestas_grelha(n, lado, rng)
+    elif tipo == "geometrico":
+        lado = math.sqrt(n)
+        coordenadas = [(rng.uniform(0, lado), rng.uniform(0, lado)) for _ in range(n)]
+        raio = math.sqrt(grau_medio / math.pi)
+        arestas = _arestas_geometrico(coordenadas, raio)
+    else:
+        lado = math.sqrt(n)
+        coordenadas = [(rng.uniform(0, lado), rng.uniform(0, lado)) for _ in range(n)]
+        arestas = _arestas_livre_escala(n, max(1, grau_medio // 2), rng)
+
+    nos = [
+        _gerar_no(nomes[i], x, y, rng, veiculos, prob_deposito, prob_populacao)
+        for i, (x, y) in enumerate(coordenadas)
+    ]
+    lista_arestas = [
+        _gerar_aresta(nomes[i], nomes[j], peso, rng, veiculos, prob_bloqueio)
+        for i, j, peso in arestas
+    ]
+
+    return {"nos": nos, "arestas": lista_arestas}
+
+
+def guardar_mapa(mapa, ficheiro):
+    """
+    Guarda o mapa em JSON, criando a pasta se necessário.
+    """
+    pasta = os.path.dirname(ficheiro)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(ficheiro, "w") as f:
+        json.dump(mapa, f, separators=(",", ":"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera mapas sintéticos para testar os algoritmos de procura.")
+    parser.add_argument("tipo", choices=TIPOS_MAPA)
+    parser.add_argument("nos", type=int, help="Número de nós do mapa")
+    parser.add_argument("-o", "--saida", help="Ficheiro JSON de saída (por omissão mapas_gerados/<tipo>_<nos>.json)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--grau-medio", type=int, default=6)
+    parser.add_argument("--prob-deposito", type=float, default=0.02)
+    parser.add_argument("--prob-populacao", type=float, default=0.6)
+    parser.add_argument("--prob-bloqueio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    saida = args.saida or os.path.join("mapas_gerados", f"{args.tipo}_{args.nos}.json")
+    mapa = gerar_mapa(
+        args.tipo, args.nos, semente=args.semente, grau_medio=args.grau_medio,
+        prob_deposito=args.prob_deposito, prob_populacao=args.prob_populacao,
+        prob_bloqueio=args.prob_bloqueio,
+    )
+    guardar_mapa(mapa, saida)
+    print(f"Mapa '{args.tipo}' com {len(mapa['nos'])} nós e {len(mapa['arestas'])} arestas guardado em '{saida}'.")
+
+
+if __name__ == "__main__":
+    main()
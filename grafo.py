@@ -1,96 +1,633 @@
 import math
+import copy
+import heapq
+from collections import OrderedDict
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 from no import No
+import registo
+import metricas
+from grafo_csr import GrafoCSR
+from marcos import Marcos
+from hierarquias import HierarquiasGrafo
+from planeamento_incremental import PlaneadorIncremental
+from fila_prioridade import FilaPrioridadesNos
+from estado_nos import EstadoNos, CAMPOS, CAMPOS_NO, CAMPOS_METEOROLOGIA
+from diario_alteracoes import (DiarioAlteracoes, AlteracaoEstadoAresta, AlteracaoPermitidos, NovaAresta,
+    AlteracaoNo, AlteracaoGeral, ALTERACOES_ARESTAS)
+
+# Campos dos nós alterados pela distribuição de medicamentos, que não mudam os caminhos
+CAMPOS_DISTRIBUICAO = ("medicamento", "populacao")
+
 
 class Grafo:
     def __init__(self, directed=False):
         self.m_nodes = []  # Lista de nós
+        self.m_nos_por_nome = {}  # Índice: {nome: nó}
+        self.m_ids = {}  # Índice: {nome: id inteiro (posição em m_nodes)}
         self.m_directed = directed  # Indica se o grafo é direcionado
         self.m_graph = {}  # Representação do grafo: {nó: [(vizinho, peso, bloqueada)]}
+        self.m_arestas = {}  # Índice de arestas: {(origem, destino): [posições em m_graph[origem]]}
         self.m_h = {}  # Heurísticas: {nó: valor}
         self.custos_veiculos = {}  # Dicionário global para custos de veículos
         self.veiculos_carregados = [] 
+        self.m_usar_csr = False  # Se True, as consultas de adjacência usam a representação CSR
+        self.m_csr = None  # Representação CSR (construída a pedido a partir de m_graph)
+        self.desenho_ativo = True  # Se False, desenha() não faz nada (útil em benchmarks)
+        self.m_inverso = None  # Predecessores de cada nó (só usado em grafos direcionados)
+        self.m_marcos = None  # Marcos (landmarks) para a heurística ALT, construídos a pedido
+        self.m_hierarquias = None  # Hierarquias de contração por tipo de veículo, construídas a pedido
+        self.m_planeadores = OrderedDict()  # Planeadores incrementais (LPA*): {(origem, tipo de veículo): planeador}, LRU
+        self.m_max_planeadores = 8  # Cada planeador guarda O(V) estado: os menos usados são descartados
+        self.m_fila_prioridades = None  # Fila de prioridade indexada das zonas, construída a pedido
+        self.m_estado = None  # Estado dos nós em arrays (EstadoNos), se ativo
+        self.m_adjacencia_ids = {}  # Listas de adjacência por id: {tipo de veículo: [[(id, peso)]]}
+        self.m_ordem_nomes = None  # Posição de cada nó (por id) na ordem alfabética dos nomes
+        self.m_diario = DiarioAlteracoes()  # Alterações das arestas e dos nós, com a versão do grafo
+        self.m_versao_rotas = 0  # Alterações que podem mudar os caminhos das procuras (ver get_versao_rotas)
+        self.subscrever_alteracoes(self._atualizar_adjacencia_ids, ALTERACOES_ARESTAS)
+        self.subscrever_alteracoes(self._contar_versao_rotas)
 
         # Atualizar heurísticas com base no nó de maior prioridade
         no_destino = self.get_no_maior_prioridade()
         if no_destino:
             self.atualizar_heuristicas(no_destino)
         else:
-            print("[INFO] Nenhum nó de maior prioridade disponível no momento.")
+            registo.debug("[INFO] Nenhum nó de maior prioridade disponível no momento.")
 
     def get_node_by_name(self, nome_no):
         """
         Retorna o nó pelo nome, ou None se o nó não existir.
         """
-        for node in self.m_nodes:
-            if node.getNome() == nome_no:
-                return node
-        return None
+        return self.m_nos_por_nome.get(nome_no)
+
+    def get_versao(self):
+        """
+        Retorna a versão atual do grafo, que aumenta a cada alteração das arestas, dos nós ou
+        dos custos dos veículos (ver DiarioAlteracoes).
+        """
+        return self.m_diario.versao
+
+    def get_versao_rotas(self):
+        """
+        Retorna a versão do grafo para os caminhos das procuras: aumenta com as mesmas
+        alterações que get_versao, exceto as dos medicamentos e da população dos nós. Estes só
+        são lidos na escolha da rota entre os caminhos (algoritmos_procura.escolher_rota), e
+        são precisamente o que a distribuição de medicamentos altera depois de cada procura.
+        """
+        return self.m_versao_rotas
+
+    def _contar_versao_rotas(self, alteracao):
+        if not (isinstance(alteracao, AlteracaoNo) and alteracao.campo in CAMPOS_DISTRIBUICAO):
+            self.m_versao_rotas += 1
+
+    def subscrever_alteracoes(self, funcao, tipos=None):
+        """
+        Regista funcao(alteracao), chamada depois de cada alteração do grafo de um dos tipos
+        dados (classes de diario_alteracoes; todas se tipos for None).
+        """
+        self.m_diario.subscrever(funcao, tipos)
+
+    def alteracoes_desde(self, versao):
+        """
+        Retorna as alterações posteriores à versão dada, ou None se já não estiverem todas no diário.
+        """
+        return self.m_diario.desde(versao)
+
+    def get_id(self, nome_no):
+        """
+        Retorna o id inteiro do nó (a sua posição em m_nodes), ou None se o nó não existir.
+        """
+        return self.m_ids.get(nome_no)
+
+    def adicionar_no(self, no):
+        """
+        Adiciona um nó ao grafo, mantendo os índices por nome consistentes com m_nodes.
+        Se já existir um nó com o mesmo nome, é substituído na mesma posição.
+        """
+        nome = no.getNome()
+        id_no = self.m_ids.get(nome)
+        if id_no is None:
+            id_no = len(self.m_nodes)
+            self.m_nodes.append(no)
+            self.m_ids[nome] = id_no
+            self.m_graph.setdefault(nome, [])
+        else:
+            self.m_nodes[id_no].observador_prioridade = None
+            self.m_nodes[id_no].diario = None
+            if self.m_estado is not None:
+                self.m_estado.desligar(self.m_nodes[id_no])
+            self.m_nodes[id_no] = no
+
+        no.setId(id_no)
+        no.diario = self.m_diario
+        self.m_diario.registar(AlteracaoNo(nome, "no"))
+        self.m_nos_por_nome[nome] = no
+        if self.m_estado is not None:
+            self.m_estado.ligar(no)
+        if self.m_fila_prioridades is not None:
+            no.observador_prioridade = self.m_fila_prioridades
+            self.m_fila_prioridades.atualizar(no)
+        return no
+
+    def adicionar_nos(self, nos):
+        """
+        Adiciona vários nós (ver adicionar_no). A fila de prioridades, se existir, é reconstruída
+        de uma só vez na próxima consulta em vez de ser atualizada nó a nó.
+        """
+        if self.m_fila_prioridades is not None:
+            self.m_fila_prioridades.invalidar()
+        for no in nos:
+            self.adicionar_no(no)
 
-    def ajustar_janelas_de_tempo(self):
+    def ajustar_janelas_de_tempo(self, passos=1):
         """
-        Reduz a janela de tempo em 1 para todos os nós com população > 0.
-        A janela de tempo não pode ser menor que 0.
+        Reduz a janela de tempo em passos unidades (1 por omissão) para todos os nós com
+        população > 0. A janela de tempo não pode ser menor que 0.
         """
+        if self.m_estado is not None:
+            self._ajustar_janelas_de_tempo_vetorial(passos)
+            return
+
         for no in self.m_nodes:
             if no.populacao > 0:
-                no.janela_tempo = max(0, no.janela_tempo - 1)
-                print(f"[AJUSTE] Janela de tempo do nó {no.getNome()} ajustada para {no.janela_tempo}.")
+                no.janela_tempo = max(0, no.janela_tempo - passos)
+                registo.trace("[AJUSTE] Janela de tempo do nó %s ajustada para %s.", no.getNome(), no.janela_tempo)
+
+    def avancar(self, passos=1):
+        """
+        Avança o tempo um número de passos. Cada passo equivale a ajustar_janelas_de_tempo
+        seguido de atualizar_medicamentos_e_populacao, mas os passos são aplicados numa só
+        passagem: depois do primeiro, cada nó ou ficou sem população (janela 24, que os passos
+        seguintes não alteram) ou sem medicamentos (a população não muda e a janela desce 1 por
+        passo). Os restantes passos reduzem-se por isso a descontar passos - 1 às janelas.
+        """
+        if passos <= 0:
+            return
+
+        self.ajustar_janelas_de_tempo()
+        self.atualizar_medicamentos_e_populacao()
+        if passos > 1:
+            self.ajustar_janelas_de_tempo(passos - 1)
+
+    def _ajustar_janelas_de_tempo_vetorial(self, passos):
+        populacao = self.m_estado.coluna("populacao")
+        janela = self.m_estado.coluna("janela_tempo")
+        ajustados = populacao > 0
+        janela[ajustados] = np.maximum(0, janela[ajustados] - passos)
+        self._prioridades_alteradas("janela_tempo")
 
+        if registo.ativo(registo.TRACE):
+            for id_no in np.flatnonzero(ajustados):
+                registo.trace("[AJUSTE] Janela de tempo do nó %s ajustada para %s.",
+                    self.m_nodes[id_no].getNome(), self.m_nodes[id_no].janela_tempo)
+
+    def usar_estado_vetorial(self, ativo=True, estado=None):
+        """
+        Ativa (ou desativa) o armazenamento do estado dos nós em arrays (EstadoNos). Os objetos
+        No continuam a funcionar como antes, mas passam a ser vistas sobre os arrays, e as
+        atualizações globais de janelas de tempo, medicamentos e população são vetorizadas.
+        Com estado (um EstadoNos já preenchido, indexado pelos ids), os nós passam a ser vistas
+        sobre ele sem que os seus valores atuais sejam copiados (ver mapa_compilado).
+        """
+        if ativo and estado is not None:
+            if len(self.m_nodes) != estado.n:
+                raise ValueError(f"O estado tem {estado.n} nós, mas o grafo tem {len(self.m_nodes)}.")
+            self.usar_estado_vetorial(False)
+            self.m_estado = estado
+            for no in self.m_nodes:
+                no.estado = estado
+            self._prioridades_alteradas(*CAMPOS)
+        elif ativo and self.m_estado is None:
+            self.m_estado = EstadoNos.a_partir_de_nos(self.m_nodes)
+        elif not ativo and self.m_estado is not None:
+            for no in self.m_nodes:
+                self.m_estado.desligar(no)
+            self.m_estado = None
+
+    def _prioridades_alteradas(self, *campos):
+        """
+        Chamado depois de uma atualização vetorizada dos campos dados, que não passa pelos nós:
+        a fila de prioridades é reconstruída na próxima consulta e a alteração fica no diário
+        como alteração de todos os nós.
+        """
+        for campo in campos:
+            self.m_diario.registar(AlteracaoNo(None, campo))
+        if self.m_fila_prioridades is not None:
+            self.m_fila_prioridades.invalidar()
 
     def _get_or_create_node(self, nome_no):
         """
         Obtém um nó existente ou cria um novo nó se ele não existir.
         """
-        for node in self.m_nodes:
-            if node.getNome() == nome_no:
-                return node
+        node = self.m_nos_por_nome.get(nome_no)
+        if node is not None:
+            return node
 
-        new_node = No(nome_no)
-        new_node.setId(len(self.m_nodes))
-        self.m_nodes.append(new_node)
-        self.m_graph[nome_no] = []
-        return new_node
+        return self.adicionar_no(No(nome_no))
 
     def add_edge(self, node1, node2, peso, blocked=False, permitidos=None):
         """
         Adiciona uma aresta entre dois nós com peso, estado (bloqueada ou não) e veículos permitidos.
         """
         permitidos = permitidos or []  # Define uma lista vazia como padrão
-        print(f"Adicionar aresta: {node1} -> {node2}, Peso: {peso}, Bloqueada: {blocked}, Permitidos: {permitidos}")
+        registo.trace("Adicionar aresta: %s -> %s, Peso: %s, Bloqueada: %s, Permitidos: %s", node1, node2, peso, blocked, permitidos)
 
         n1 = self._get_or_create_node(node1)
         n2 = self._get_or_create_node(node2)
 
         # Adicionar a aresta à estrutura do grafo
-        self.m_graph[node1].append((node2, peso, blocked, permitidos))
+        self._adicionar_registo_aresta(node1, (node2, peso, blocked, permitidos))
         if not self.m_directed:
-            self.m_graph[node2].append((node1, peso, blocked, permitidos))
+            self._adicionar_registo_aresta(node2, (node1, peso, blocked, permitidos))
+        self.m_csr = None
+        self.m_inverso = None
+        if self.m_marcos is not None:
+            # Novas arestas podem encurtar distâncias: os marcos são refeitos na próxima consulta
+            self.m_diario.cancelar(self.m_marcos.aplicar_alteracao)
+            self.m_marcos = None
+        self.m_diario.registar(NovaAresta(node1, node2, peso))
+        if not self.m_directed:
+            self.m_diario.registar(NovaAresta(node2, node1, peso))
+
+    def _adicionar_registo_aresta(self, origem, registo):
+        """
+        Acrescenta o registo à lista de adjacência da origem e indexa a sua posição.
+        """
+        lista = self.m_graph[origem]
+        self.m_arestas.setdefault((origem, registo[0]), []).append(len(lista))
+        lista.append(registo)
+
+    def get_aresta(self, origem, destino):
+        """
+        Retorna o registo (vizinho, peso, bloqueada, permitidos) da aresta origem -> destino,
+        ou None se não existir. Havendo arestas paralelas, retorna a primeira.
+        """
+        posicoes = self.m_arestas.get((origem, destino))
+        if not posicoes:
+            return None
+        return self.m_graph[origem][posicoes[0]]
+
+    def bloquear_aresta(self, origem, destino):
+        """
+        Bloqueia a estrada origem -> destino (nas duas direções, num grafo não direcionado).
+        Retorna False se a aresta não existir.
+        """
+        return self._alterar_estrada(origem, destino, True)
+
+    def desbloquear_aresta(self, origem, destino):
+        """
+        Desbloqueia a estrada origem -> destino (nas duas direções, num grafo não direcionado).
+        Retorna False se a aresta não existir.
+        """
+        return self._alterar_estrada(origem, destino, False)
+
+    def _alterar_estrada(self, origem, destino, bloqueada):
+        existe = self.set_estado_aresta(origem, destino, bloqueada)
+        if existe and not self.m_directed:
+            self.set_estado_aresta(destino, origem, bloqueada)
+        return existe
+
+    def set_estado_aresta(self, origem, destino, bloqueada):
+        """
+        Altera o estado (bloqueada ou não) das arestas origem -> destino, só nesta direção:
+        os registos são reescritos nas posições do índice de arestas (e da CSR), sem reconstruir
+        listas, e o diário recebe uma AlteracaoEstadoAresta se o estado mudar.
+        Retorna False se a aresta não existir.
+        """
+        posicoes = self.m_arestas.get((origem, destino))
+        if not posicoes:
+            return False
+
+        lista = self.m_graph[origem]
+        if all(lista[posicao][2] == bloqueada for posicao in posicoes):
+            return True
+        for posicao in posicoes:
+            adjacente, peso, _, permitidos = lista[posicao]
+            lista[posicao] = (adjacente, peso, bloqueada, permitidos)
+
+        if self.m_csr is not None:
+            base = self.m_csr.offsets[self.m_ids[origem]]
+            for posicao in posicoes:
+                self.m_csr.bloqueadas[base + posicao] = bloqueada
+
+        self.m_diario.registar(AlteracaoEstadoAresta(origem, destino, bloqueada))
+        return True
+
+    def permitir_veiculo(self, origem, destino, tipo):
+        """
+        Passa a permitir o tipo de veículo na estrada origem -> destino (nas duas direções, num
+        grafo não direcionado). Retorna False se a aresta não existir.
+        """
+        return self._alterar_permitidos(origem, destino, tipo, True)
+
+    def proibir_veiculo(self, origem, destino, tipo):
+        """
+        Deixa de permitir o tipo de veículo na estrada origem -> destino (nas duas direções, num
+        grafo não direcionado). Retorna False se a aresta não existir.
+        """
+        return self._alterar_permitidos(origem, destino, tipo, False)
+
+    def _alterar_permitidos(self, origem, destino, tipo, permitido):
+        """
+        Altera as listas de veículos permitidos dos registos das arestas (a mesma lista é
+        partilhada pelas duas direções de uma aresta não direcionada) e os bits da CSR nas
+        mesmas posições. Cada direção cujo acesso do tipo mudou recebe uma AlteracaoPermitidos.
+        """
+        if not self.m_arestas.get((origem, destino)):
+            return False
+
+        direcoes = [(origem, destino)] if self.m_directed else [(origem, destino), (destino, origem)]
+        registos = [(o, d, self.m_arestas.get((o, d), [])) for o, d in direcoes]
+        antes = [any(tipo in self.m_graph[o][posicao][3] for posicao in posicoes) for o, _, posicoes in registos]
+
+        for o, _, posicoes in registos:
+            for posicao in posicoes:
+                permitidos = self.m_graph[o][posicao][3]
+                if permitido and tipo not in permitidos:
+                    permitidos.append(tipo)
+                while not permitido and tipo in permitidos:
+                    permitidos.remove(tipo)
+
+        if self.m_csr is not None:
+            bit = self.m_csr.bits_veiculos.get(tipo)
+            if bit is None:
+                if permitido:
+                    self.m_csr = None  # Tipo novo: a CSR é reconstruída com um bit para ele
+            else:
+                for o, _, posicoes in registos:
+                    base = self.m_csr.offsets[self.m_ids[o]]
+                    for posicao in posicoes:
+                        mascara = int(self.m_csr.permitidos[base + posicao])
+                        if tipo in self.m_graph[o][posicao][3]:
+                            mascara |= 1 << bit
+                        else:
+                            mascara &= ~(1 << bit)
+                        self.m_csr.permitidos[base + posicao] = mascara
+
+        for (o, d, _), tinha in zip(registos, antes):
+            if tinha != permitido:
+                self.m_diario.registar(AlteracaoPermitidos(o, d, tipo, permitido))
+        return True
+
+    def alterar_no(self, nome_no, **valores):
+        """
+        Altera atributos de um nó (população, janela de tempo, medicamento, coordenadas ou
+        condições meteorológicas), por exemplo alterar_no("A", populacao=10, chuva=3). Os valores
+        são escritos através do nó, que atualiza a fila de prioridades e regista uma AlteracaoNo
+        por campo. Retorna False se o nó não existir.
+        """
+        no = self.get_node_by_name(nome_no)
+        if no is None:
+            return False
+
+        for campo, valor in valores.items():
+            if campo in CAMPOS_NO:
+                setattr(no, campo, valor)
+            elif campo in CAMPOS_METEOROLOGIA:
+                setattr(no.meteorologia, campo, valor)
+            else:
+                raise ValueError(f"O nó {nome_no} não tem o atributo {campo}.")
+        return True
+
+    def tipos_afetados(self, alteracao):
+        """
+        Retorna os tipos de veículo cujas arestas acessíveis mudaram com a alteração de uma
+        aresta (AlteracaoEstadoAresta, AlteracaoPermitidos ou NovaAresta).
+        """
+        lista = self.m_graph[alteracao.origem]
+        posicoes = self.m_arestas.get((alteracao.origem, alteracao.destino), [])
+        if isinstance(alteracao, AlteracaoPermitidos):
+            livre = any(not lista[posicao][2] for posicao in posicoes)
+            return {alteracao.tipo} if livre else set()
+
+        tipos = set()
+        for posicao in posicoes:
+            _, _, bloqueada, permitidos = lista[posicao]
+            if isinstance(alteracao, AlteracaoEstadoAresta) or not bloqueada:
+                tipos.update(permitidos)
+        return tipos
+
+    def usar_csr(self, ativo=True):
+        """
+        Ativa (ou desativa) a representação CSR para as consultas de adjacência.
+        O dicionário m_graph continua disponível como vista, por exemplo para o desenha.
+        """
+        self.m_usar_csr = ativo
+        if not ativo:
+            self.m_csr = None
+        self.m_adjacencia_ids = {}  # Passam a ser construídas a partir da outra representação
+
+    def invalidar_csr(self):
+        """
+        Descarta a representação CSR e os predecessores. Deve ser chamado sempre que m_graph é
+        alterado diretamente, em vez de pelos métodos de alteração das arestas: como não se sabe
+        o que mudou, o diário recebe uma AlteracaoGeral("arestas") e as estruturas derivadas das
+        arestas são refeitas na próxima consulta.
+        """
+        self.m_csr = None
+        self.m_inverso = None
+        self.m_diario.registar(AlteracaoGeral("arestas"))
+
+    def get_csr(self):
+        """
+        Retorna a representação CSR do grafo, construindo-a se necessário.
+        """
+        if self.m_csr is None or self.m_csr.get_num_nos() != len(self.m_nodes):
+            self.m_csr = GrafoCSR.a_partir_de_grafo(self)
+        return self.m_csr
+
+    def get_adjacencia_ids(self, veiculo):
+        """
+        Retorna as listas de adjacência por id para o tipo de veículo: a posição i tem os pares
+        (id do vizinho, peso) das arestas de saída do nó i acessíveis com o veículo, pela mesma
+        ordem de getNeighbours. São construídas a pedido (a partir dos arrays CSR, se usar_csr
+        estiver ativo, ou de m_graph) e mantidas quando as arestas mudam.
+        """
+        adjacencia = self.m_adjacencia_ids.get(veiculo)
+        if adjacencia is None or len(adjacencia) != len(self.m_nodes):
+            if self.m_usar_csr:
+                adjacencia = self.get_csr().adjacencia_ids(veiculo)
+            else:
+                adjacencia = [self._vizinhos_ids(no.getNome(), veiculo) for no in self.m_nodes]
+            self.m_adjacencia_ids[veiculo] = adjacencia
+        return adjacencia
+
+    def _vizinhos_ids(self, nodo, veiculo):
+        if self.m_usar_csr:
+            ids, pesos = self.get_csr().vizinhos_ids(self.m_ids[nodo], veiculo)
+            return list(zip(ids.tolist(), pesos.tolist()))
+
+        ids = self.m_ids
+        return [
+            (ids[adjacente], peso)
+            for adjacente, peso, bloqueada, permitidos in self.m_graph.get(nodo, [])
+            if not bloqueada and veiculo in permitidos
+        ]
+
+    def _atualizar_adjacencia_ids(self, alteracao):
+        """
+        Subscritor das alterações de arestas: refaz a lista da origem nas listas de adjacência
+        por id já construídas, só para os tipos de veículo afetados.
+        """
+        if isinstance(alteracao, AlteracaoGeral):
+            if alteracao.motivo == "arestas":
+                self.m_adjacencia_ids = {}
+            return
+
+        origem = alteracao.origem
+        id_origem = self.m_ids.get(origem)
+        for veiculo in self.tipos_afetados(alteracao) & self.m_adjacencia_ids.keys():
+            adjacencia = self.m_adjacencia_ids[veiculo]
+            if id_origem is not None and id_origem < len(adjacencia):
+                adjacencia[id_origem] = self._vizinhos_ids(origem, veiculo)
+
+    def get_ordem_nomes(self):
+        """
+        Retorna, para cada id, a posição do nó na ordem alfabética dos nomes. Permite desempatar
+        por nome (como as procuras que comparam nomes) comparando apenas inteiros.
+        """
+        if self.m_ordem_nomes is None or len(self.m_ordem_nomes) != len(self.m_nodes):
+            ordem = sorted(range(len(self.m_nodes)), key=lambda i: self.m_nodes[i].getNome())
+            self.m_ordem_nomes = [0] * len(ordem)
+            for posicao, id_no in enumerate(ordem):
+                self.m_ordem_nomes[id_no] = posicao
+        return self.m_ordem_nomes
 
     def getNeighbours(self, nodo, veiculo):
         """
         Retorna os vizinhos de um nó no grafo acessíveis com o veículo especificado.
         """
+        if self.m_usar_csr:
+            id_no = self.m_ids.get(nodo)
+            if id_no is None:
+                return []
+            return self.get_csr().getNeighbours(id_no, veiculo)
+
         return [
             (adjacente, peso)
             for adjacente, peso, bloqueada, permitidos in self.m_graph.get(nodo, [])
             if not bloqueada and veiculo in permitidos
         ]
 
+    def getPredecessores(self, nodo, veiculo):
+        """
+        Retorna os nós a partir dos quais se chega a nodo com o veículo especificado, e o peso
+        dessa aresta. Num grafo não direcionado coincide com getNeighbours.
+        """
+        if not self.m_directed:
+            return self.getNeighbours(nodo, veiculo)
+
+        if self.m_inverso is None:
+            self.m_inverso = {nome: [] for nome in self.m_graph}
+            for (origem, destino) in self.m_arestas:
+                self.m_inverso[destino].append(origem)
+
+        predecessores = []
+        for origem in self.m_inverso.get(nodo, []):
+            lista = self.m_graph[origem]
+            for posicao in self.m_arestas[(origem, nodo)]:
+                _, peso, bloqueada, permitidos = lista[posicao]
+                if not bloqueada and veiculo in permitidos:
+                    predecessores.append((origem, peso))
+        return predecessores
+
+    def get_marcos(self):
+        """
+        Retorna os marcos (landmarks) da heurística ALT, construindo-os se necessário.
+        Os marcos são atualizados automaticamente quando as arestas mudam.
+        """
+        if self.m_marcos is None:
+            self.m_marcos = Marcos(self)
+            self.subscrever_alteracoes(self.m_marcos.aplicar_alteracao, ALTERACOES_ARESTAS)
+        return self.m_marcos
+
+    def get_hierarquias(self):
+        """
+        Retorna as hierarquias de contração do grafo (uma por classe de permissões de veículos).
+        As dos tipos de veículo afetados por uma alteração de aresta são descartadas e
+        reconstruídas na consulta seguinte, pelo que só compensam em mapas estáticos.
+        """
+        if self.m_hierarquias is None:
+            self.m_hierarquias = HierarquiasGrafo(self)
+            self.subscrever_alteracoes(self.m_hierarquias.aplicar_alteracao, ALTERACOES_ARESTAS)
+        return self.m_hierarquias
+
+    def copia_para_processos(self):
+        """
+        Cópia do grafo para enviar a processos trabalhadores, que a usam só para leitura:
+        partilha os nós, as arestas e o diário de alterações (que, ao ser serializado, deixa os
+        subscritores para trás), mas não leva as estruturas auxiliares (CSR, marcos, hierarquias
+        e planeadores), que são reconstruídas a pedido se necessário.
+        """
+        copia = copy.copy(self)
+        copia.m_csr = None
+        copia.m_usar_csr = False
+        copia.m_inverso = None
+        copia.m_marcos = None
+        copia.m_hierarquias = None
+        copia.m_planeadores = OrderedDict()
+        copia.m_adjacencia_ids = {}
+        copia.desenho_ativo = False
+        return copia
+
+    def get_planeador(self, inicio, veiculo):
+        """
+        Retorna o planeador incremental (LPA*) da origem e tipo de veículo dados, criando-o se
+        necessário. O planeador mantém o seu estado entre consultas e é atualizado
+        automaticamente quando as arestas mudam. Só os m_max_planeadores usados mais
+        recentemente são mantidos: o menos recente é descartado e deixa de receber alterações.
+        """
+        chave = (inicio, veiculo)
+        if chave in self.m_planeadores:
+            self.m_planeadores.move_to_end(chave)
+            return self.m_planeadores[chave]
+
+        planeador = PlaneadorIncremental(self, inicio, veiculo)
+        self.subscrever_alteracoes(planeador.aplicar_alteracao, ALTERACOES_ARESTAS)
+        self.m_planeadores[chave] = planeador
+        while len(self.m_planeadores) > self.m_max_planeadores:
+            _, antigo = self.m_planeadores.popitem(last=False)
+            self.m_diario.cancelar(antigo.aplicar_alteracao)
+        return planeador
+
     def get_arc_cost(self, node1, node2, veiculo_tipo):
         """
         Retorna o peso da aresta entre dois nós se o veículo for permitido e a aresta não estiver bloqueada.
         """
-        for adjacente, peso, bloqueada, permitidos in self.m_graph.get(node1, []):
-            if adjacente == node2:
-                if not bloqueada and veiculo_tipo in permitidos:
-                    return peso
-                else:
-                    print(f"[DEBUG] Aresta bloqueada ou veículo '{veiculo_tipo}' não permitido entre {node1} e {node2}")
-                    return float('inf')  # Caminho inválido para este veículo
-        print(f"[DEBUG] Aresta não encontrada entre {node1} e {node2}")
-        return float('inf')  # Não existe conexão entre os nós
+        if self.m_usar_csr:
+            return self._get_arc_cost_csr(node1, node2, veiculo_tipo)
+
+        aresta = self.get_aresta(node1, node2)
+        if aresta is None:
+            registo.debug("[DEBUG] Aresta não encontrada entre %s e %s", node1, node2)
+            return float('inf')  # Não existe conexão entre os nós
+
+        _, peso, bloqueada, permitidos = aresta
+        if not bloqueada and veiculo_tipo in permitidos:
+            return peso
+
+        registo.debug("[DEBUG] Aresta bloqueada ou veículo '%s' não permitido entre %s e %s", veiculo_tipo, node1, node2)
+        return float('inf')  # Caminho inválido para este veículo
+
+    def _get_arc_cost_csr(self, node1, node2, veiculo_tipo):
+        """
+        Versão de get_arc_cost sobre a representação CSR.
+        """
+        posicoes = self.m_arestas.get((node1, node2))
+        if not posicoes:
+            registo.debug("[DEBUG] Aresta não encontrada entre %s e %s", node1, node2)
+            return float('inf')
+
+        csr = self.get_csr()
+        posicao = csr.offsets[self.m_ids[node1]] + posicoes[0]
+
+        if csr.aresta_valida(posicao, veiculo_tipo):
+            return float(csr.pesos[posicao])
+
+        registo.debug("[DEBUG] Aresta bloqueada ou veículo '%s' não permitido entre %s e %s", veiculo_tipo, node1, node2)
+        return float('inf')
 
     def calcula_acumulado_arestas(self, caminho, veiculo):
         """
@@ -106,7 +643,7 @@ class Grafo:
             # Obter o custo da aresta entre node1 e node2
             peso = self.get_arc_cost(node1, node2, veiculo.get_tipo())
             if peso == float('inf'):
-                print(f"Aresta inválida entre {node1} e {node2} para o veículo {veiculo.get_tipo()}")
+                registo.debug("Aresta inválida entre %s e %s para o veículo %s", node1, node2, veiculo.get_tipo())
                 return float('inf')  # Caminho inválido para este veículo
 
             custo_total_arestas += peso
@@ -129,44 +666,184 @@ class Grafo:
         destino = self.get_node_by_name(caminho[-1])
 
         if origem and destino:
-            medicamentos_disponiveis = origem.get_medicamento()
-            populacao_por_assistir = destino.populacao
-            limite_carga = veiculo.get_limite_carga()
+            return self._custo_ajustado(custo_total_arestas, origem, destino, veiculo)
+
+    def _custo_ajustado(self, custo_total_arestas, origem, destino, veiculo):
+        """
+        Converte a soma das arestas de um caminho de origem a destino no custo final, ajustado
+        pelo custo do veículo e pelo número de pessoas socorridas.
+        Retorna (custo_final, pessoas_socorridas), ou (inf, 0) se ninguém puder ser socorrido.
+        """
+        medicamentos_disponiveis = origem.get_medicamento()
+        populacao_por_assistir = destino.populacao
+        limite_carga = veiculo.get_limite_carga()
+
+        registo.debug("[DEBUG] Medicamentos em %s: %s, População em %s: %s, Limite do veículo: %s",
+            origem.getNome(), medicamentos_disponiveis, destino.getNome(), populacao_por_assistir, limite_carga)
+
+        pessoas_socorridas = min(medicamentos_disponiveis, populacao_por_assistir, limite_carga)
 
-            print(f"[DEBUG] Medicamentos em {caminho[0]}: {medicamentos_disponiveis}, "
-                f"População em {caminho[-1]}: {populacao_por_assistir}, Limite do veículo: {limite_carga}")
+        if pessoas_socorridas == 0:
+            return float('inf'), 0
 
-            pessoas_socorridas = min(medicamentos_disponiveis, populacao_por_assistir, limite_carga)
+        custo_veiculo = veiculo.get_custo()
+        custo_final = custo_total_arestas * (custo_veiculo / pessoas_socorridas)
+        registo.debug("[DEBUG] Veículo: %s, Soma das arestas: %s, Custo do veículo: %s, "
+            "Pessoas socorridas: %s, Custo final ajustado: %s",
+            veiculo.get_tipo(), custo_total_arestas, custo_veiculo, pessoas_socorridas, custo_final)
 
-            if pessoas_socorridas == 0:
-                return float('inf'), 0
+        return custo_final, pessoas_socorridas
 
-            custo_veiculo = veiculo.get_custo()
-            custo_final = custo_total_arestas * (custo_veiculo / pessoas_socorridas)
-            print(f"[DEBUG] Veículo: {veiculo.get_tipo()}, Soma das arestas: {custo_total_arestas}, "
-                f"Custo do veículo: {custo_veiculo}, Pessoas socorridas: {pessoas_socorridas}, "
-                f"Custo final ajustado: {custo_final}")
+    def arvore_caminhos(self, inicio, veiculo):
+        """
+        Dijkstra a partir de inicio com as arestas válidas para o tipo de veículo dado.
+        Retorna (distancias, pais): {nó: distância} e {nó: nó anterior} dos nós alcançáveis.
+        """
+        distancias = {inicio: 0}
+        pais = {inicio: None}
+        fechados = set()
+        heap = [(0, inicio)]
+
+        while heap:
+            distancia, nodo = heapq.heappop(heap)
+            if nodo in fechados:
+                continue
+            fechados.add(nodo)
+            metricas.nos_expandidos += 1
+
+            for adjacente, peso in self.getNeighbours(nodo, veiculo):
+                nova_distancia = distancia + peso
+                if nova_distancia < distancias.get(adjacente, float('inf')):
+                    distancias[adjacente] = nova_distancia
+                    pais[adjacente] = nodo
+                    heapq.heappush(heap, (nova_distancia, adjacente))
+
+        return distancias, pais
+
+    def despacho(self, inicio):
+        """
+        Avalia, numa única passagem, todas as zonas com população por socorrer a partir de inicio:
+        uma árvore de caminhos mais curtos por tipo de veículo disponível em inicio, e para cada
+        zona e veículo as mesmas verificações que procura_CustoUniforme (combustível, velocidade
+        face à janela de tempo do destino) e o custo de calcula_custo.
+
+        Retorna uma lista de dicionários (destino, veiculo, distancia, custo, pessoas_socorridas,
+        caminho, motivo), com as opções viáveis primeiro, por custo crescente; nas inviáveis, custo
+        é inf e motivo indica a razão. Não transfere medicamentos.
+        """
+        origem = self.get_node_by_name(inicio)
+        if origem is None:
+            registo.resumo("[ERRO] O nó de origem '%s' não existe.", inicio)
+            return []
+
+        zonas = [no for no in self.m_nodes if no.populacao > 0 and no.getNome() != inicio]
+        arvores = {}
+        tabela = []
+
+        for veiculo in self.get_veiculos_no(inicio):
+            tipo = veiculo.get_tipo()
+            if tipo not in arvores:
+                arvores[tipo] = self.arvore_caminhos(inicio, tipo)
+            distancias, pais = arvores[tipo]
+
+            for zona in zonas:
+                nome = zona.getNome()
+                distancia = distancias.get(nome, float('inf'))
+                custo, pessoas_socorridas, motivo, caminho = float('inf'), 0, None, None
+
+                if distancia == float('inf'):
+                    motivo = "sem caminho"
+                elif distancia > veiculo.get_combustivel_disponivel():
+                    motivo = "combustível insuficiente"
+                elif zona.janela_tempo > 0 and distancia / zona.janela_tempo > veiculo.get_velocidade():
+                    motivo = "velocidade insuficiente"
+                else:
+                    custo, pessoas_socorridas = self._custo_ajustado(distancia, origem, zona, veiculo)
+                    if pessoas_socorridas == 0:
+                        motivo = "ninguém socorrido"
+
+                if distancia != float('inf'):
+                    caminho = [nome]
+                    while pais[caminho[-1]] is not None:
+                        caminho.append(pais[caminho[-1]])
+                    caminho.reverse()
+
+                tabela.append({
+                    "destino": nome,
+                    "veiculo": tipo,
+                    "distancia": distancia,
+                    "custo": custo,
+                    "pessoas_socorridas": pessoas_socorridas,
+                    "caminho": caminho,
+                    "motivo": motivo,
+                })
+
+        tabela.sort(key=lambda linha: (linha["motivo"] is not None, linha["custo"], linha["distancia"]))
+        return tabela
+
+    def _atributos_nos(self):
+        """
+        Retorna arrays (x, y, populacao, janela_tempo, impacto meteorológico) com os atributos
+        atuais dos nós, pela ordem de m_nodes (índice = id do nó).
+        """
+        if self.m_estado is not None:
+            estado = self.m_estado
+            impacto = (
+                estado.coluna("chuva") + estado.coluna("tempestade")
+                + estado.coluna("vento") + estado.coluna("nevoeiro")
+            )
+            colunas = [estado.coluna(campo) for campo in ("x", "y", "populacao", "janela_tempo")] + [impacto]
+            return [coluna.astype(float) for coluna in colunas]
+
+        n = len(self.m_nodes)
+        atributos = np.fromiter(
+            (
+                (no.x, no.y, no.populacao, no.janela_tempo, no.calcula_impacto_meteorologia())
+                for no in self.m_nodes
+            ),
+            dtype=np.dtype((float, 5)),
+            count=n,
+        )
+        return atributos.T
 
-            return custo_final, pessoas_socorridas
+    def calcula_prioridades(self):
+        """
+        Calcula a prioridade de todos os nós de uma só vez (o mesmo valor de No.calcula_prioridade),
+        pela ordem de m_nodes: inf para nós sem população ou sem tempo, e
+        janela_tempo / (populacao + impacto meteorológico) nos restantes.
+        """
+        _, _, populacao, janela, impacto = self._atributos_nos()
+        return self._prioridades(populacao, janela, impacto)
+
+    @staticmethod
+    def _prioridades(populacao, janela, impacto):
+        esgotados = (populacao == 0) | (janela == 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(esgotados, float('inf'), janela / (populacao + impacto))
 
     def atualizar_heuristicas(self, no_destino):
         """
         Atualiza a heurística de cada nó no grafo, considerando o nó de maior prioridade como destino.
-        Nós com população igual a 0 recebem heurística infinita.
+        Nós com população ou janela de tempo igual a 0 recebem heurística 5.
+
+        Todas as heurísticas são calculadas numa só passagem sobre os arrays de atributos dos nós,
+        com os mesmos valores de calcula_heuristica.
         """
         if no_destino is None:
-            print("[ERRO] Nenhum nó de destino válido para calcular heurísticas.")
+            registo.resumo("[ERRO] Nenhum nó de destino válido para calcular heurísticas.")
             return
 
-        self.m_h = {}
-        for no in self.m_nodes:
-            if no.populacao == 0 or no.janela_tempo == 0:  # Nós com população ou tempo esgotado recebem inf
-                heuristica = 5
-            else:
-                heuristica = self.calcula_heuristica(no, no_destino)
-            
-            self.m_h[no.getNome()] = heuristica
-            print(f"[DEBUG] Heurística do nó '{no.getNome()}': {heuristica:.6f}")
+        x, y, populacao, janela, impacto = self._atributos_nos()
+        prioridades = self._prioridades(populacao, janela, impacto)
+        dx, dy = no_destino.x - x, no_destino.y - y
+        distancias = np.sqrt(dx * dx + dy * dy)
+        with np.errstate(invalid='ignore'):
+            heuristicas = np.where(np.isinf(prioridades), 5, distancias * prioridades)
+
+        self.m_h = dict(zip((no.getNome() for no in self.m_nodes), heuristicas.tolist()))
+        if registo.ativo(registo.TRACE):
+            for nome, heuristica in self.m_h.items():
+                registo.trace("[DEBUG] Heurística do nó '%s': %.6f", nome, heuristica)
 
     def calcula_heuristica(self, no_origem, no_destino):
         """
@@ -178,8 +855,9 @@ class Grafo:
         x_origem, y_origem = no_origem.x, no_origem.y
         x_destino, y_destino = no_destino.x, no_destino.y
 
-        # Distância euclidiana entre os nós
-        distancia_euclidiana = ((x_destino - x_origem) ** 2 + (y_destino - y_origem) ** 2) ** 0.5
+        # Distância euclidiana entre os nós (as mesmas operações de atualizar_heuristicas)
+        dx, dy = x_destino - x_origem, y_destino - y_origem
+        distancia_euclidiana = math.sqrt(dx * dx + dy * dy)
 
         # Prioridade do nó de origem
         prioridade_no_origem = no_origem.calcula_prioridade()
@@ -190,34 +868,51 @@ class Grafo:
         # Heurística final
         return distancia_euclidiana * prioridade_no_origem
 
-    def get_no_maior_prioridade(self):
-        menor_prioridade = float('inf')
-        no_maior_prioridade = None
+    def get_fila_prioridades(self):
+        """
+        Retorna a fila de prioridade indexada das zonas, construindo-a se necessário. A partir
+        daí, cada nó avisa a fila quando a sua população, janela de tempo ou meteorologia muda.
+        """
+        if self.m_fila_prioridades is None:
+            self.m_fila_prioridades = FilaPrioridadesNos(self.m_nodes)
+            for no in self.m_nodes:
+                no.observador_prioridade = self.m_fila_prioridades
+        elif self.m_fila_prioridades.desatualizada:
+            self.m_fila_prioridades.reconstruir(self.m_nodes, self.calcula_prioridades())
+        return self.m_fila_prioridades
 
-        for no in self.m_nodes:
-            prioridade = no.calcula_prioridade()
-            if prioridade < menor_prioridade:
-                menor_prioridade = prioridade
-                no_maior_prioridade = no
+    def get_no_maior_prioridade(self):
+        """
+        Retorna o nó com menor valor de prioridade (o primeiro, em caso de empate), ou None se
+        nenhum nó tiver população e tempo por esgotar.
+        """
+        return self.get_fila_prioridades().topo()
 
-        return no_maior_prioridade
+    def get_nos_maior_prioridade(self, k=None):
+        """
+        Retorna os k nós de maior prioridade (todos se k for None), ordenados como em
+        get_no_maior_prioridade. Os nós sem população ou sem tempo ficam no fim.
+        """
+        return self.get_fila_prioridades().menores(k)
 
     def get_veiculos_no(self, no_nome):
         """
         Retorna os veículos associados a um nó específico no grafo, ordenados por custo.
         """
-        for node in self.m_nodes:
-            if node.getNome() == no_nome:
-                veiculos = node.get_veiculos()
-                veiculos.sort(key=lambda v: v.get_custo())  # Ordenar por custo
-                return veiculos
-        return []
+        node = self.m_nos_por_nome.get(no_nome)
+        if node is None:
+            return []
+
+        veiculos = node.get_veiculos()
+        veiculos.sort(key=lambda v: v.get_custo())  # Ordenar por custo
+        return veiculos
 
     def set_custos_veiculos(self, custos):
         """
         Define os custos globais dos veículos.
         """
         self.custos_veiculos = custos
+        self.m_diario.registar(AlteracaoGeral("custos_veiculos"))
 
     def atualizar_medicamentos_e_populacao(self):
         """
@@ -226,6 +921,10 @@ class Grafo:
         os medicamentos são subtraídos e a população restante é ajustada.
         Quando a população de um nó é 0, a janela_tempo é ajustada para 24.
         """
+        if self.m_estado is not None:
+            self._atualizar_medicamentos_e_populacao_vetorial()
+            return
+
         for no in self.m_nodes:
             populacao = no.populacao
             medicamentos = no.get_medicamento()
@@ -243,26 +942,45 @@ class Grafo:
             if no.populacao == 0:
                 no.janela_tempo = 24
 
-            print(
-                f"Nó {no.getNome()}: População atualizada = {no.populacao}, "
-                f"Medicamentos restantes = {no.get_medicamento()}, "
-                f"Janela de tempo = {no.janela_tempo}"
-            )
+            registo.trace("Nó %s: População atualizada = %s, Medicamentos restantes = %s, "
+                "Janela de tempo = %s",
+                no.getNome(), no.populacao, no.get_medicamento(), no.janela_tempo)
+
+    def _atualizar_medicamentos_e_populacao_vetorial(self):
+        estado = self.m_estado
+        populacao = estado.coluna("populacao")
+        medicamentos = estado.coluna("medicamento")
+
+        suficientes = medicamentos >= populacao
+        restantes = np.where(suficientes, medicamentos - populacao, 0)
+        por_socorrer = np.where(suficientes, 0, populacao - medicamentos)
+        estado.definir_coluna("medicamento", restantes)
+        estado.definir_coluna("populacao", por_socorrer)
+        janela = estado.coluna("janela_tempo")
+        janela[estado.coluna("populacao") == 0] = 24
+        self._prioridades_alteradas("medicamento", "populacao", "janela_tempo")
+
+        if registo.ativo(registo.TRACE):
+            for no in self.m_nodes:
+                registo.trace("Nó %s: População atualizada = %s, Medicamentos restantes = %s, "
+                    "Janela de tempo = %s",
+                    no.getNome(), no.populacao, no.get_medicamento(), no.janela_tempo)
 
     def transferir_valores(grafo, valor, no_origem, no_destino):
         origem = grafo.get_node_by_name(no_origem)
         destino = grafo.get_node_by_name(no_destino)
 
         if not origem or not destino:
-            print(f"Erro: Não foi possível encontrar os nós '{no_origem}' ou '{no_destino}'.")
+            registo.resumo("Erro: Não foi possível encontrar os nós '%s' ou '%s'.", no_origem, no_destino)
             return False
 
         # Determinar a quantidade que pode ser transferida
         quantidade_transferir = min(origem.get_medicamento(), valor, destino.populacao)
 
         if quantidade_transferir <= 0:
-            print(f"Transferência impossível entre '{no_origem}' e '{no_destino}'. "
-                f"Medicamentos disponíveis: {origem.get_medicamento()}, População no destino: {destino.populacao}.")
+            registo.debug("Transferência impossível entre '%s' e '%s'. Medicamentos disponíveis: %s, "
+                "População no destino: %s.",
+                no_origem, no_destino, origem.get_medicamento(), destino.populacao)
             return False
 
         # Realizar a transferência
@@ -271,9 +989,9 @@ class Grafo:
         if destino.populacao == 0:
             destino.janela_tempo = 24
 
-        print(f"Transferidos {quantidade_transferir} medicamentos de '{no_origem}' para '{no_destino}'.")
-        print(f"Medicamentos restantes no nó de origem '{no_origem}': {origem.get_medicamento()}.")
-        print(f"População restante no nó de destino '{no_destino}': {destino.populacao}.")
+        registo.debug("Transferidos %s medicamentos de '%s' para '%s'.", quantidade_transferir, no_origem, no_destino)
+        registo.debug("Medicamentos restantes no nó de origem '%s': %s.", no_origem, origem.get_medicamento())
+        registo.debug("População restante no nó de destino '%s': %s.", no_destino, destino.populacao)
         
         return True
 
@@ -282,6 +1000,9 @@ class Grafo:
         Atualiza a visualização do grafo, incluindo informações adicionais como janela de tempo,
         com retângulos maiores para os nós.
         """
+        if not self.desenho_ativo:
+            return
+
         plt.ion()  # Ativa o modo interativo
 
         # Limpar a figura atual antes de redesenhar
@@ -293,7 +1014,7 @@ class Grafo:
         if no_destino:
             self.atualizar_heuristicas(no_destino)
         else:
-            print("[ERRO] Não foi possível determinar o nó de maior prioridade para calcular heurísticas.")
+            registo.resumo("[ERRO] Não foi possível determinar o nó de maior prioridade para calcular heurísticas.")
 
         g = nx.Graph()
 
@@ -395,9 +1116,8 @@ class Grafo:
 
         # Adicionar a lista de prioridades no canto superior esquerdo
         prioridades_texto = "Prioridades:\n"
-        for no in sorted(self.m_nodes, key=lambda n: n.calcula_prioridade()):
-            prioridade = no.calcula_prioridade()
-            prioridades_texto += f"{no.getNome()}: {prioridade:.5f}\n"
+        for no in self.get_nos_maior_prioridade():
+            prioridades_texto += f"{no.getNome()}: {no.calcula_prioridade():.5f}\n"
 
         plt.text(
             0.01, 0.99,  # Coordenadas no canto superior esquerdo
@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class GrafoCSR:
+    """
+    Representação compacta (Compressed Sparse Row) da adjacência de um Grafo.
+
+    Os nós são identificados pelo seu id inteiro (posição em Grafo.m_nodes) e as arestas
+    de saída do nó i ocupam as posições offsets[i]:offsets[i + 1] dos restantes arrays:
+    - vizinhos: id do nó adjacente;
+    - pesos: peso da aresta;
+    - bloqueadas: 1 se a aresta está bloqueada, 0 caso contrário;
+    - permitidos: máscara de bits dos veículos permitidos (um bit por tipo de veículo).
+
+    A ordem das arestas de cada nó é a mesma das listas de Grafo.m_graph, pelo que a posição
+    de uma aresta na lista de adjacência corresponde a offsets[i] + posição.
+    """
+
+    def __init__(self, nomes, offsets, vizinhos, pesos, bloqueadas, permitidos, bits_veiculos):
+        self.nomes = nomes  # Lista de nomes indexada pelo id do nó
+        self.offsets = offsets
+        self.vizinhos = vizinhos
+        self.pesos = pesos
+        self.bloqueadas = bloqueadas
+        self.permitidos = permitidos
+        self.bits_veiculos = bits_veiculos  # {tipo: bit}
+
+    @classmethod
+    def a_partir_de_grafo(cls, grafo):
+        """
+        Constrói a representação CSR a partir do dicionário de adjacência do grafo.
+        """
+        nomes = [no.getNome() for no in grafo.m_nodes]
+        ids = grafo.m_ids
+
+        bits_veiculos = {}
+        for tipo in grafo.veiculos_carregados:
+            bits_veiculos.setdefault(tipo, len(bits_veiculos))
+
+        n_arestas = sum(len(grafo.m_graph.get(nome, [])) for nome in nomes)
+        offsets = np.zeros(len(nomes) + 1, dtype=np.int64)
+        vizinhos = np.empty(n_arestas, dtype=np.int64)
+        pesos = np.empty(n_arestas, dtype=np.float64)
+        bloqueadas = np.zeros(n_arestas, dtype=np.uint8)
+        permitidos = np.zeros(n_arestas, dtype=np.uint64)
+
+        pos = 0
+        for i, nome in enumerate(nomes):
+            for adjacente, peso, bloqueada, veiculos in grafo.m_graph.get(nome, []):
+                mascara = 0
+                for tipo in veiculos:
+                    bit = bits_veiculos.setdefault(tipo, len(bits_veiculos))
+                    mascara |= 1 << bit
+                vizinhos[pos] = ids[adjacente]
+                pesos[pos] = peso
+                bloqueadas[pos] = bloqueada
+                permitidos[pos] = mascara
+                pos += 1
+            offsets[i + 1] = pos
+
+        if len(bits_veiculos) > 64:
+            raise ValueError("A representação CSR suporta no máximo 64 tipos de veículo.")
+
+        return cls(nomes, offsets, vizinhos, pesos, bloqueadas, permitidos, bits_veiculos)
+
+    def get_num_nos(self):
+        return len(self.nomes)
+
+    def get_num_arestas(self):
+        return len(self.vizinhos)
+
+    def mascara_veiculo(self, veiculo_tipo):
+        """
+        Retorna a máscara de bits do tipo de veículo, ou 0 se o tipo não for conhecido.
+        """
+        bit = self.bits_veiculos.get(veiculo_tipo)
+        if bit is None:
+            return 0
+        return 1 << bit
+
+    def vizinhos_ids(self, id_no, veiculo_tipo):
+        """
+        Retorna (ids, pesos) dos vizinhos do nó acessíveis com o veículo especificado.
+        """
+        inicio, fim = self.offsets[id_no], self.offsets[id_no + 1]
+        mascara = np.uint64(self.mascara_veiculo(veiculo_tipo))
+        validos = ((self.permitidos[inicio:fim] & mascara) != 0) & (self.bloqueadas[inicio:fim] == 0)
+        return self.vizinhos[inicio:fim][validos], self.pesos[inicio:fim][validos]
+
+    def adjacencia_ids(self, veiculo_tipo):
+        """
+        Retorna as listas de adjacência por id de todos os nós para o veículo especificado,
+        [[(id_vizinho, peso)]], filtrando os arrays de uma só vez pela máscara e pelas
+        arestas bloqueadas.
+        """
+        mascara = np.uint64(self.mascara_veiculo(veiculo_tipo))
+        validos = ((self.permitidos & mascara) != 0) & (self.bloqueadas == 0)
+        acumulados = np.concatenate(([0], np.cumsum(validos))).tolist()
+        offsets = [acumulados[posicao] for posicao in self.offsets.tolist()]
+        pares = list(zip(self.vizinhos[validos].tolist(), self.pesos[validos].tolist()))
+        return [pares[offsets[i]:offsets[i + 1]] for i in range(len(self.nomes))]
+
+    def getNeighbours(self, id_no, veiculo_tipo):
+        """
+        Equivalente a Grafo.getNeighbours, devolvendo [(nome_vizinho, peso)].
+        """
+        ids, pesos = self.vizinhos_ids(id_no, veiculo_tipo)
+        nomes = self.nomes
+        return [(nomes[j], peso) for j, peso in zip(ids.tolist(), pesos.tolist())]
+
+    def posicao_aresta(self, id1, id2):
+        """
+        Retorna a posição (nos arrays CSR) da primeira aresta id1 -> id2, ou None se não existir.
+        """
+        inicio, fim = self.offsets[id1], self.offsets[id1 + 1]
+        posicoes = np.flatnonzero(self.vizinhos[inicio:fim] == id2)
+        if len(posicoes) == 0:
+            return None
+        return int(inicio + posicoes[0])
+
+    def aresta_valida(self, posicao, veiculo_tipo):
+        """
+        Indica se a aresta na posição dada não está bloqueada e permite o veículo.
+        """
+        return (not self.bloqueadas[posicao]) and bool(int(self.permitidos[posicao]) & self.mascara_veiculo(veiculo_tipo))
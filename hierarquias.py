@@ -0,0 +1,305 @@
+import heapq
+import registo
+import metricas
+from diario_alteracoes import AlteracaoGeral
+
+INF = float('inf')
+
+
+class HierarquiaContracao:
+    """
+    Hierarquia de contração (Contraction Hierarchy) do subgrafo de arestas não bloqueadas
+    que permitem um dado conjunto de tipos de veículo.
+
+    O pré-processamento contrai os nós um a um, por ordem de importância (diferença de arestas),
+    acrescentando atalhos u -> w sempre que o único caminho mais curto entre u e w passava pelo
+    nó contraído. Cada atalho guarda o nó do meio, para que o caminho completo possa ser
+    reconstruído. As consultas são uma procura bidirecional que só sobe na hierarquia, e que
+    visita por isso uma pequena fração do grafo.
+
+    Trabalha com ids inteiros de nós (posições em Grafo.m_nodes).
+    """
+
+    def __init__(self, n_nos, arestas, limite_testemunha=60):
+        """
+        arestas: iterável de (u, w, peso) com ids inteiros, já filtradas para o veículo.
+        limite_testemunha: número máximo de nós fixados em cada procura de caminho alternativo.
+        """
+        self.n_nos = n_nos
+        self.limite_testemunha = limite_testemunha
+        self.arestas = {}  # {(u, w): (peso, meio)}; meio é None para arestas originais
+        self.saida = [dict() for _ in range(n_nos)]  # Grafo restante: {w: peso}
+        self.entrada = [dict() for _ in range(n_nos)]  # Grafo restante invertido: {u: peso}
+
+        for u, w, peso in arestas:
+            if u == w:
+                continue
+            if peso < self.arestas.get((u, w), (INF, None))[0]:
+                self.arestas[(u, w)] = (peso, None)
+                self.saida[u][w] = peso
+                self.entrada[w][u] = peso
+
+        self.nivel = [0] * n_nos
+        self._contrair_todos()
+        self._construir_grafos_de_procura()
+
+    def _procura_testemunha(self, origem, ignorado, custo_maximo, alvos):
+        """
+        Dijkstra limitado no grafo restante, a partir de origem e sem passar por ignorado.
+        Retorna as distâncias encontradas (apenas até custo_maximo).
+        """
+        distancias = {origem: 0}
+        fila = [(0, origem)]
+        por_encontrar = set(alvos)
+        fixados = 0
+
+        while fila and por_encontrar and fixados < self.limite_testemunha:
+            distancia, atual = heapq.heappop(fila)
+            if distancia > distancias[atual]:
+                continue
+            if distancia > custo_maximo:
+                break
+            fixados += 1
+            por_encontrar.discard(atual)
+            for vizinho, peso in self.saida[atual].items():
+                if vizinho == ignorado:
+                    continue
+                nova = distancia + peso
+                if nova < distancias.get(vizinho, INF):
+                    distancias[vizinho] = nova
+                    heapq.heappush(fila, (nova, vizinho))
+        return distancias
+
+    def _atalhos_necessarios(self, v):
+        """
+        Retorna a lista de atalhos (u, w, peso) necessários para contrair v.
+        """
+        atalhos = []
+        saidas = self.saida[v]
+        if not saidas:
+            return atalhos
+
+        maximo_saida = max(saidas.values())
+        for u, peso_entrada in self.entrada[v].items():
+            alvos = [w for w in saidas if w != u]
+            if not alvos:
+                continue
+            distancias = self._procura_testemunha(u, v, peso_entrada + maximo_saida, alvos)
+            for w in alvos:
+                custo = peso_entrada + saidas[w]
+                if distancias.get(w, INF) > custo:
+                    atalhos.append((u, w, custo))
+        return atalhos
+
+    def _prioridade(self, v, vizinhos_contraidos):
+        """
+        Diferença de arestas (atalhos criados menos arestas removidas), mais o número de
+        vizinhos já contraídos, para espalhar as contrações pelo grafo.
+        """
+        removidas = len(self.saida[v]) + len(self.entrada[v])
+        return len(self._atalhos_necessarios(v)) - removidas + vizinhos_contraidos[v]
+
+    def _contrair_todos(self):
+        vizinhos_contraidos = [0] * self.n_nos
+        fila = [(self._prioridade(v, vizinhos_contraidos), v) for v in range(self.n_nos)]
+        heapq.heapify(fila)
+        contraido = [False] * self.n_nos
+        ordem = 0
+
+        while fila:
+            _, v = heapq.heappop(fila)
+            if contraido[v]:
+                continue
+
+            # Atualização preguiçosa: se a prioridade piorou, volta para a fila
+            prioridade = self._prioridade(v, vizinhos_contraidos)
+            if fila and prioridade > fila[0][0]:
+                heapq.heappush(fila, (prioridade, v))
+                continue
+
+            for u, w, custo in self._atalhos_necessarios(v):
+                if custo < self.saida[u].get(w, INF):
+                    self.saida[u][w] = custo
+                    self.entrada[w][u] = custo
+                    self.arestas[(u, w)] = (custo, v)
+
+            for w in self.saida[v]:
+                del self.entrada[w][v]
+                vizinhos_contraidos[w] += 1
+            for u in self.entrada[v]:
+                del self.saida[u][v]
+                vizinhos_contraidos[u] += 1
+            self.saida[v] = {}
+            self.entrada[v] = {}
+
+            contraido[v] = True
+            self.nivel[v] = ordem
+            ordem += 1
+
+        self.saida = None
+        self.entrada = None
+
+    def _construir_grafos_de_procura(self):
+        """
+        subir[u]: arestas u -> w com w mais alto na hierarquia (procura a partir da origem).
+        descer[w]: arestas u -> w com u mais alto, guardadas em w (procura a partir do destino).
+        """
+        self.subir = [[] for _ in range(self.n_nos)]
+        self.descer = [[] for _ in range(self.n_nos)]
+        for (u, w), (peso, _) in self.arestas.items():
+            if self.nivel[w] > self.nivel[u]:
+                self.subir[u].append((w, peso))
+            else:
+                self.descer[w].append((u, peso))
+
+    def consulta(self, origem, destino):
+        """
+        Retorna (distância, caminho em ids) do caminho mais curto de origem a destino,
+        ou (INF, None) se não existir.
+        """
+        if origem == destino:
+            return 0, [origem]
+
+        distancias = ({origem: 0}, {destino: 0})
+        pais = ({origem: None}, {destino: None})
+        filas = ([(0, origem)], [(0, destino)])
+        grafos = (self.subir, self.descer)
+        fixados = (set(), set())
+        melhor, encontro = INF, None
+
+        while filas[0] or filas[1]:
+            # Cada direção pode parar quando o seu mínimo já não melhora a solução
+            for lado in (0, 1):
+                fila = filas[lado]
+                if fila and fila[0][0] >= melhor:
+                    fila.clear()
+                if not fila:
+                    continue
+
+                distancia, atual = heapq.heappop(fila)
+                if atual in fixados[lado] or distancia > distancias[lado][atual]:
+                    continue
+                fixados[lado].add(atual)
+                metricas.nos_expandidos += 1
+
+                outra = distancias[1 - lado].get(atual)
+                if outra is not None and distancia + outra < melhor:
+                    melhor, encontro = distancia + outra, atual
+
+                for vizinho, peso in grafos[lado][atual]:
+                    nova = distancia + peso
+                    if nova < distancias[lado].get(vizinho, INF):
+                        distancias[lado][vizinho] = nova
+                        pais[lado][vizinho] = atual
+                        heapq.heappush(fila, (nova, vizinho))
+
+        if encontro is None:
+            return INF, None
+
+        # Reconstruir a sequência de arestas (com atalhos) e desdobrá-la
+        subida = [encontro]
+        while pais[0][subida[-1]] is not None:
+            subida.append(pais[0][subida[-1]])
+        subida.reverse()
+        descida = [encontro]
+        while pais[1][descida[-1]] is not None:
+            descida.append(pais[1][descida[-1]])
+
+        caminho_hierarquia = subida + descida[1:]
+        caminho = [caminho_hierarquia[0]]
+        for u, w in zip(caminho_hierarquia, caminho_hierarquia[1:]):
+            self._desdobrar(u, w, caminho)
+        return melhor, caminho
+
+    def _desdobrar(self, u, w, caminho):
+        """
+        Acrescenta ao caminho os nós originais da aresta u -> w (sem u).
+        """
+        pilha = [(u, w)]
+        while pilha:
+            a, b = pilha.pop()
+            meio = self.arestas[(a, b)][1]
+            if meio is None:
+                caminho.append(b)
+            else:
+                pilha.append((meio, b))
+                pilha.append((a, meio))
+
+
+class HierarquiasGrafo:
+    """
+    Conjunto de hierarquias de contração de um Grafo, uma por classe de permissões: tipos de
+    veículo que podem usar exatamente as mesmas arestas partilham a mesma hierarquia.
+
+    As hierarquias só são válidas enquanto as arestas não mudarem (Ambiente Estático); uma
+    alteração de uma aresta marca como desatualizadas as dos tipos de veículo afetados, que são
+    reconstruídas na consulta seguinte.
+    """
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.hierarquias = {}  # {assinatura das arestas utilizáveis: HierarquiaContracao}
+        self.por_tipo = {}  # {tipo: assinatura}
+
+    def aplicar_alteracao(self, alteracao):
+        """
+        Subscritor das alterações de arestas do grafo (ver Grafo.subscrever_alteracoes): os tipos
+        de veículo afetados perdem a sua hierarquia, e as que deixam de ser usadas são descartadas.
+        """
+        if isinstance(alteracao, AlteracaoGeral):
+            if alteracao.motivo == "arestas":
+                self.limpar()
+            return
+
+        for tipo in self.grafo.tipos_afetados(alteracao):
+            self.por_tipo.pop(tipo, None)
+        usadas = set(self.por_tipo.values())
+        self.hierarquias = {assinatura: h for assinatura, h in self.hierarquias.items() if assinatura in usadas}
+
+    def limpar(self):
+        self.hierarquias = {}
+        self.por_tipo = {}
+
+    def _arestas_tipo(self, tipo):
+        ids = self.grafo.m_ids
+        arestas = []
+        for origem, lista in self.grafo.m_graph.items():
+            u = ids[origem]
+            for adjacente, peso, bloqueada, permitidos in lista:
+                if not bloqueada and tipo in permitidos:
+                    arestas.append((u, ids[adjacente], peso))
+        return arestas
+
+    def preparar(self, tipos):
+        """
+        Constrói (se necessário) as hierarquias dos tipos de veículo dados.
+        """
+        for tipo in tipos:
+            self.get_hierarquia(tipo)
+
+    def get_hierarquia(self, tipo):
+        if self.hierarquias and next(iter(self.hierarquias.values())).n_nos != len(self.grafo.m_nodes):
+            self.limpar()  # Foram acrescentados nós
+
+        assinatura = self.por_tipo.get(tipo)
+        if assinatura is not None:
+            return self.hierarquias[assinatura]
+
+        arestas = self._arestas_tipo(tipo)
+        assinatura = frozenset(arestas)
+        if assinatura not in self.hierarquias:
+            registo.debug("[CH] A construir hierarquia de contração para o veículo %s (%s arestas)", tipo, len(arestas))
+            self.hierarquias[assinatura] = HierarquiaContracao(len(self.grafo.m_nodes), arestas)
+        self.por_tipo[tipo] = assinatura
+        return self.hierarquias[assinatura]
+
+    def caminho_mais_curto(self, inicio, fim, tipo):
+        """
+        Retorna (distância, caminho com nomes de nós) para o tipo de veículo, ou (INF, None).
+        """
+        ids = self.grafo.m_ids
+        distancia, caminho = self.get_hierarquia(tipo).consulta(ids[inicio], ids[fim])
+        if caminho is None:
+            return INF, None
+        nos = self.grafo.m_nodes
+        return distancia, [nos[i].getNome() for i in caminho]
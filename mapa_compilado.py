@@ -0,0 +1,452 @@
+import os
+import gc
+import json
+import argparse
+from collections.abc import MutableMapping
+import numpy as np
+import registo
+from grafo import Grafo
+from grafo_csr import GrafoCSR
+from no import No
+from estado_nos import EstadoNos, CAMPOS
+from veiculo import criar_veiculos
+
+FORMATO = 1  # Versão do formato; mapas compilados com outra versão têm de ser recompilados
+FICHEIRO_META = "mapa.json"
+EXTENSAO = ".mapa"
+
+# Arrays da adjacência, pela ordem em que Grafo.add_edge criaria os registos (ver GrafoCSR)
+ARRAYS_ARESTAS = ("offsets", "vizinhos", "pesos", "bloqueadas", "permitidos", "arestas")
+CARACTERISTICAS = ("custo", "limite_carga", "combustivel_disponivel", "velocidade")
+METEOROLOGIA_OMISSAO = {"chuva": 0, "tempestade": 0, "vento": 0, "nevoeiro": 0}
+
+
+def _numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def validar_mapa(dados, caracteristicas):
+    """
+    Valida um mapa (o conteúdo de um JSON como os de data/) e as características dos veículos.
+    Retorna (erros, avisos): os erros impedem a compilação; os avisos correspondem aos casos que
+    menu.carregar_grafo aceita com um aviso (veículos sem características, que são ignorados).
+    """
+    erros = []
+    avisos = []
+
+    for tipo, dados_tipo in caracteristicas.items():
+        for campo in CARACTERISTICAS:
+            if not _numero(dados_tipo.get(campo)):
+                erros.append(f"O veículo '{tipo}' não tem '{campo}' numérico.")
+
+    if not isinstance(dados.get("nos"), list) or not isinstance(dados.get("arestas"), list):
+        erros.append("O mapa tem de ter as listas 'nos' e 'arestas'.")
+        return erros, avisos
+
+    nomes = set()
+    for i, no in enumerate(dados["nos"]):
+        nome = no.get("nome")
+        if nome is None:
+            erros.append(f"O nó {i} não tem nome.")
+            continue
+        nome = str(nome)
+        if nome in nomes:
+            erros.append(f"O nó '{nome}' está repetido.")
+        nomes.add(nome)
+
+        for campo in ("populacao", "tempo"):
+            if not _numero(no.get(campo)):
+                erros.append(f"O nó '{nome}' não tem '{campo}' numérico.")
+        for campo in ("x", "y", "medicamento"):
+            if not _numero(no.get(campo, 0)):
+                erros.append(f"O nó '{nome}' tem '{campo}' não numérico.")
+        meteorologia = no.get("meteorologia", METEOROLOGIA_OMISSAO)
+        for condicao in METEOROLOGIA_OMISSAO:
+            if not _numero(meteorologia.get(condicao)):
+                erros.append(f"O nó '{nome}' não tem a condição meteorológica '{condicao}' numérica.")
+        for tipo in no.get("veiculos", []):
+            if tipo not in caracteristicas:
+                avisos.append(f"O veículo '{tipo}' do nó '{nome}' não tem características definidas.")
+
+    tipos = set()
+    for i, aresta in enumerate(dados["arestas"]):
+        origem, destino = str(aresta.get("origem")), str(aresta.get("destino"))
+        for extremo in (origem, destino):
+            if extremo not in nomes:
+                erros.append(f"A aresta {i} ({origem} -> {destino}) liga a um nó inexistente '{extremo}'.")
+        peso = aresta.get("peso")
+        if not _numero(peso) or peso < 0:
+            erros.append(f"A aresta {i} ({origem} -> {destino}) não tem peso numérico não negativo.")
+        if not isinstance(aresta.get("bloqueada"), bool):
+            erros.append(f"A aresta {i} ({origem} -> {destino}) não indica se está bloqueada.")
+        permitidos = aresta.get("permitidos")
+        if not isinstance(permitidos, list):
+            erros.append(f"A aresta {i} ({origem} -> {destino}) não tem a lista de veículos permitidos.")
+        else:
+            tipos.update(permitidos)
+
+    if len(tipos) > 64:
+        erros.append("Os veículos permitidos nas arestas têm no máximo 64 tipos.")
+    return erros, avisos
+
+
+def compilar_mapa(ficheiro_grafo, pasta=None, ficheiro_caracteristicas="data/caracteristicas_dos_veiculos.json"):
+    """
+    Valida o mapa e as características dos veículos e escreve o mapa compilado na pasta (por
+    omissão, o nome do ficheiro com a extensão .mapa): arrays NumPy (.npy) com a adjacência em
+    CSR, os atributos dos nós por coluna, os veículos de cada nó e a tabela de nomes, e um
+    mapa.json com os tipos de veículo e as suas características. Retorna a pasta.
+    Lança ValueError se o mapa não for válido.
+    """
+    with open(ficheiro_grafo, "r") as f:
+        dados = json.load(f)
+    with open(ficheiro_caracteristicas, "r") as f:
+        caracteristicas = json.load(f)
+
+    erros, avisos = validar_mapa(dados, caracteristicas)
+    for aviso in avisos:
+        print(f"[AVISO] {aviso}")
+    if erros:
+        raise ValueError(f"O mapa '{ficheiro_grafo}' não é válido:\n" + "\n".join(f"- {erro}" for erro in erros))
+
+    nos = dados["nos"]
+    arestas = dados["arestas"]
+    nomes = [str(no["nome"]) for no in nos]
+    ids = {nome: i for i, nome in enumerate(nomes)}
+
+    # Nós: colunas, veículos (por índice em veiculos_carregados) e nomes
+    colunas = {campo: [] for campo in CAMPOS}
+    veiculos_carregados = []
+    veiculos_offsets = [0]
+    veiculos = []
+    for no in nos:
+        meteorologia = no.get("meteorologia", METEOROLOGIA_OMISSAO)
+        valores = {
+            "x": no.get("x", 0), "y": no.get("y", 0), "populacao": no["populacao"],
+            "janela_tempo": no["tempo"], "medicamento": no.get("medicamento", 0),
+        }
+        valores.update({condicao: meteorologia[condicao] for condicao in METEOROLOGIA_OMISSAO})
+        for campo in CAMPOS:
+            colunas[campo].append(valores[campo])
+
+        for tipo in no.get("veiculos", []):
+            if tipo in caracteristicas:
+                if tipo not in veiculos_carregados:
+                    veiculos_carregados.append(tipo)
+                veiculos.append(veiculos_carregados.index(tipo))
+        veiculos_offsets.append(len(veiculos))
+
+    nomes_bytes = [nome.encode("utf-8") for nome in nomes]
+    arrays = {
+        "nomes": np.frombuffer(b"".join(nomes_bytes), dtype=np.uint8),
+        "nomes_offsets": np.cumsum([0] + [len(nome) for nome in nomes_bytes], dtype=np.int64),
+        "veiculos_offsets": np.array(veiculos_offsets, dtype=np.int64),
+        "veiculos": np.array(veiculos, dtype=np.int64),
+    }
+    for campo, valores in colunas.items():
+        dtype = np.int64 if all(isinstance(valor, int) for valor in valores) else np.float64
+        arrays[campo] = np.array(valores, dtype=dtype)
+
+    # Arestas: um registo por direção, na ordem de Grafo.add_edge (aresta i cria 2i e 2i + 1)
+    tipos_arestas = []
+    for aresta in arestas:
+        for tipo in aresta["permitidos"]:
+            if tipo not in tipos_arestas:
+                tipos_arestas.append(tipo)
+    bits = {tipo: bit for bit, tipo in enumerate(tipos_arestas)}
+
+    origens = np.array([ids[str(aresta["origem"])] for aresta in arestas], dtype=np.int64)
+    destinos = np.array([ids[str(aresta["destino"])] for aresta in arestas], dtype=np.int64)
+    pesos = np.array([aresta["peso"] for aresta in arestas], dtype=np.float64)
+    bloqueadas = np.array([aresta["bloqueada"] for aresta in arestas], dtype=np.uint8)
+    mascaras = np.array([sum(1 << bits[tipo] for tipo in set(aresta["permitidos"])) for aresta in arestas], dtype=np.uint64)
+
+    registos_origem = np.column_stack((origens, destinos)).ravel()
+    registos_destino = np.column_stack((destinos, origens)).ravel()
+    ordem = np.argsort(registos_origem, kind="stable")
+    indices = ordem // 2  # Aresta do mapa de cada registo
+    arrays.update({
+        "offsets": np.concatenate(([0], np.cumsum(np.bincount(registos_origem, minlength=len(nomes))))).astype(np.int64),
+        "vizinhos": registos_destino[ordem],
+        "pesos": pesos[indices],
+        "bloqueadas": bloqueadas[indices],
+        "permitidos": mascaras[indices],
+        "arestas": indices.astype(np.int64),
+    })
+
+    pasta = pasta or os.path.splitext(ficheiro_grafo)[0] + EXTENSAO
+    os.makedirs(pasta, exist_ok=True)
+    for nome, array in arrays.items():
+        np.save(os.path.join(pasta, nome + ".npy"), array)
+
+    meta = {
+        "formato": FORMATO,
+        "origem": ficheiro_grafo,
+        "direcionado": False,
+        "n_nos": len(nomes),
+        "n_arestas": len(arestas),
+        "pesos_inteiros": all(isinstance(aresta["peso"], int) for aresta in arestas),
+        "tipos_arestas": tipos_arestas,
+        "veiculos_carregados": veiculos_carregados,
+        "caracteristicas": {tipo: caracteristicas[tipo] for tipo in veiculos_carregados},
+    }
+    # O mapa.json é escrito no fim: uma compilação interrompida não deixa um mapa carregável
+    with open(os.path.join(pasta, FICHEIRO_META), "w") as f:
+        json.dump(meta, f, indent=2)
+    return pasta
+
+
+def e_mapa_compilado(caminho):
+    return os.path.isfile(os.path.join(caminho, FICHEIRO_META))
+
+
+class MapaCompilado:
+    """
+    Arrays de um mapa compilado, mapeados em memória só para leitura: as páginas vêm do
+    ficheiro quando são lidas e são partilhadas por todos os processos que abrem o mesmo mapa.
+    Ao ser serializado leva apenas a pasta, e volta a mapear os ficheiros no destino.
+    """
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+        with open(os.path.join(pasta, FICHEIRO_META), "r") as f:
+            self.meta = json.load(f)
+        if self.meta.get("formato") != FORMATO:
+            raise ValueError(f"O mapa compilado '{pasta}' tem o formato {self.meta.get('formato')}; "
+                f"volte a compilá-lo (formato atual: {FORMATO}).")
+        self.tipos = self.meta["tipos_arestas"]
+        self.pesos_inteiros = self.meta["pesos_inteiros"]
+        for nome in ARRAYS_ARESTAS:
+            setattr(self, nome, self.abrir(nome))
+
+    def abrir(self, nome, modo="r"):
+        """
+        Mapeia o array com o nome dado; com modo "c" (cópia na escrita), as escritas ficam só
+        no processo e o ficheiro não é alterado.
+        """
+        return np.load(os.path.join(self.pasta, nome + ".npy"), mmap_mode=modo)
+
+    def nomes(self):
+        dados = self.abrir("nomes").tobytes()
+        offsets = self.abrir("nomes_offsets").tolist()
+        return [dados[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def __getstate__(self):
+        return {"pasta": self.pasta}
+
+    def __setstate__(self, estado):
+        self.__init__(estado["pasta"])
+
+
+class AdjacenciaMapeada(MutableMapping):
+    """
+    Vista de Grafo.m_graph sobre os arrays de um mapa compilado. A lista de registos
+    (vizinho, peso, bloqueada, permitidos) de um nó é criada na primeira consulta e guardada: a
+    partir daí é uma lista normal, que as alterações das arestas reescrevem como em m_graph. As
+    duas direções de uma aresta partilham a mesma lista de veículos permitidos, como em add_edge.
+    Os nós acrescentados depois do carregamento têm listas normais desde o início.
+    """
+
+    def __init__(self, mapa, nomes, ids):
+        self.mapa = mapa
+        self.nomes = nomes  # Nomes dos nós do mapa, por id
+        self.ids = ids  # {nome: id}, partilhado com o grafo
+        self.listas = {}  # {nome: registos} dos nós já consultados ou acrescentados
+        self.permitidos = {}  # {aresta do mapa: lista de permitidos} à espera da outra direção
+
+    def _id_mapa(self, nome):
+        id_no = self.ids.get(nome)
+        if id_no is None or id_no >= len(self.nomes):
+            return None
+        return id_no
+
+    def _registos(self, id_no):
+        mapa = self.mapa
+        inicio, fim = int(mapa.offsets[id_no]), int(mapa.offsets[id_no + 1])
+        direcionado = mapa.meta["direcionado"]
+        registos = []
+        for vizinho, peso, bloqueada, mascara, aresta in zip(
+            mapa.vizinhos[inicio:fim].tolist(), mapa.pesos[inicio:fim].tolist(),
+            mapa.bloqueadas[inicio:fim].tolist(), mapa.permitidos[inicio:fim].tolist(),
+            mapa.arestas[inicio:fim].tolist(),
+        ):
+            permitidos = self.permitidos.pop(aresta, None)
+            if permitidos is None:
+                permitidos = [tipo for bit, tipo in enumerate(mapa.tipos) if mascara >> bit & 1]
+                if not direcionado:
+                    self.permitidos[aresta] = permitidos
+            peso = int(peso) if mapa.pesos_inteiros else peso
+            registos.append((self.nomes[vizinho], peso, bool(bloqueada), permitidos))
+        return registos
+
+    def __getitem__(self, nome):
+        lista = self.listas.get(nome)
+        if lista is None:
+            id_no = self._id_mapa(nome)
+            if id_no is None:
+                raise KeyError(nome)
+            lista = self.listas[nome] = self._registos(id_no)
+        return lista
+
+    def get(self, nome, omissao=None):
+        lista = self.listas.get(nome)
+        if lista is not None:
+            return lista
+        if self._id_mapa(nome) is None:
+            return omissao
+        return self[nome]
+
+    def __contains__(self, nome):
+        return nome in self.listas or self._id_mapa(nome) is not None
+
+    def __setitem__(self, nome, lista):
+        self.listas[nome] = lista
+
+    def __delitem__(self, nome):
+        if self._id_mapa(nome) is not None:
+            raise TypeError(f"O nó {nome} pertence ao mapa compilado e não pode ser removido.")
+        del self.listas[nome]
+
+    def __iter__(self):
+        yield from self.nomes
+        for nome in self.listas:
+            if self._id_mapa(nome) is None:
+                yield nome
+
+    def __len__(self):
+        return len(self.nomes) + sum(1 for nome in self.listas if self._id_mapa(nome) is None)
+
+
+class IndiceArestasMapeado(MutableMapping):
+    """
+    Vista de Grafo.m_arestas ({(origem, destino): [posições em m_graph[origem]]}) sobre os
+    arrays de um mapa compilado: as posições de um par são procuradas na linha CSR da origem
+    na primeira consulta e guardadas. Como as listas de AdjacenciaMapeada começam pela ordem
+    da CSR, as posições coincidem; as arestas acrescentadas depois ficam só no dicionário.
+    """
+
+    def __init__(self, adjacencia):
+        self.adjacencia = adjacencia
+        self.posicoes = {}  # {(origem, destino): posições} já consultadas ou acrescentadas
+
+    def _posicoes_mapa(self, origem, destino):
+        id_origem = self.adjacencia._id_mapa(origem)
+        id_destino = self.adjacencia._id_mapa(destino)
+        if id_origem is None or id_destino is None:
+            return []
+        mapa = self.adjacencia.mapa
+        inicio, fim = int(mapa.offsets[id_origem]), int(mapa.offsets[id_origem + 1])
+        return np.flatnonzero(mapa.vizinhos[inicio:fim] == id_destino).tolist()
+
+    def __getitem__(self, chave):
+        posicoes = self.posicoes.get(chave)
+        if posicoes is None:
+            posicoes = self._posicoes_mapa(*chave)
+            if not posicoes:
+                raise KeyError(chave)
+            self.posicoes[chave] = posicoes
+        return posicoes
+
+    def get(self, chave, omissao=None):
+        posicoes = self.posicoes.get(chave)
+        if posicoes is not None:
+            return posicoes
+        try:
+            return self[chave]
+        except KeyError:
+            return omissao
+
+    def __setitem__(self, chave, posicoes):
+        self.posicoes[chave] = posicoes
+
+    def __delitem__(self, chave):
+        if self._posicoes_mapa(*chave):
+            raise TypeError(f"A aresta {chave} pertence ao mapa compilado e não pode ser removida.")
+        del self.posicoes[chave]
+
+    def __iter__(self):
+        adjacencia = self.adjacencia
+        mapa = adjacencia.mapa
+        offsets = mapa.offsets.tolist()
+        for id_origem, origem in enumerate(adjacencia.nomes):
+            vizinhos = np.unique(mapa.vizinhos[offsets[id_origem]:offsets[id_origem + 1]]).tolist()
+            for id_destino in vizinhos:
+                yield origem, adjacencia.nomes[id_destino]
+        for chave in self.posicoes:
+            if not self._posicoes_mapa(*chave):
+                yield chave
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def carregar_mapa_compilado(pasta, usar_csr=False):
+    """
+    Carrega um mapa compilado (ver compilar_mapa) sem ler JSON nem chamar add_edge:
+    - m_graph e m_arestas são vistas sobre a CSR mapeada em memória, criadas nó a nó a pedido;
+    - a representação CSR do grafo usa os mesmos ficheiros, com o estado e os veículos
+      permitidos das arestas em cópia na escrita (as alterações ficam só neste processo);
+    - o estado dos nós fica em arrays (ver Grafo.usar_estado_vetorial), também em cópia na
+      escrita a partir das colunas compiladas.
+    Vários processos que carreguem o mesmo mapa partilham as páginas dos ficheiros.
+    Tal como menu.carregar_grafo, aplica atualizar_medicamentos_e_populacao no fim.
+    """
+    mapa = MapaCompilado(pasta)
+    meta = mapa.meta
+    nomes = mapa.nomes()
+    veiculos_por_tipo = criar_veiculos(meta["caracteristicas"])  # Um veículo partilhado por tipo
+    veiculos_carregados = [veiculos_por_tipo[tipo] for tipo in meta["veiculos_carregados"]]
+    veiculos_offsets = mapa.abrir("veiculos_offsets").tolist()
+    veiculos = mapa.abrir("veiculos").tolist()
+
+    estado = EstadoNos.a_partir_de_colunas({campo: mapa.abrir(campo, "c") for campo in CAMPOS})
+
+    grafo = Grafo(directed=meta["direcionado"])
+    grafo.veiculos_carregados = list(meta["veiculos_carregados"])
+    # Os nós são muitos objetos novos de uma vez, que o coletor de ciclos percorreria várias
+    # vezes durante a criação sem nada para libertar
+    coletor_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        grafo.adicionar_nos(
+            No.vista_estado(nome, estado, id_no, [veiculos_carregados[i] for i in veiculos[veiculos_offsets[id_no]:veiculos_offsets[id_no + 1]]])
+            for id_no, nome in enumerate(nomes)
+        )
+    finally:
+        if coletor_ativo:
+            gc.enable()
+
+    grafo.m_graph = AdjacenciaMapeada(mapa, nomes, grafo.m_ids)
+    grafo.m_arestas = IndiceArestasMapeado(grafo.m_graph)
+    grafo.m_csr = GrafoCSR(
+        nomes, mapa.offsets, mapa.vizinhos, mapa.pesos, mapa.abrir("bloqueadas", "c"),
+        mapa.abrir("permitidos", "c"), {tipo: bit for bit, tipo in enumerate(mapa.tipos)},
+    )
+    if usar_csr:
+        grafo.usar_csr()
+    grafo.usar_estado_vetorial(estado=estado)
+
+    registo.debug("[MAPA] Mapa compilado '%s' carregado: %s nós e %s arestas.", pasta, meta["n_nos"], meta["n_arestas"])
+    grafo.atualizar_medicamentos_e_populacao()
+    return grafo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila um mapa JSON para o formato binário carregado com mmap.")
+    parser.add_argument("mapa", help="Ficheiro JSON do mapa")
+    parser.add_argument("-o", "--saida", help="Pasta do mapa compilado (por omissão <mapa>.mapa)")
+    parser.add_argument("--caracteristicas", default="data/caracteristicas_dos_veiculos.json",
+                        help="Ficheiro JSON com as características dos veículos")
+    args = parser.parse_args()
+
+    try:
+        pasta = compilar_mapa(args.mapa, args.saida, args.caracteristicas)
+    except ValueError as erro:
+        print(f"[ERRO] {erro}")
+        raise SystemExit(1)
+    meta = MapaCompilado(pasta).meta
+    print(f"Mapa com {meta['n_nos']} nós e {meta['n_arestas']} arestas compilado em '{pasta}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import heapq
+import numpy as np
+import registo
+from diario_alteracoes import AlteracaoGeral
+
+INF = float('inf')
+
+
+class Marcos:
+    """
+    Marcos (landmarks) para a heurística ALT (A*, Landmarks, Triangle inequality).
+
+    Para cada tipo de veículo guarda, para um conjunto de nós marco L, a distância de L a todos
+    os nós (d_de) e de todos os nós até L (d_para), usando apenas arestas não bloqueadas que
+    permitem esse veículo. Pela desigualdade triangular, para qualquer nó v e destino t:
+
+        dist(v, t) >= d_para[v][L] - d_para[t][L]
+        dist(v, t) >= d_de[t][L] - d_de[v][L]
+
+    e o máximo destes valores sobre todos os marcos é uma heurística admissível e consistente
+    para a soma dos pesos das arestas.
+
+    As distâncias de cada tipo de veículo são calculadas na primeira consulta desse tipo.
+    Quando uma aresta passa a estar disponível (desbloqueada ou com o veículo adicionado), as
+    distâncias que diminuem são propagadas a partir dessa aresta. Quando uma aresta deixa de
+    estar disponível, as distâncias só podem aumentar, pelo que as antigas continuam a ser
+    limites inferiores válidos; são recalculadas depois de max_pendentes alterações deste tipo.
+    """
+
+    def __init__(self, grafo, n_marcos=8, max_pendentes=32):
+        self.grafo = grafo
+        self.n_marcos = min(n_marcos, len(grafo.m_nodes))
+        self.max_pendentes = max_pendentes
+        self.marcos = self._escolher_marcos()
+        self.d_de = {}  # {tipo: array (n_nos, n_marcos)}
+        self.d_para = {}  # {tipo: array (n_nos, n_marcos)}; o mesmo array em grafos não direcionados
+        self.pendentes = {}  # {tipo: número de arestas removidas desde o último cálculo}
+
+    def _escolher_marcos(self):
+        """
+        Escolhe os marcos pela heurística do ponto mais afastado: cada novo marco é o nó mais
+        distante dos marcos já escolhidos (os nós inalcançáveis são escolhidos primeiro, para
+        cobrir componentes desligadas). Usa todas as arestas, ignorando bloqueios e veículos.
+        """
+        n = len(self.grafo.m_nodes)
+        if n == 0:
+            return []
+
+        vizinhos = lambda nome: [(adj, peso) for adj, peso, _, _ in self.grafo.m_graph.get(nome, [])]
+        minimo = np.full(n, INF)
+        marcos = []
+        atual = 0
+        for _ in range(self.n_marcos):
+            marcos.append(atual)
+            minimo = np.minimum(minimo, self._dijkstra(atual, vizinhos))
+            minimo[marcos] = -1  # Nunca repetir um marco
+            inalcancaveis = np.flatnonzero(minimo == INF)
+            atual = int(inalcancaveis[0]) if len(inalcancaveis) else int(np.argmax(minimo))
+        return marcos
+
+    def _dijkstra(self, origem, vizinhos, distancias=None, fila=None):
+        """
+        Dijkstra sobre ids inteiros. Se distancias e fila forem dados, continua a partir desse
+        estado, propagando apenas as distâncias que diminuem (usado nas atualizações incrementais);
+        distancias pode ser uma vista de uma coluna dos arrays de marcos, alterada no próprio lugar.
+        Retorna o array de distâncias.
+        """
+        ids = self.grafo.m_ids
+        nomes = self.grafo.m_nodes
+        if distancias is None:
+            distancias = np.full(len(nomes), INF)
+            distancias[origem] = 0
+            fila = [(0, origem)]
+
+        while fila:
+            distancia, atual = heapq.heappop(fila)
+            if distancia > distancias[atual]:
+                continue
+            for adjacente, peso in vizinhos(nomes[atual].getNome()):
+                j = ids[adjacente]
+                nova = distancia + peso
+                if nova < distancias[j]:
+                    distancias[j] = nova
+                    heapq.heappush(fila, (nova, j))
+        return distancias
+
+    def _calcular_tipo(self, tipo):
+        registo.debug("[ALT] A calcular distâncias dos %s marcos para o veículo %s", len(self.marcos), tipo)
+        n = len(self.grafo.m_nodes)
+        de = np.empty((n, len(self.marcos)))
+        para = de if not self.grafo.m_directed else np.empty((n, len(self.marcos)))
+
+        sucessores = lambda nome: self.grafo.getNeighbours(nome, tipo)
+        predecessores = lambda nome: self.grafo.getPredecessores(nome, tipo)
+        for k, marco in enumerate(self.marcos):
+            de[:, k] = self._dijkstra(marco, sucessores)
+            if para is not de:
+                para[:, k] = self._dijkstra(marco, predecessores)
+
+        self.d_de[tipo] = de
+        self.d_para[tipo] = para
+        self.pendentes[tipo] = 0
+
+    def _garantir_tipo(self, tipo):
+        if tipo not in self.d_de or self.pendentes[tipo] > self.max_pendentes:
+            self._calcular_tipo(tipo)
+
+    def recalcular(self):
+        """
+        Recalcula as distâncias de todos os tipos de veículo já usados.
+        """
+        for tipo in list(self.d_de):
+            self._calcular_tipo(tipo)
+
+    def heuristica(self, tipo, destino):
+        """
+        Retorna uma função h(nome_no) com o limite inferior ALT da distância de nome_no a destino
+        para o tipo de veículo dado. Retorna INF se o nó não conseguir chegar ao destino.
+        """
+        self._garantir_tipo(tipo)
+        de, para = self.d_de[tipo], self.d_para[tipo]
+        ids = self.grafo.m_ids
+        t = ids[destino]
+
+        # Só os marcos com distância finita ao/do destino dão limites válidos
+        k_para = np.flatnonzero(np.isfinite(para[t]))
+        k_de = np.flatnonzero(np.isfinite(de[t]))
+        para_t = para[t, k_para]
+        de_t = de[t, k_de]
+
+        def h(nome_no):
+            v = ids[nome_no]
+            melhor = 0.0
+            if len(k_para):
+                melhor = max(melhor, float(np.max(para[v, k_para] - para_t)))
+            if len(k_de):
+                melhor = max(melhor, float(np.max(de_t - de[v, k_de])))
+            return melhor
+
+        return h
+
+    def heuristica_ids(self, tipo, destino):
+        """
+        Os mesmos valores de heuristica(tipo, destino), calculados de uma só vez para todos os
+        nós: lista indexada pelo id do nó.
+        """
+        self._garantir_tipo(tipo)
+        de, para = self.d_de[tipo], self.d_para[tipo]
+        t = self.grafo.m_ids[destino]
+
+        k_para = np.flatnonzero(np.isfinite(para[t]))
+        k_de = np.flatnonzero(np.isfinite(de[t]))
+        melhor = np.zeros(len(self.grafo.m_nodes))
+        if len(k_para):
+            melhor = np.maximum(melhor, np.max(para[:, k_para] - para[t, k_para], axis=1))
+        if len(k_de):
+            melhor = np.maximum(melhor, np.max(de[t, k_de] - de[:, k_de], axis=1))
+        return melhor.tolist()
+
+    def heuristica_origem(self, tipo, origem):
+        """
+        Retorna uma função h(nome_no) com o limite inferior ALT da distância de origem a nome_no,
+        usado pelas procuras no sentido inverso (do destino para a origem):
+
+            dist(s, v) >= d_de[v][L] - d_de[s][L]
+            dist(s, v) >= d_para[s][L] - d_para[v][L]
+
+        Retorna INF se a origem não conseguir chegar ao nó.
+        """
+        self._garantir_tipo(tipo)
+        de, para = self.d_de[tipo], self.d_para[tipo]
+        ids = self.grafo.m_ids
+        s = ids[origem]
+
+        k_para = np.flatnonzero(np.isfinite(para[s]))
+        k_de = np.flatnonzero(np.isfinite(de[s]))
+        para_s = para[s, k_para]
+        de_s = de[s, k_de]
+
+        def h(nome_no):
+            v = ids[nome_no]
+            melhor = 0.0
+            if len(k_de):
+                melhor = max(melhor, float(np.max(de[v, k_de] - de_s)))
+            if len(k_para):
+                melhor = max(melhor, float(np.max(para_s - para[v, k_para])))
+            return melhor
+
+        return h
+
+    def aplicar_alteracao(self, alteracao):
+        """
+        Subscritor das alterações de arestas do grafo (ver Grafo.subscrever_alteracoes): só os
+        tipos de veículo afetados pela alteração são atualizados.
+        """
+        if isinstance(alteracao, AlteracaoGeral):
+            if alteracao.motivo == "arestas":
+                # Não se sabe o que mudou: cada tipo é recalculado na próxima consulta
+                self.d_de = {}
+                self.d_para = {}
+                self.pendentes = {}
+            return
+
+        origem, destino = alteracao.origem, alteracao.destino
+        aresta = self.grafo.get_aresta(origem, destino)
+        if aresta is None:
+            return
+
+        _, peso, bloqueada, permitidos = aresta
+        u = self.grafo.m_ids[origem]
+        w = self.grafo.m_ids[destino]
+
+        for tipo in self.grafo.tipos_afetados(alteracao) & self.d_de.keys():
+            if bloqueada or tipo not in permitidos:
+                # Distâncias só aumentam: os valores atuais continuam admissíveis
+                self.pendentes[tipo] += 1
+                continue
+
+            de, para = self.d_de[tipo], self.d_para[tipo]
+            for k in range(len(self.marcos)):
+                # d_de: caminhos marco -> ... -> origem -> destino
+                if de[u, k] + peso < de[w, k]:
+                    de[w, k] = de[u, k] + peso
+                    self._dijkstra(None, lambda nome: self.grafo.getNeighbours(nome, tipo), de[:, k], [(de[w, k], w)])
+                # d_para: caminhos origem -> destino -> ... -> marco
+                if para is not de and para[w, k] + peso < para[u, k]:
+                    para[u, k] = para[w, k] + peso
+                    self._dijkstra(None, lambda nome: self.grafo.getPredecessores(nome, tipo), para[:, k], [(para[u, k], u)])
@@ -0,0 +1,124 @@
+import numpy as np
+import registo
+
+INF = float('inf')
+
+
+class MatrizCustos:
+    """
+    Matriz de custos entre todos os depósitos (nós com medicamentos) e todas as zonas (nós com
+    população por socorrer), para cada tipo de veículo. Os arrays têm forma
+    (n_depositos, n_zonas, n_tipos):
+    - distancia: soma das arestas do caminho mais curto (inf se não houver caminho);
+    - viavel: True se o veículo existe no depósito, tem combustível e velocidade suficientes
+      para a janela de tempo da zona e consegue socorrer alguém;
+    - pessoas: pessoas socorridas, min(medicamentos, população, limite de carga);
+    - custo: o mesmo valor de Grafo.calcula_custo para o caminho mais curto (inf se inviável).
+    """
+
+    def __init__(self, depositos, zonas, tipos, distancia, viavel, pessoas, custo):
+        self.depositos = depositos  # Nomes dos depósitos (eixo 0)
+        self.zonas = zonas  # Nomes das zonas (eixo 1)
+        self.tipos = tipos  # Tipos de veículo (eixo 2)
+        self.distancia = distancia
+        self.viavel = viavel
+        self.pessoas = pessoas
+        self.custo = custo
+
+    @classmethod
+    def a_partir_de_grafo(cls, grafo):
+        """
+        Constrói a matriz com uma árvore de caminhos mais curtos (Grafo.arvore_caminhos) por
+        depósito e por classe de permissões: os tipos de veículo que podem usar exatamente as
+        mesmas arestas partilham as mesmas árvores. As verificações de combustível, velocidade
+        e carga e o custo final são calculados de uma só vez sobre os arrays.
+        """
+        depositos = [no for no in grafo.m_nodes if no.get_medicamento() > 0]
+        zonas = [no for no in grafo.m_nodes if no.populacao > 0]
+        tipos = list(grafo.veiculos_carregados)
+        indice_zona = {no.getNome(): j for j, no in enumerate(zonas)}
+        D, Z, T = len(depositos), len(zonas), len(tipos)
+
+        # Atributos dos veículos de cada depósito (o mais barato de cada tipo)
+        disponivel = np.zeros((D, T), dtype=bool)
+        combustivel = np.zeros((D, T))
+        velocidade = np.zeros((D, T))
+        carga = np.zeros((D, T))
+        custo_veiculo = np.zeros((D, T))
+        indice_tipo = {tipo: k for k, tipo in enumerate(tipos)}
+        for i, deposito in enumerate(depositos):
+            for veiculo in reversed(grafo.get_veiculos_no(deposito.getNome())):
+                k = indice_tipo.get(veiculo.get_tipo())
+                if k is None:
+                    continue
+                disponivel[i, k] = True
+                combustivel[i, k] = veiculo.get_combustivel_disponivel()
+                velocidade[i, k] = veiculo.get_velocidade()
+                carga[i, k] = veiculo.get_limite_carga()
+                custo_veiculo[i, k] = veiculo.get_custo()
+
+        # Distâncias: uma árvore por depósito e classe de permissões
+        distancia = np.full((D, Z, T), INF)
+        classes = cls._classes_permissoes(grafo, tipos)
+        registo.debug("[MATRIZ] %s depósitos, %s zonas, %s tipos de veículo em %s classes de permissões",
+            D, Z, T, len(classes))
+        for tipos_classe in classes:
+            ks = [indice_tipo[tipo] for tipo in tipos_classe]
+            for i, deposito in enumerate(depositos):
+                if not disponivel[i, ks].any():
+                    continue
+                distancias, _ = grafo.arvore_caminhos(deposito.getNome(), tipos_classe[0])
+                for nome, valor in distancias.items():
+                    j = indice_zona.get(nome)
+                    if j is not None:
+                        distancia[i, j, ks] = valor
+
+        medicamentos = np.array([no.get_medicamento() for no in depositos], dtype=float)
+        populacao = np.array([no.populacao for no in zonas], dtype=float)
+        janela = np.array([no.janela_tempo for no in zonas], dtype=float)
+
+        pessoas = np.minimum(
+            np.minimum(medicamentos[:, None, None], populacao[None, :, None]),
+            carga[:, None, :],
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            velocidade_necessaria = distancia / janela[None, :, None]
+            viavel = (
+                disponivel[:, None, :]
+                & np.isfinite(distancia)
+                & (distancia <= combustivel[:, None, :])
+                & ((janela[None, :, None] <= 0) | (velocidade_necessaria <= velocidade[:, None, :]))
+                & (pessoas > 0)
+            )
+            custo = np.where(viavel, distancia * custo_veiculo[:, None, :] / pessoas, INF)
+        pessoas = np.where(disponivel[:, None, :], pessoas, 0)
+
+        return cls([no.getNome() for no in depositos], [no.getNome() for no in zonas], tipos,
+                   distancia, viavel, pessoas, custo)
+
+    @staticmethod
+    def _classes_permissoes(grafo, tipos):
+        """
+        Agrupa os tipos de veículo pelo conjunto de arestas que podem usar (não bloqueadas e
+        com o tipo permitido). Retorna uma lista de listas de tipos.
+        """
+        csr = grafo.get_csr()
+        livres = csr.bloqueadas == 0
+        classes = {}
+        for tipo in tipos:
+            mascara = np.uint64(csr.mascara_veiculo(tipo))
+            utilizaveis = livres & ((csr.permitidos & mascara) != 0)
+            classes.setdefault(np.packbits(utilizaveis).tobytes(), []).append(tipo)
+        return list(classes.values())
+
+    def melhor_veiculo(self):
+        """
+        Retorna (custo, tipos): para cada par (depósito, zona), o menor custo entre os tipos de
+        veículo e o tipo que o obtém (None quando nenhum é viável).
+        """
+        if not self.tipos:
+            return np.full(self.custo.shape[:2], INF), np.full(self.custo.shape[:2], None, dtype=object)
+
+        custo = self.custo.min(axis=2)
+        tipos = np.array(self.tipos, dtype=object)[self.custo.argmin(axis=2)]
+        return custo, np.where(np.isfinite(custo), tipos, None)
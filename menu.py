@@ -2,14 +2,21 @@ import os
 import json
 import time
 import random
+import registo
 from grafo import Grafo
 from no import No
 import matplotlib.pyplot as plt
-from veiculo import Veiculo
+from veiculo import criar_veiculos
 from meteorologia import Meteorologia
 from condicoesDinamicas import executar_alteracoes_dinamicas
 from newCondDinamicas import CondicoesDinamicas
-from algoritmos_procura import procura_CustoUniforme, procura_DFS, procura_BFS, procura_Iterativa, procura_aStar, greedy, simulated_annealing, hill_climbing
+from cache_rotas import CacheRotas
+from mapa_compilado import carregar_mapa_compilado, e_mapa_compilado, EXTENSAO
+from algoritmos_procura import procura_CustoUniforme, procura_multi_veiculo, procura_hierarquias, procura_CustoUniforme_bidirecional, procura_aStar_bidirecional, procura_incremental, procura_DFS, procura_BFS, procura_Iterativa, procura_aStar, procura_IDAstar, greedy, simulated_annealing, simulated_annealing_multicadeia, hill_climbing
+
+# Expansões por veículo da procura iterativa e do IDA*: sem nós fechados, o trabalho cresce
+# com o número de caminhos e, sem limite, uma consulta pode demorar muito mais que o A*
+MAX_EXPANSOES = 100000
 
 def carregar_caracteristicas_veiculos(ficheiro_caracteristicas="data/caracteristicas_dos_veiculos.json"):
     """
@@ -24,14 +31,23 @@ def carregar_caracteristicas_veiculos(ficheiro_caracteristicas="data/caracterist
         print(f"[ERRO] O ficheiro '{ficheiro_caracteristicas}' contém JSON inválido.")
     return {}
 
-def carregar_grafo(ficheiro_grafo, ficheiro_caracteristicas="data/caracteristicas_dos_veiculos.json"):
+def carregar_grafo(ficheiro_grafo, ficheiro_caracteristicas="data/caracteristicas_dos_veiculos.json", usar_csr=False,
+                   usar_estado_vetorial=False):
     """
     Carrega o grafo e as características dos veículos a partir dos ficheiros JSON.
+    Se usar_csr for True, as consultas de adjacência passam a usar a representação CSR.
+    Se usar_estado_vetorial for True, o estado dos nós fica em arrays (ver Grafo.usar_estado_vetorial).
+    Se ficheiro_grafo for a pasta de um mapa compilado (ver mapa_compilado), é carregado com
+    mmap, com as características dos veículos guardadas na compilação e o estado em arrays.
     """
+    if e_mapa_compilado(ficheiro_grafo):
+        return carregar_mapa_compilado(ficheiro_grafo, usar_csr=usar_csr)
+
     with open(ficheiro_grafo, "r") as f:
         dados = json.load(f)
 
     caracteristicas_veiculos = carregar_caracteristicas_veiculos(ficheiro_caracteristicas)
+    veiculos_por_tipo = criar_veiculos(caracteristicas_veiculos)  # Um veículo partilhado por tipo
 
     grafo = Grafo(directed=False)
 
@@ -52,15 +68,8 @@ def carregar_grafo(ficheiro_grafo, ficheiro_caracteristicas="data/caracteristica
 
         veiculos = []
         for tipo in no_data.get("veiculos", []):
-            if tipo in caracteristicas_veiculos:
-                veiculo_data = caracteristicas_veiculos[tipo]
-                veiculo = Veiculo(
-                    tipo=tipo,
-                    custo=veiculo_data["custo"],
-                    combustivel_disponivel=veiculo_data["combustivel_disponivel"],
-                    limite_carga=veiculo_data["limite_carga"],
-                    velocidade=veiculo_data["velocidade"]
-                )
+            if tipo in veiculos_por_tipo:
+                veiculo = veiculos_por_tipo[tipo]
                 veiculos.append(veiculo)
                 # Adicionar veículo à lista global de veículos carregados
                 if veiculo.get_tipo() not in grafo.veiculos_carregados:
@@ -69,8 +78,7 @@ def carregar_grafo(ficheiro_grafo, ficheiro_caracteristicas="data/caracteristica
                 print(f"[AVISO] O veículo '{tipo}' não tem características definidas no ficheiro '{ficheiro_caracteristicas}'.")
 
         no = No(nome, populacao=populacao, janela_tempo=tempo, medicamento=medicamento, veiculos=veiculos, x=x, y=y, meteorologia=meteorologia)
-        grafo.m_nodes.append(no)
-        grafo.m_graph[nome] = []
+        grafo.adicionar_no(no)
 
     for aresta in dados["arestas"]:
         grafo.add_edge(
@@ -79,6 +87,11 @@ def carregar_grafo(ficheiro_grafo, ficheiro_caracteristicas="data/caracteristica
             permitidos=aresta["permitidos"]
         )
 
+    if usar_csr:
+        grafo.usar_csr()
+    if usar_estado_vetorial:
+        grafo.usar_estado_vetorial()
+
     grafo.atualizar_medicamentos_e_populacao()
 
     return grafo
@@ -86,11 +99,13 @@ def carregar_grafo(ficheiro_grafo, ficheiro_caracteristicas="data/caracteristica
 def listar_mapas_disponiveis(pasta="data"):
     """
     Lista os mapas disponíveis na pasta especificada, excluindo ficheiros que contenham 'caracteristicas' no nome.
+    Os mapas compilados (pastas .mapa) também são listados.
     """
     try:
         arquivos = [
             f for f in os.listdir(pasta)
-            if f.endswith(".json") and "caracteristicas" not in f.lower()
+            if (f.endswith(".json") and "caracteristicas" not in f.lower())
+            or (f.endswith(EXTENSAO) and e_mapa_compilado(os.path.join(pasta, f)))
         ]
         if not arquivos:
             print(f"[ERRO] Nenhum mapa disponível na pasta '{pasta}'.")
@@ -156,6 +171,16 @@ def mostrar_menu_estatico():
     print("7. Simulated Annealing")
     print("8. Hill-Climbing")
     print("9. Imprimir Grafo")
+    print("12. Nível de registo")
+    print("13. Custo-Uniforme multi-veículo")
+    print("14. Custo-Uniforme com hierarquias de contração")
+    print("15. Alternar procura bidirecional (Custo-Uniforme e A*)")
+    print("16. Custo-Uniforme incremental (LPA*)")
+    print("17. Despacho: zonas alcançáveis a partir de um nó")
+    print("18. Hill-Climbing paralelo")
+    print("19. Simulated Annealing multi-cadeia (parallel tempering)")
+    print("20. IDA* (memória limitada)")
+    print("21. Estatísticas da cache de rotas")
     print("0. Sair")
     return input("Opção: ").strip()
 
@@ -175,9 +200,50 @@ def mostrar_menu_dinamico():
     print("9. Imprimir Grafo")
     print("10. Fabricar medicamentos")
     print("11. Executar alterações dinâmicas")
+    print("12. Nível de registo")
+    print("13. Custo-Uniforme multi-veículo")
+    print("14. Custo-Uniforme com hierarquias de contração")
+    print("15. Alternar procura bidirecional (Custo-Uniforme e A*)")
+    print("16. Custo-Uniforme incremental (LPA*)")
+    print("17. Despacho: zonas alcançáveis a partir de um nó")
+    print("18. Hill-Climbing paralelo")
+    print("19. Simulated Annealing multi-cadeia (parallel tempering)")
+    print("20. IDA* (memória limitada)")
+    print("21. Estatísticas da cache de rotas")
     print("0. Sair")
     return input("Opção: ").strip()
 
+def selecionar_nivel_registo():
+    """
+    Pergunta ao utilizador o nível de registo (verbosidade) das procuras e do grafo.
+    O nível inicial pode ser definido pela variável de ambiente IA_NIVEL_REGISTO.
+    """
+    print(f"\nNível de registo atual: {registo.nome_nivel(registo.get_nivel())}")
+    for nome, valor in registo.NIVEIS.items():
+        print(f"{valor}. {nome}")
+
+    opcao = input("Novo nível: ").strip()
+    try:
+        registo.definir_nivel(opcao)
+        print(f"Nível de registo definido para: {registo.nome_nivel(registo.get_nivel())}")
+    except ValueError as erro:
+        print(f"[ERRO] {erro}")
+
+def mostrar_despacho(tabela):
+    """
+    Imprime a tabela de despacho retornada por Grafo.despacho.
+    """
+    if not tabela:
+        print("Nenhuma zona com população por socorrer.")
+        return
+
+    print(f"{'Destino':<10} {'Veículo':<10} {'Distância':>10} {'Custo':>12} {'Pessoas':>8}  Estado")
+    for linha in tabela:
+        custo = "-" if linha["motivo"] else f"{linha['custo']:.3f}"
+        estado = linha["motivo"] or " -> ".join(linha["caminho"])
+        print(f"{linha['destino']:<10} {linha['veiculo']:<10} {linha['distancia']:>10} {custo:>12} "
+              f"{linha['pessoas_socorridas']:>8}  {estado}")
+
 def iniciar_menu():
     ficheiro_mapa = selecionar_mapa()
     if not ficheiro_mapa:
@@ -188,6 +254,8 @@ def iniciar_menu():
     grafo = carregar_grafo(ficheiro_grafo=ficheiro_mapa)
 
     condicoes_dinamicas = None
+    bidirecional = False  # Se True, as opções 4 e 5 usam as variantes bidirecionais
+    rotas = CacheRotas(grafo)  # Pedidos repetidos sem alterações dos caminhos não voltam a calcular a rota
 
     if tipo_experiencia=="real dinamica":
         condicoes_dinamicas = CondicoesDinamicas(grafo)
@@ -197,6 +265,11 @@ def iniciar_menu():
         print("[ERRO] O grafo não possui nós. Verifique os ficheiros de entrada.")
         return
 
+    if tipo_experiencia == "estatica":
+        # O mapa não muda: as hierarquias de contração são construídas uma única vez
+        print("A pré-processar o mapa (hierarquias de contração)...")
+        grafo.get_hierarquias().preparar(grafo.veiculos_carregados)
+
     while True:
         destino = grafo.get_no_maior_prioridade()
         if destino:
@@ -219,7 +292,7 @@ def iniciar_menu():
             if not veiculos_disponiveis:
                 print("O nó inicial não possui veículos disponíveis.")
                 continue
-            resultado = procura_DFS(grafo, inicio.upper(), destino.getNome().upper())
+            resultado = rotas.procurar(procura_DFS, inicio.upper(), destino.getNome().upper())
             if resultado:
                 print("Caminho DFS:")
                 for veiculo, (path, custo) in resultado.items():
@@ -229,7 +302,7 @@ def iniciar_menu():
 
         elif opcao == "2" and destino is not None:
             inicio = input("Nó inicial: ")
-            resultado = procura_BFS(grafo, inicio.upper(), destino.getNome().upper())
+            resultado = rotas.procurar(procura_BFS, inicio.upper(), destino.getNome().upper())
             if resultado:
                 print("Caminho BFS:")
                 for veiculo, (path, custo) in resultado.items():
@@ -244,7 +317,8 @@ def iniciar_menu():
             if not veiculos_disponiveis:
                 print("O nó inicial não possui veículos disponíveis.")
                 continue
-            resultado = procura_Iterativa(grafo, inicio.upper(), destino.getNome().upper(),profundidade)
+            resultado = rotas.procurar(procura_Iterativa, inicio.upper(), destino.getNome().upper(), profundidade,
+                                       MAX_EXPANSOES)
             if resultado:
                 print("Caminhos Iterativos:")
                 for veiculo, (path, custo) in resultado.items():
@@ -258,7 +332,8 @@ def iniciar_menu():
             if not veiculos_disponiveis:
                 print("O nó inicial não possui veículos disponíveis.")
                 continue
-            resultado = procura_CustoUniforme(grafo, inicio.upper(), destino.getNome().upper())
+            procura = procura_CustoUniforme_bidirecional if bidirecional else procura_CustoUniforme
+            resultado = rotas.procurar(procura, inicio.upper(), destino.getNome().upper())
             if resultado:
                 print("Caminhos Custo-Uniforme:")
                 for veiculo, (path, custo) in resultado.items():
@@ -268,7 +343,8 @@ def iniciar_menu():
                 
         elif opcao == "5" and destino is not None:
             inicio = input("Nó inicial: ")
-            resultado = procura_aStar(grafo, inicio.upper(), destino.getNome().upper())
+            procura = procura_aStar_bidirecional if bidirecional else procura_aStar
+            resultado = rotas.procurar(procura, inicio.upper(), destino.getNome().upper())
             
             if isinstance(resultado, dict):
                 for veiculo, valores in resultado.items():
@@ -282,7 +358,7 @@ def iniciar_menu():
 
         elif opcao == "6" and destino is not None:
             inicio = input("Nó inicial: ")
-            resultado = greedy(grafo, inicio.upper(), destino.getNome().upper())
+            resultado = rotas.procurar(greedy, inicio.upper(), destino.getNome().upper())
             if resultado:
                 for veiculo, (path, custo) in resultado.items():
                     print(f"Veículo: {veiculo}, Caminho: {path}, Custo: {custo}")
@@ -323,12 +399,93 @@ def iniciar_menu():
             try:
                 vezes = int(input("Quantas alterações dinâmicas deseja realizar? "))
                 if vezes > 0:
-                    executar_alteracoes_dinamicas(grafo, vezes)
+                    em_lote = vezes > 1 and input("Aplicar em lote, com um só avanço do tempo no fim? (s/n): ").strip().lower() == "s"
+                    executar_alteracoes_dinamicas(grafo, vezes, em_lote=em_lote)
                 else:
                     print("[ERRO] O número deve ser maior que 0.")
             except ValueError:
                 print("[ERRO] Entrada inválida. Por favor, insira um número inteiro.")
 
+        elif opcao == "13" and destino is not None:
+            inicio = input("Nó inicial: ")
+            resultado = rotas.procurar(procura_multi_veiculo, inicio.upper(), destino.getNome().upper())
+            if resultado:
+                print("Caminho Custo-Uniforme multi-veículo:")
+                for veiculo, (path, custo) in resultado.items():
+                    print("Veículo:", veiculo, " -> ", path, " Custo:", custo)
+            else:
+                print("Caminho não encontrado com Custo-Uniforme multi-veículo.")
+
+        elif opcao == "14" and destino is not None:
+            inicio = input("Nó inicial: ")
+            resultado = rotas.procurar(procura_hierarquias, inicio.upper(), destino.getNome().upper())
+            if resultado:
+                print("Caminho Custo-Uniforme com hierarquias de contração:")
+                for veiculo, (path, custo) in resultado.items():
+                    print("Veículo:", veiculo, " -> ", path, " Custo:", custo)
+            else:
+                print("Caminho não encontrado com hierarquias de contração.")
+
+        elif opcao == "16" and destino is not None:
+            inicio = input("Nó inicial: ")
+            resultado = rotas.procurar(procura_incremental, inicio.upper(), destino.getNome().upper())
+            if resultado:
+                print("Caminho Custo-Uniforme incremental:")
+                for veiculo, (path, custo) in resultado.items():
+                    print("Veículo:", veiculo, " -> ", path, " Custo:", custo)
+            else:
+                print("Caminho não encontrado com Custo-Uniforme incremental.")
+
+        elif opcao == "17":
+            inicio = input("Nó de partida: ")
+            mostrar_despacho(grafo.despacho(inicio.upper()))
+
+        elif opcao == "18" and destino is not None:
+            resultado = hill_climbing(grafo, destino.getNome().upper(), max_restarts=os.cpu_count() or 6, max_iteracoes=10, paralelo=True)
+            if resultado:
+                for veiculo, (path, custo) in resultado.items():
+                    print(f"Veículo: {veiculo}, Caminho: {path}, Custo: {custo}")
+            else:
+                print("Caminho não encontrado com Hill-Climbing paralelo.")
+
+        elif opcao == "19" and destino is not None:
+            resultado = simulated_annealing_multicadeia(
+                grafo, destino.getNome().upper(), n_cadeias=os.cpu_count() or 4,
+                temperatura_inicial=10, numero_iteracoes=100, troca_cada=10)
+            if resultado:
+                caminho, custo, estatisticas = resultado
+                print("Caminho:", caminho, "Custo:", custo)
+                for estatistica in estatisticas:
+                    print(f"Cadeia {estatistica['cadeia']} (T={estatistica['temperatura']}): "
+                          f"melhor custo {estatistica['melhor_custo']} na iteração {estatistica['iteracao_melhor']}, "
+                          f"{estatistica['aceitacoes']} aceitações, {estatistica['reinicios']} reinícios, "
+                          f"{estatistica['trocas']} trocas")
+            else:
+                print("Caminho não encontrado com Simulated Annealing multi-cadeia.")
+
+        elif opcao == "20" and destino is not None:
+            inicio = input("Nó inicial: ")
+            resultado = rotas.procurar(procura_IDAstar, inicio.upper(), destino.getNome().upper(), "alt", MAX_EXPANSOES)
+            if resultado:
+                for veiculo, (path, custo) in resultado.items():
+                    print(f"Veículo: {veiculo}, Caminho: {path}, Custo: {custo}")
+            else:
+                print("Caminho não encontrado com IDA*.")
+
+        elif opcao == "21":
+            estatisticas = rotas.estatisticas()
+            print(f"Cache de rotas (versão das rotas {estatisticas['versao']}): "
+                  f"{estatisticas['acertos']} acertos, {estatisticas['falhas']} falhas "
+                  f"({estatisticas['taxa_acertos']:.1%}), {estatisticas['entradas']}/{estatisticas['capacidade']} entradas, "
+                  f"{estatisticas['remocoes']} removidas")
+
+        elif opcao == "15":
+            bidirecional = not bidirecional
+            print(f"Procura bidirecional {'ativada' if bidirecional else 'desativada'} para Custo-Uniforme e A*.")
+
+        elif opcao == "12":
+            selecionar_nivel_registo()
+
         elif opcao == "0":
             if tipo_experiencia== "real dinamica":
                 condicoes_dinamicas.parar_alteracoes()
@@ -1,6 +1,49 @@
+from estado_nos import CampoEstado, CAMPOS_METEOROLOGIA
+
+
 class Meteorologia:
+    __slots__ = ("no", "_chuva", "_tempestade", "_vento", "_nevoeiro")
+
+    CONDICOES = CAMPOS_METEOROLOGIA
+
+    # Condições que podem viver no EstadoNos do nó a que a meteorologia pertence
+    chuva = CampoEstado("chuva")
+    tempestade = CampoEstado("tempestade")
+    vento = CampoEstado("vento")
+    nevoeiro = CampoEstado("nevoeiro")
+
     def __init__(self, chuva = 0, tempestade = 0, vento = 0, nevoeiro = 0):
+        self.no = None  # Nó a que a meteorologia pertence, avisado quando uma condição muda
         self.chuva = chuva 
         self.tempestade = tempestade
         self.vento = vento
-        self.nevoeiro = nevoeiro
\ No newline at end of file
+        self.nevoeiro = nevoeiro
+
+    @classmethod
+    def vista(cls, no):
+        """
+        Meteorologia de um nó cujas condições já estão no EstadoNos a que o nó está ligado.
+        """
+        meteorologia = cls.__new__(cls)
+        meteorologia.no = no
+        return meteorologia
+
+    def _posicao_estado(self):
+        if self.no is None:
+            return None, None
+        return self.no.estado, self.no.id
+
+    def _estado_alterado(self, campo):
+        if self.no is not None:
+            self.no.notificar_prioridade()
+            self.no.notificar_alteracao(campo)
+
+    def ligar_no(self, no):
+        """
+        Associa a meteorologia a um nó (ou a nenhum, com None), levando os valores atuais das
+        condições para onde o novo dono os guarda.
+        """
+        valores = [getattr(self, condicao) for condicao in Meteorologia.CONDICOES]
+        self.no = no
+        for condicao, valor in zip(Meteorologia.CONDICOES, valores):
+            setattr(self, condicao, valor)
@@ -0,0 +1,12 @@
+# Contadores globais usados pelo benchmark para medir o trabalho dos algoritmos de procura.
+# Os algoritmos incrementam-nos diretamente (metricas.nos_expandidos += 1), o que tem um
+# custo desprezável quando ninguém os está a ler.
+
+nos_expandidos = 0
+caminhos_materializados = 0  # Caminhos completos construídos a partir das árvores de procura
+
+
+def reiniciar():
+    global nos_expandidos, caminhos_materializados
+    nos_expandidos = 0
+    caminhos_materializados = 0
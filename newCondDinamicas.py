@@ -64,7 +64,7 @@ class CondicoesDinamicas:
         cond_a_alterar = random.choices(lista_cond_meteo, [0.3, 0.1, 0.3, 0.3], k=1)[0]
         novo_valor_cond = random.randint(0,20)
 
-        setattr(no_a_alterar.meteorologia, cond_a_alterar, novo_valor_cond)
+        self.grafo.alterar_no(no_a_alterar.getNome(), **{cond_a_alterar: novo_valor_cond})
         self.grafo.ajustar_janelas_de_tempo()
         print(f"\n[DEBUG]Meteorologia alterada em: {no_a_alterar.getNome()}\nCondição: {cond_a_alterar}\nNovo valor: {novo_valor_cond}")
 
@@ -97,16 +97,8 @@ class CondicoesDinamicas:
     
     def update_estado_caminho(self, nome_no_origem, nome_no_destino, novo_estado):
         
-        #atualiza estado no caminho
-        def atualizar(nome_no, nome_adjacente):
-            lista = []
-            for adj, peso, estado, permit in self.grafo.m_graph[nome_no]:
-                if adj == nome_adjacente:
-                    lista.append((adj, peso, novo_estado, permit))
-                else:
-                    lista.append((adj, peso, estado, permit))
-            self.grafo.m_graph[nome_no] = lista
-        
-        atualizar(nome_no_origem, nome_no_destino)
-        if not self.grafo.m_directed:
-            atualizar(nome_no_destino, nome_no_origem)
\ No newline at end of file
+        #atualiza estado no caminho (nas duas direções, se o grafo não for direcionado)
+        if novo_estado:
+            self.grafo.bloquear_aresta(nome_no_origem, nome_no_destino)
+        else:
+            self.grafo.desbloquear_aresta(nome_no_origem, nome_no_destino)
@@ -1,8 +1,28 @@
 from meteorologia import Meteorologia
+from estado_nos import CampoEstado
+from diario_alteracoes import AlteracaoNo
+import registo
 
 class No:
+    # Sem __dict__ por instância: com milhões de zonas, a memória por nó conta
+    __slots__ = (
+        "nome", "id", "estado", "observador_prioridade", "diario", "veiculos", "_meteorologia",
+        "_x", "_y", "_populacao", "_janela_tempo", "_medicamento",
+    )
+
+    # Atributos que podem viver num EstadoNos (ver Grafo.usar_estado_vetorial)
+    x = CampoEstado("x")
+    y = CampoEstado("y")
+    populacao = CampoEstado("populacao")
+    janela_tempo = CampoEstado("janela_tempo")
+    medicamento = CampoEstado("medicamento")
+
     def __init__(self, nome, populacao=0, janela_tempo=24, meteorologia=None, x=0, y=0, veiculos=None, medicamento=0):
         self.nome = str(nome)
+        self.id = None
+        self.estado = None  # EstadoNos a que o nó está ligado, se existir
+        self.observador_prioridade = None  # Fila de prioridades do grafo (FilaPrioridadesNos), se existir
+        self.diario = None  # Diário de alterações do grafo (DiarioAlteracoes), que regista cada alteração do nó
         self.x = x
         self.y = y
         self.populacao = populacao        
@@ -11,6 +31,54 @@ class No:
         self.veiculos = veiculos if veiculos else []
         self.medicamento = medicamento
 
+    @classmethod
+    def vista_estado(cls, nome, estado, id_no, veiculos):
+        """
+        Cria o nó como vista sobre a posição id_no de um EstadoNos que já tem os seus valores
+        (por exemplo, as colunas de um mapa compilado), sem os escrever um a um. O nó tem de ser
+        acrescentado ao grafo com esse id.
+        """
+        no = cls.__new__(cls)
+        no.nome = str(nome)
+        no.id = id_no
+        no.estado = estado
+        no.observador_prioridade = None
+        no.diario = None
+        no.veiculos = veiculos
+        no._meteorologia = Meteorologia.vista(no)
+        return no
+
+    def _posicao_estado(self):
+        return self.estado, self.id
+
+    def _estado_alterado(self, campo):
+        # A população e a janela de tempo determinam a prioridade do nó; qualquer alteração é
+        # comunicada à fila de prioridades do grafo.
+        if campo in ("populacao", "janela_tempo"):
+            self.notificar_prioridade()
+        self.notificar_alteracao(campo)
+
+    @property
+    def meteorologia(self):
+        return self._meteorologia
+
+    @meteorologia.setter
+    def meteorologia(self, valor):
+        anterior = getattr(self, "_meteorologia", None)
+        if anterior is not None and anterior is not valor:
+            anterior.ligar_no(None)
+        self._meteorologia = valor
+        valor.ligar_no(self)
+
+    def notificar_prioridade(self):
+        observador = self.observador_prioridade
+        if observador is not None and self.id is not None:
+            observador.atualizar(self)
+
+    def notificar_alteracao(self, campo):
+        if self.diario is not None:
+            self.diario.registar(AlteracaoNo(self.nome, campo))
+
     def __str__(self):
         return f"no {self.nome}"
 
@@ -19,6 +87,12 @@ class No:
 
     def getNome(self):
         return self.nome
+
+    def getId(self):
+        return self.id
+
+    def setId(self, id):
+        self.id = id
     
     def get_coordenadas(self):
         return self.x, self.y
@@ -71,11 +145,9 @@ class No:
         reducoes = (quantidade + 99) // 100  # Divide e arredonda para cima
 
         # Ajustar janelas de tempo globalmente
-        for _ in range(reducoes):
-            grafo.ajustar_janelas_de_tempo()
-            grafo.atualizar_medicamentos_e_populacao()
+        grafo.avancar(reducoes)
 
-        print(f"[FABRICAÇÃO] {quantidade} medicamentos fabricados no nó {self.nome}.")
+        registo.resumo("[FABRICAÇÃO] %s medicamentos fabricados no nó %s.", quantidade, self.nome)
 
     def __eq__(self, other):
         return self.m_name == other.m_name
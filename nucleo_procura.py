@@ -0,0 +1,292 @@
+import heapq
+import itertools
+from collections import deque
+import registo
+import metricas
+
+INF = float('inf')
+
+# Fronteiras
+PILHA = "pilha"
+FILA = "fila"
+HEAP = "heap"
+
+
+class NucleoProcura:
+    """
+    Núcleo comum das procuras em grafo de algoritmos_procura (DFS, BFS, custo uniforme, A* e
+    gulosa), sobre os ids inteiros dos nós e as listas de adjacência de
+    Grafo.get_adjacencia_ids para um tipo de veículo. Os nós fechados, os pais e os custos
+    acumulados (g) ficam em arrays indexados pelo id. A fronteira é escolhida por algoritmo:
+    - PILHA: os sucessores são empilhados por ordem inversa, para serem expandidos pela ordem
+      em que foram gerados;
+    - FILA: deque, por ordem de geração;
+    - HEAP: pela chave prioridade(id, g) (g por omissão), desempatada pela ordem alfabética
+      dos nomes (desempate="nome") ou pela ordem de geração (desempate="ordem").
+
+    O resto da configuração é feito por ganchos e opções:
+    - aceitar(atual, vizinho, peso, g): se retornar False, a aresta é ignorada (combustível,
+      velocidade, heurística infinita);
+    - expandir(atual): se retornar False, o nó é fechado sem gerar sucessores (limites);
+    - ordenar_sucessores: os sucessores são gerados por ordem alfabética dos nomes;
+    - relaxar: um sucessor só entra na fronteira quando o seu g melhora, e o pai e o g de cada
+      nó são os da melhor geração (custo uniforme, A*); sem esta opção, cada entrada da
+      fronteira leva o seu pai e o seu g;
+    - desempate_caminhos: com relaxar, num empate de g fica o pai cujo caminho é menor na
+      ordem dos nomes (o mesmo que comparar as listas de caminhos);
+    - irrevogavel: a fronteira é esvaziada antes de cada expansão gerar sucessores (gulosa).
+
+    A procura termina quando o objetivo é expandido ou a fronteira fica vazia; as validações
+    da solução encontrada ficam com cada algoritmo.
+    """
+
+    def __init__(self, grafo, veiculo_tipo, fronteira, prioridade=None, desempate="nome", aceitar=None,
+                 expandir=None, ordenar_sucessores=False, relaxar=False, desempate_caminhos=False,
+                 irrevogavel=False, registar_expansoes=False, rotulo="Procura"):
+        self.grafo = grafo
+        self.adjacencia = grafo.get_adjacencia_ids(veiculo_tipo)
+        self.ordem_nomes = grafo.get_ordem_nomes()
+        self.fronteira = fronteira
+        self.prioridade = prioridade
+        self.desempate = desempate
+        self.aceitar = aceitar
+        self.expandir = expandir
+        self.ordenar_sucessores = ordenar_sucessores
+        self.relaxar = relaxar
+        self.desempate_caminhos = desempate_caminhos
+        self.irrevogavel = irrevogavel
+        self.registar_expansoes = registar_expansoes
+        self.rotulo = rotulo
+
+        self.fechados = None
+        self.pais = None  # Pai de cada nó na árvore de procura (-1 na raiz e nos não alcançados)
+        self.custos = None  # g de cada nó (INF nos não alcançados)
+        self.expandidos = []  # Ordem de expansão (se registar_expansoes)
+
+    def nome(self, id_no):
+        return self.grafo.m_nodes[id_no].getNome()
+
+    def caminho(self, id_no):
+        """
+        Reconstrói o caminho (nomes) da raiz da árvore de procura até ao nó, seguindo os pais.
+        """
+        metricas.caminhos_materializados += 1
+        caminho = []
+        while id_no != -1:
+            caminho.append(self.nome(id_no))
+            id_no = self.pais[id_no]
+        caminho.reverse()
+        return caminho
+
+    def _ordem_caminho(self, id_no):
+        ordem = []
+        while id_no != -1:
+            ordem.append(self.ordem_nomes[id_no])
+            id_no = self.pais[id_no]
+        ordem.reverse()
+        return ordem
+
+    def executar(self, origem, objetivo):
+        """
+        Procura a partir do nó origem (id) até expandir objetivo (id). Retorna o id do objetivo,
+        ou None se a fronteira esvaziar antes; a árvore fica em pais e custos.
+        """
+        n = len(self.adjacencia)
+        self.fechados = fechados = bytearray(n)
+        self.pais = pais = [-1] * n
+        self.custos = custos = [INF] * n
+        self.expandidos = []
+        custos[origem] = 0
+
+        adjacencia = self.adjacencia
+        ordem_nomes = self.ordem_nomes
+        aceitar = self.aceitar
+        relaxar = self.relaxar
+        usa_heap = self.fronteira == HEAP
+        usa_pilha = self.fronteira == PILHA
+        contador = itertools.count()
+        trace = registo.ativo(registo.TRACE)
+
+        if usa_heap:
+            fronteira = [(0, 0, origem, -1, 0)]  # (chave, desempate, nó, pai, g)
+        else:
+            fronteira = deque([(origem, -1, 0)])  # (nó, pai, g)
+
+        while fronteira:
+            if usa_heap:
+                _, _, atual, pai, g = heapq.heappop(fronteira)
+            elif usa_pilha:
+                atual, pai, g = fronteira.pop()
+            else:
+                atual, pai, g = fronteira.popleft()
+
+            if fechados[atual]:
+                continue
+            fechados[atual] = 1
+            if relaxar:
+                g = custos[atual]
+            else:
+                pais[atual] = pai
+                custos[atual] = g
+            metricas.nos_expandidos += 1
+            if self.registar_expansoes:
+                self.expandidos.append(atual)
+            if trace:
+                registo.trace("%s: Visitando %s, g: %s, Caminho atual: %s", self.rotulo, self.nome(atual), g, self.caminho(atual))
+
+            if atual == objetivo:
+                return atual
+
+            if self.expandir is not None and not self.expandir(atual):
+                continue
+
+            sucessores = adjacencia[atual]
+            if self.ordenar_sucessores:
+                sucessores = sorted(sucessores, key=lambda aresta: ordem_nomes[aresta[0]])
+
+            gerados = []
+            for vizinho, peso in sucessores:
+                if not relaxar and fechados[vizinho]:
+                    continue
+                novo = g + peso
+                if aceitar is not None and not aceitar(atual, vizinho, peso, novo):
+                    continue
+                if relaxar:
+                    if novo < custos[vizinho]:
+                        custos[vizinho] = novo
+                        pais[vizinho] = atual
+                    else:
+                        if (self.desempate_caminhos and novo == custos[vizinho] and not fechados[vizinho]
+                                and self._ordem_caminho(atual) < self._ordem_caminho(pais[vizinho])):
+                            pais[vizinho] = atual  # A entrada na fronteira tem a mesma chave
+                        continue
+                gerados.append((vizinho, novo))
+
+            if self.irrevogavel:
+                fronteira.clear()
+            if usa_pilha:
+                gerados.reverse()
+            for vizinho, novo in gerados:
+                if usa_heap:
+                    chave = novo if self.prioridade is None else self.prioridade(vizinho, novo)
+                    desempate = ordem_nomes[vizinho] if self.desempate == "nome" else next(contador)
+                    heapq.heappush(fronteira, (chave, desempate, vizinho, atual, novo))
+                else:
+                    fronteira.append((vizinho, atual, novo))
+                if trace:
+                    registo.trace("Vizinho %s adicionado à fronteira a partir de %s, g: %s",
+                        self.nome(vizinho), self.nome(atual), novo)
+
+        return None
+
+
+class AprofundamentoIterativo:
+    """
+    Procura em profundidade com aprofundamento iterativo sobre ids, em memória O(profundidade):
+    guarda apenas o caminho atual, o g de cada nível, um iterador dos sucessores por nível e o
+    conjunto dos nós do caminho (para evitar ciclos), sem árvore nem fronteira. Dois modos:
+    - por profundidade (h None): limites 0, 1, 2, ... no número de arestas do caminho; a
+      primeira solução tem o menor número de arestas;
+    - IDA* (h(id) dada): limite em f = g + h, que começa em h(origem) e passa, em cada
+      iteração, para o menor f que excedeu o limite anterior; com h admissível, a primeira
+      solução tem a menor soma das arestas.
+
+    aceitar(atual, vizinho, peso, g) tem o mesmo papel que em NucleoProcura. As iterações
+    terminam quando nenhum nó excedeu o limite (a procura já não vai mais longe).
+
+    Como não há memória dos nós já visitados, o número de expansões cresce com o número de
+    caminhos sem ciclos dentro do limite, que num mapa com muitos ciclos e uma heurística
+    fraca é exponencial; max_expansoes (total, somando as iterações) interrompe a procura.
+    """
+
+    def __init__(self, grafo, veiculo_tipo, h=None, aceitar=None, max_expansoes=None, rotulo="Aprofundamento"):
+        self.grafo = grafo
+        self.adjacencia = grafo.get_adjacencia_ids(veiculo_tipo)
+        self.h = h
+        self.aceitar = aceitar
+        self.max_expansoes = INF if max_expansoes is None else max_expansoes
+        self.rotulo = rotulo
+        self.iteracoes = 0
+        self.expansoes = 0
+        self.interrompida = False  # True se a procura parou por exceder max_expansoes
+        self.custo = None  # Soma das arestas do caminho encontrado
+
+    def nomes(self, caminho):
+        return [self.grafo.m_nodes[id_no].getNome() for id_no in caminho]
+
+    def executar(self, origem, objetivo, limite_maximo=INF):
+        """
+        Retorna o caminho (ids) de origem a objetivo, ou None se não existir com o limite
+        (profundidade ou f) até limite_maximo.
+        """
+        limite = 0 if self.h is None else self.h(origem)
+        self.iteracoes = 0
+        self.expansoes = 0
+        self.interrompida = False
+        while limite <= limite_maximo and limite != INF and not self.interrompida:
+            self.iteracoes += 1
+            registo.debug("%s: iteração %s com limite %s", self.rotulo, self.iteracoes, limite)
+            caminho, limite = self._procura_limitada(origem, objetivo, limite)
+            if caminho is not None:
+                return caminho
+        return None
+
+    def _procura_limitada(self, origem, objetivo, limite):
+        """
+        Uma iteração em profundidade até ao limite. Retorna (caminho ou None, próximo limite).
+        """
+        metricas.nos_expandidos += 1
+        self.expansoes += 1
+        if origem == objetivo:
+            self.custo = 0
+            return [origem], INF
+
+        adjacencia = self.adjacencia
+        h = self.h
+        aceitar = self.aceitar
+        trace = registo.ativo(registo.TRACE)
+        caminho = [origem]
+        custos = [0]
+        no_caminho = {origem}
+        sucessores = [iter(adjacencia[origem])]
+        proximo = INF
+
+        while sucessores:
+            aresta = next(sucessores[-1], None)
+            if aresta is None:
+                sucessores.pop()
+                custos.pop()
+                no_caminho.discard(caminho.pop())
+                continue
+
+            atual = caminho[-1]
+            vizinho, peso = aresta
+            if vizinho in no_caminho:
+                continue
+            g = custos[-1] + peso
+            if aceitar is not None and not aceitar(atual, vizinho, peso, g):
+                continue
+            f = len(caminho) if h is None else g + h(vizinho)
+            if f > limite:
+                proximo = min(proximo, f)
+                continue
+
+            if self.expansoes >= self.max_expansoes:
+                registo.debug("%s: procura interrompida ao fim de %s expansões", self.rotulo, self.expansoes)
+                self.interrompida = True
+                return None, INF
+            metricas.nos_expandidos += 1
+            self.expansoes += 1
+            caminho.append(vizinho)
+            if trace:
+                registo.trace("%s: Visitando %s, g: %s, f: %s, Caminho atual: %s",
+                    self.rotulo, self.grafo.m_nodes[vizinho].getNome(), g, f, self.nomes(caminho))
+            if vizinho == objetivo:
+                self.custo = g
+                return caminho, proximo
+
+            custos.append(g)
+            no_caminho.add(vizinho)
+            sucessores.append(iter(adjacencia[vizinho]))
+
+        return None, proximo
@@ -0,0 +1,136 @@
+import heapq
+import registo
+import metricas
+from diario_alteracoes import AlteracaoGeral
+
+INF = float('inf')
+
+
+class PlaneadorIncremental:
+    """
+    Planeador incremental LPA* (Lifelong Planning A*) com heurística nula, para uma origem e
+    um tipo de veículo.
+
+    Mantém entre chamadas, para cada nó, g (distância atual) e rhs (a melhor distância possível
+    segundo os predecessores). Um nó está consistente quando g == rhs; só os nós inconsistentes
+    estão na fila. Quando uma aresta muda, apenas os seus extremos são reavaliados, e a próxima
+    consulta repara a árvore de caminhos mais curtos a partir daí, com um custo proporcional à
+    zona afetada pela alteração e não ao tamanho do mapa.
+
+    Como a heurística é nula, as chaves não dependem do destino: o mesmo planeador serve
+    qualquer destino (por exemplo, o nó de maior prioridade, que muda com a população),
+    expandindo apenas o necessário para esse destino ficar consistente.
+    """
+
+    def __init__(self, grafo, inicio, tipo):
+        self.grafo = grafo
+        self.inicio = inicio
+        self.tipo = tipo
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self.g = {}
+        self.rhs = {self.inicio: 0}
+        self.chaves = {}  # {nó: chave} dos nós na fila; as entradas do heap com outra chave são obsoletas
+        self.fila = []
+        self._inserir(self.inicio, 0)
+
+    def _inserir(self, nodo, chave):
+        self.chaves[nodo] = chave
+        heapq.heappush(self.fila, (chave, nodo))
+
+    def _topo(self):
+        """
+        Retorna (chave, nó) do topo da fila, descartando entradas obsoletas, ou (INF, None).
+        """
+        while self.fila:
+            chave, nodo = self.fila[0]
+            if self.chaves.get(nodo) == chave:
+                return chave, nodo
+            heapq.heappop(self.fila)
+        return INF, None
+
+    def _calcular_rhs(self, nodo):
+        return min(
+            (self.g.get(predecessor, INF) + peso for predecessor, peso in self.grafo.getPredecessores(nodo, self.tipo)),
+            default=INF,
+        )
+
+    def _atualizar_no(self, nodo):
+        if nodo != self.inicio:
+            self.rhs[nodo] = self._calcular_rhs(nodo)
+        self.chaves.pop(nodo, None)
+        g, rhs = self.g.get(nodo, INF), self.rhs.get(nodo, INF)
+        if g != rhs:
+            self._inserir(nodo, min(g, rhs))
+
+    def _calcular_caminhos(self, fim):
+        """
+        Expande nós inconsistentes até fim ficar consistente e nenhum nó na fila o poder melhorar.
+        """
+        while True:
+            chave, nodo = self._topo()
+            g_fim, rhs_fim = self.g.get(fim, INF), self.rhs.get(fim, INF)
+            if nodo is None or (chave >= min(g_fim, rhs_fim) and g_fim == rhs_fim):
+                return
+
+            heapq.heappop(self.fila)
+            del self.chaves[nodo]
+            metricas.nos_expandidos += 1
+            registo.trace("LPA*: Expandindo %s, g: %s, rhs: %s", nodo, self.g.get(nodo, INF), self.rhs.get(nodo, INF))
+
+            sucessores = [adjacente for adjacente, _ in self.grafo.getNeighbours(nodo, self.tipo)]
+            if self.g.get(nodo, INF) > self.rhs[nodo]:
+                # Sobreconsistente: a distância diminuiu e fica fixada
+                self.g[nodo] = self.rhs[nodo]
+            else:
+                # Subconsistente: a distância aumentou; o nó e os sucessores são reavaliados
+                self.g[nodo] = INF
+                sucessores.append(nodo)
+
+            for sucessor in sucessores:
+                self._atualizar_no(sucessor)
+
+    def aplicar_alteracao(self, alteracao):
+        """
+        Subscritor das alterações de arestas do grafo (ver Grafo.subscrever_alteracoes): só as
+        alterações que mudam as arestas acessíveis ao tipo de veículo reavaliam os extremos.
+        """
+        if isinstance(alteracao, AlteracaoGeral):
+            if alteracao.motivo == "arestas":
+                self._reiniciar()
+            return
+        if self.tipo not in self.grafo.tipos_afetados(alteracao):
+            return
+
+        self._atualizar_no(alteracao.destino)
+        if not self.grafo.m_directed:
+            # Os predecessores vêm dos registos da direção inversa, que podem mudar em separado
+            self._atualizar_no(alteracao.origem)
+
+    def caminho_mais_curto(self, fim):
+        """
+        Retorna (distância, caminho) de inicio a fim para o tipo de veículo, ou (INF, None).
+        """
+        self._calcular_caminhos(fim)
+        distancia = self.g.get(fim, INF)
+        if distancia == INF:
+            return INF, None
+
+        # Recuar pelos predecessores que realizam g (a árvore está consistente até fim)
+        caminho = [fim]
+        visitados = {fim}
+        while caminho[-1] != self.inicio:
+            atual = caminho[-1]
+            anterior = min(
+                self.grafo.getPredecessores(atual, self.tipo),
+                key=lambda aresta: self.g.get(aresta[0], INF) + aresta[1],
+            )[0]
+            if anterior in visitados:
+                registo.debug("[ERRO] LPA*: ciclo ao reconstruir o caminho até %s.", fim)
+                return INF, None
+            visitados.add(anterior)
+            caminho.append(anterior)
+
+        caminho.reverse()
+        return distancia, caminho
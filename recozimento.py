@@ -0,0 +1,162 @@
+import math
+import random
+import registo
+import metricas
+
+INF = float('inf')
+
+
+class CadeiaRecozimento:
+    """
+    Estado de uma cadeia de simulated annealing para o modo multi-cadeia.
+
+    Cada caminhada parte de uma origem e de um veículo escolhidos com o gerador da cadeia, e
+    avança como em algoritmos_procura.simulated_annealing: o candidato é o vizinho com melhor
+    heurística e é aceite se melhorar ou com probabilidade exp(-diferença / T), com
+    T = temperatura / (passo + 1). Quando a caminhada chega ao destino, fica sem vizinhos ou o
+    candidato excede o combustível ou a velocidade do veículo, a cadeia recomeça a partir de
+    uma nova origem, guardando o melhor plano encontrado.
+
+    O estado é serializável (incluindo o gerador), para poder avançar em processos diferentes
+    entre trocas de estado (parallel tempering).
+    """
+
+    def __init__(self, indice, temperatura, semente):
+        self.indice = indice
+        self.temperatura = temperatura
+        self.semente = semente
+        self.rng = random.Random(semente)
+
+        # Caminhada atual
+        self.origem = None
+        self.indice_veiculo = None
+        self.caminho = None
+        self.custo_atual = 0
+        self.passo = 0
+
+        # Melhor plano: (custo, origem, índice do veículo em Grafo.get_veiculos_no(origem), caminho)
+        self.melhor = (INF, None, None, None)
+
+        # Estatísticas de convergência
+        self.iteracoes = 0
+        self.aceitacoes = 0
+        self.rejeicoes = 0
+        self.reinicios = 0
+        self.trocas = 0
+        self.iteracao_melhor = None
+        self.historico = []  # [(iteração, melhor custo)] sempre que o melhor custo desce
+        self.esgotada = False  # Sem origens válidas
+
+    def _iniciar_caminhada(self, grafo, destino):
+        origens = [
+            no for no in grafo.m_nodes
+            if no.getNome() != destino and no.janela_tempo != 0 and no.get_medicamento() != 0
+            and no.get_veiculos()
+        ]
+        if not origens:
+            self.esgotada = True
+            return
+
+        no_origem = self.rng.choice(origens)
+        self.origem = no_origem.getNome()
+        self.indice_veiculo = self.rng.randrange(len(grafo.get_veiculos_no(self.origem)))
+        self.caminho = [self.origem]
+        self.custo_atual = 0
+        self.passo = 0
+        self.reinicios += 1
+        registo.trace("Cadeia %s: nova caminhada a partir de %s", self.indice, self.origem)
+
+    def energia(self, grafo, destino):
+        """
+        Avaliação heurística do nó atual (a mesma usada na aceitação), ou None fora de uma caminhada.
+        """
+        if self.caminho is None:
+            return None
+        return grafo.calcula_heuristica(grafo.get_node_by_name(self.caminho[-1]), grafo.get_node_by_name(destino))
+
+    def trocar_estado(self, outra):
+        """
+        Troca a caminhada atual com a de outra cadeia (as temperaturas ficam).
+        """
+        for atributo in ("origem", "indice_veiculo", "caminho", "custo_atual", "passo"):
+            valor = getattr(self, atributo)
+            setattr(self, atributo, getattr(outra, atributo))
+            setattr(outra, atributo, valor)
+        self.trocas += 1
+        outra.trocas += 1
+
+    def avancar(self, grafo, destino, passos):
+        """
+        Avança a cadeia um número de iterações.
+        """
+        destino_node = grafo.get_node_by_name(destino)
+        for _ in range(passos):
+            if self.caminho is None:
+                self._iniciar_caminhada(grafo, destino)
+                if self.esgotada:
+                    return
+            self.iteracoes += 1
+            metricas.nos_expandidos += 1
+            self._passo(grafo, destino, destino_node)
+
+    def _passo(self, grafo, destino, destino_node):
+        atual = grafo.get_node_by_name(self.caminho[-1])
+        veiculo = grafo.get_veiculos_no(self.origem)[self.indice_veiculo]
+
+        vizinhos = [
+            adjacente
+            for adjacente, _ in grafo.getNeighbours(atual.getNome(), veiculo.get_tipo())
+            if adjacente not in self.caminho
+        ]
+        if not vizinhos:
+            self.caminho = None
+            return
+
+        candidato = min(vizinhos, key=lambda nome: grafo.calcula_heuristica(grafo.get_node_by_name(nome), destino_node))
+        candidato_no = grafo.get_node_by_name(candidato)
+        caminho_candidato = self.caminho + [candidato]
+
+        # Verificar combustível e velocidade; o candidato seria sempre o mesmo, pelo que a
+        # caminhada termina
+        custo_acumulado = grafo.calcula_acumulado_arestas(caminho_candidato, veiculo)
+        if custo_acumulado == INF or custo_acumulado > veiculo.get_combustivel_disponivel() or (
+            candidato_no.janela_tempo > 0 and custo_acumulado / candidato_no.janela_tempo > veiculo.get_velocidade()
+        ):
+            self.rejeicoes += 1
+            self.caminho = None
+            return
+
+        diferenca = grafo.calcula_heuristica(candidato_no, destino_node) - grafo.calcula_heuristica(atual, destino_node)
+        temperatura = self.temperatura / float(self.passo + 1)
+        self.passo += 1
+
+        if diferenca < 0 or (temperatura > 0 and self.rng.random() < math.exp(min(0.0, -diferenca / temperatura))):
+            self.aceitacoes += 1
+            self.caminho = caminho_candidato
+            self.custo_atual, _ = grafo.calcula_custo(caminho_candidato, veiculo)
+        else:
+            self.rejeicoes += 1
+            return
+
+        if candidato == destino:
+            if self.custo_atual < self.melhor[0]:
+                self.melhor = (self.custo_atual, self.origem, self.indice_veiculo, list(self.caminho))
+                self.iteracao_melhor = self.iteracoes
+                self.historico.append((self.iteracoes, self.custo_atual))
+                registo.debug("Cadeia %s: novo melhor caminho %s com custo %s", self.indice, self.caminho, self.custo_atual)
+            self.caminho = None
+
+    def estatisticas(self):
+        return {
+            "cadeia": self.indice,
+            "semente": self.semente,
+            "temperatura": self.temperatura,
+            "iteracoes": self.iteracoes,
+            "aceitacoes": self.aceitacoes,
+            "rejeicoes": self.rejeicoes,
+            "reinicios": self.reinicios,
+            "trocas": self.trocas,
+            "melhor_custo": self.melhor[0],
+            "iteracao_melhor": self.iteracao_melhor,
+            "historico": list(self.historico),
+        }
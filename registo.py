@@ -0,0 +1,92 @@
+import os
+
+# Níveis de registo, do mais silencioso ao mais detalhado
+SILENCIOSO = 0  # Nenhuma mensagem
+RESUMO = 1  # Erros, avisos e resultados finais das procuras
+DEBUG = 2  # Validações de caminhos, custos e transferências
+TRACE = 3  # Cada expansão/visita de nó e cada aresta carregada
+
+NIVEIS = {
+    "silencioso": SILENCIOSO,
+    "resumo": RESUMO,
+    "debug": DEBUG,
+    "trace": TRACE,
+}
+
+VARIAVEL_AMBIENTE = "IA_NIVEL_REGISTO"
+NIVEL_POR_OMISSAO = RESUMO
+
+
+def converter_nivel(nivel):
+    """
+    Converte um nível dado como inteiro, nome ("debug") ou texto numérico ("2") para inteiro.
+    """
+    if isinstance(nivel, int):
+        valor = nivel
+    else:
+        texto = str(nivel).strip().lower()
+        valor = NIVEIS.get(texto)
+        if valor is None and texto.isdigit():
+            valor = int(texto)
+
+    if valor is None or not SILENCIOSO <= valor <= TRACE:
+        raise ValueError(f"Nível de registo inválido: {nivel!r}. Use um de {', '.join(NIVEIS)}.")
+    return valor
+
+
+def _nivel_inicial():
+    valor = os.environ.get(VARIAVEL_AMBIENTE)
+    if not valor:
+        return NIVEL_POR_OMISSAO
+    try:
+        return converter_nivel(valor)
+    except ValueError as erro:
+        print(f"[AVISO] {erro} A usar o nível '{nome_nivel(NIVEL_POR_OMISSAO)}'.")
+        return NIVEL_POR_OMISSAO
+
+
+def nome_nivel(nivel):
+    for nome, valor in NIVEIS.items():
+        if valor == nivel:
+            return nome
+    return str(nivel)
+
+
+def definir_nivel(nivel):
+    """
+    Define o nível de registo ativo (inteiro ou nome).
+    """
+    global _nivel
+    _nivel = converter_nivel(nivel)
+
+
+def get_nivel():
+    return _nivel
+
+
+def ativo(nivel):
+    """
+    Indica se as mensagens do nível dado são emitidas. Deve ser usado para proteger
+    mensagens cujos argumentos sejam caros de calcular.
+    """
+    return nivel <= _nivel
+
+
+# As mensagens usam formatação com '%' e argumentos separados, de modo a que a
+# construção do texto só aconteça quando o nível está ativo.
+def resumo(mensagem, *args):
+    if _nivel >= RESUMO:
+        print(mensagem % args if args else mensagem)
+
+
+def debug(mensagem, *args):
+    if _nivel >= DEBUG:
+        print(mensagem % args if args else mensagem)
+
+
+def trace(mensagem, *args):
+    if _nivel >= TRACE:
+        print(mensagem % args if args else mensagem)
+
+
+_nivel = _nivel_inicial()
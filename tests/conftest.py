@@ -0,0 +1,86 @@
+import os
+import sys
+import contextlib
+import io
+import random
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import pytest
+
+PASTA_DATA = os.path.join(RAIZ, "data")
+CARACTERISTICAS = os.path.join(PASTA_DATA, "caracteristicas_dos_veiculos.json")
+MAPAS_DATA = sorted(os.path.join(PASTA_DATA, ficheiro) for ficheiro in os.listdir(PASTA_DATA)
+                    if ficheiro.endswith(".json") and ficheiro != "caracteristicas_dos_veiculos.json")
+
+
+@pytest.fixture
+def carregar():
+    """
+    Retorna uma função que carrega um mapa da pasta data (ou um caminho qualquer) sem
+    mensagens nem desenho.
+    """
+    from menu import carregar_grafo
+
+    def carregar_mapa(ficheiro, **opcoes):
+        if not os.path.exists(ficheiro):
+            ficheiro = os.path.join(PASTA_DATA, ficheiro)
+        with contextlib.redirect_stdout(io.StringIO()):
+            grafo = carregar_grafo(ficheiro, CARACTERISTICAS, **opcoes)
+        grafo.desenho_ativo = False
+        return grafo
+
+    return carregar_mapa
+
+
+@pytest.fixture(scope="session")
+def mapas(tmp_path_factory):
+    """
+    Mapas da pasta data mais um mapa gerado (gerador_mapas) de cada tipo, com 150 nós.
+    """
+    from gerador_mapas import TIPOS_MAPA, gerar_mapa, guardar_mapa
+
+    pasta = tmp_path_factory.mktemp("mapas")
+    gerados = []
+    for tipo in TIPOS_MAPA:
+        ficheiro = str(pasta / f"{tipo}.json")
+        guardar_mapa(gerar_mapa(tipo, 150, semente=1), ficheiro)
+        gerados.append(ficheiro)
+    return MAPAS_DATA + gerados
+
+
+@pytest.fixture
+def consultas():
+    """
+    Retorna uma função que escolhe, de forma reprodutível, pares (origem, destino) com a
+    origem num nó com veículos e o destino num nó qualquer.
+    """
+    def escolher(grafo, n_consultas, semente=0):
+        rng = random.Random(semente)
+        nomes = [no.getNome() for no in grafo.m_nodes]
+        origens = [nome for nome in nomes if grafo.get_veiculos_no(nome)]
+        return [(rng.choice(origens), rng.choice(nomes)) for _ in range(n_consultas)] if origens else []
+
+    return escolher
+
+
+@pytest.fixture
+def distancias():
+    """
+    Retorna uma função que converte a saída de uma função _caminhos_* de algoritmos_procura
+    em {tipo_veiculo: distância}, verificando que cada caminho liga os extremos e que a
+    soma das suas arestas é a distância indicada.
+    """
+    def por_veiculo(grafo, inicio, fim, caminhos):
+        resultado = {}
+        for veiculo, caminho, distancia in caminhos:
+            assert caminho[0] == inicio and caminho[-1] == fim
+            assert grafo.calcula_acumulado_arestas(caminho, veiculo) == pytest.approx(distancia)
+            resultado[veiculo.get_tipo()] = distancia
+        return resultado
+
+    return por_veiculo
@@ -0,0 +1,26 @@
+import pytest
+
+from algoritmos_procura import (_caminhos_CustoUniforme, _caminhos_CustoUniforme_bidirecional,
+                                _caminhos_aStar_bidirecional)
+
+
+@pytest.mark.parametrize("caminhos_bidirecional", [_caminhos_CustoUniforme_bidirecional, _caminhos_aStar_bidirecional])
+def test_caminhos_iguais_aos_do_custo_uniforme(mapas, carregar, consultas, distancias, caminhos_bidirecional):
+    for mapa in mapas:
+        grafo = carregar(mapa)
+        for inicio, fim in consultas(grafo, 20):
+            esperadas = distancias(grafo, inicio, fim, _caminhos_CustoUniforme(grafo, inicio, fim))
+            obtidas = distancias(grafo, inicio, fim, caminhos_bidirecional(grafo, inicio, fim))
+            assert obtidas == pytest.approx(esperadas), (mapa, inicio, fim)
+
+
+def test_caminhos_iguais_aos_do_custo_uniforme_com_estradas_bloqueadas(carregar, consultas, distancias):
+    grafo = carregar("grafo_grande_sem_restricoes.json")
+    for origem, destino in list(grafo.m_arestas)[::3]:
+        grafo.bloquear_aresta(origem, destino)
+
+    for inicio, fim in consultas(grafo, 30, semente=1):
+        esperadas = distancias(grafo, inicio, fim, _caminhos_CustoUniforme(grafo, inicio, fim))
+        for caminhos_bidirecional in (_caminhos_CustoUniforme_bidirecional, _caminhos_aStar_bidirecional):
+            obtidas = distancias(grafo, inicio, fim, caminhos_bidirecional(grafo, inicio, fim))
+            assert obtidas == pytest.approx(esperadas), (inicio, fim)
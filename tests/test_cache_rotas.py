@@ -0,0 +1,39 @@
+from algoritmos_procura import procura_CustoUniforme, procura_aStar
+from cache_rotas import CacheRotas
+
+
+def test_pedido_repetido_com_sucesso_acerta_na_cache(carregar):
+    grafo = carregar("grafo_arvore_sem_restricoes.json")
+    referencia = carregar("grafo_arvore_sem_restricoes.json")
+    rotas = CacheRotas(grafo)
+
+    primeira = rotas.procurar(procura_CustoUniforme, "A", "I")
+    assert primeira is not None
+    assert (rotas.acertos, rotas.falhas) == (0, 1)
+    assert primeira == procura_CustoUniforme(referencia, "A", "I")
+
+    medicamento = grafo.get_node_by_name("A").get_medicamento()
+    segunda = rotas.procurar(procura_CustoUniforme, "A", "I")
+    assert (rotas.acertos, rotas.falhas) == (1, 1)
+    assert segunda == procura_CustoUniforme(referencia, "A", "I")
+    # Num acerto a distribuição dos medicamentos continua a ser feita
+    assert grafo.get_node_by_name("A").get_medicamento() < medicamento
+
+
+def test_alteracao_das_arestas_invalida_a_cache(carregar):
+    grafo = carregar("grafo_arvore_sem_restricoes.json")
+    rotas = CacheRotas(grafo)
+
+    rotas.procurar(procura_aStar, "A", "I")
+    grafo.bloquear_aresta("A", "H")
+    assert rotas.procurar(procura_aStar, "A", "I") is None
+    assert (rotas.acertos, rotas.falhas) == (0, 2)
+
+
+def test_distribuicao_nao_muda_a_versao_das_rotas(carregar):
+    grafo = carregar("grafo_arvore_sem_restricoes.json")
+    versao, versao_rotas = grafo.get_versao(), grafo.get_versao_rotas()
+
+    procura_CustoUniforme(grafo, "A", "I")
+    assert grafo.get_versao() > versao
+    assert grafo.get_versao_rotas() == versao_rotas
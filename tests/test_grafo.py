@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+
+def _estado(grafo):
+    return [(no.populacao, no.janela_tempo, no.get_medicamento()) for no in grafo.m_nodes]
+
+
+@pytest.mark.parametrize("usar_estado_vetorial", [False, True])
+def test_avancar_igual_a_passos_individuais(mapas, carregar, usar_estado_vetorial):
+    rng = random.Random(5)
+    for mapa in mapas:
+        um_a_um = carregar(mapa, usar_estado_vetorial=usar_estado_vetorial)
+        de_uma_vez = carregar(mapa, usar_estado_vetorial=usar_estado_vetorial)
+        for _ in range(10):
+            for posicao in range(len(um_a_um.m_nodes)):
+                if rng.random() < 0.3:
+                    populacao, janela, medicamento = rng.randint(0, 100), rng.randint(0, 30), rng.randint(0, 100)
+                    for grafo in (um_a_um, de_uma_vez):
+                        no = grafo.m_nodes[posicao]
+                        no.populacao = populacao
+                        no.janela_tempo = janela
+                        no.set_medicamento(medicamento)
+
+            passos = rng.randint(0, 40)
+            for _ in range(passos):
+                um_a_um.ajustar_janelas_de_tempo()
+                um_a_um.atualizar_medicamentos_e_populacao()
+            de_uma_vez.avancar(passos)
+
+            assert _estado(de_uma_vez) == _estado(um_a_um), (mapa, passos)
+            mais_urgente = um_a_um.get_no_maior_prioridade()
+            assert (de_uma_vez.get_no_maior_prioridade() is None) == (mais_urgente is None)
+            if mais_urgente is not None:
+                assert de_uma_vez.get_no_maior_prioridade().getNome() == mais_urgente.getNome()
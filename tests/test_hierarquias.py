@@ -0,0 +1,49 @@
+import random
+import heapq
+
+import pytest
+
+from algoritmos_procura import _caminhos_CustoUniforme, _caminhos_hierarquias
+from hierarquias import HierarquiaContracao
+
+
+def _dijkstra(n, arestas, origem):
+    adjacencia = [[] for _ in range(n)]
+    for u, v, peso in arestas:
+        adjacencia[u].append((v, peso))
+    distancias = [float("inf")] * n
+    distancias[origem] = 0
+    heap = [(0, origem)]
+    while heap:
+        distancia, u = heapq.heappop(heap)
+        if distancia > distancias[u]:
+            continue
+        for v, peso in adjacencia[u]:
+            if distancia + peso < distancias[v]:
+                distancias[v] = distancia + peso
+                heapq.heappush(heap, (distancias[v], v))
+    return distancias
+
+
+def test_consulta_igual_a_dijkstra_em_grafos_aleatorios():
+    rng = random.Random(1)
+    for _ in range(20):
+        n = rng.randint(2, 80)
+        arestas = [(rng.randrange(n), rng.randrange(n), rng.randint(1, 10)) for _ in range(rng.randint(n, 4 * n))]
+        hierarquia = HierarquiaContracao(n, arestas)
+        for origem in range(0, n, max(1, n // 5)):
+            esperadas = _dijkstra(n, arestas, origem)
+            for destino in range(n):
+                distancia, caminho = hierarquia.consulta(origem, destino)
+                assert distancia == esperadas[destino]
+                if caminho:
+                    assert caminho[0] == origem and caminho[-1] == destino
+
+
+def test_caminhos_iguais_aos_do_custo_uniforme(mapas, carregar, consultas, distancias):
+    for mapa in mapas:
+        grafo = carregar(mapa)
+        for inicio, fim in consultas(grafo, 20):
+            esperadas = distancias(grafo, inicio, fim, _caminhos_CustoUniforme(grafo, inicio, fim))
+            obtidas = distancias(grafo, inicio, fim, _caminhos_hierarquias(grafo, inicio, fim))
+            assert obtidas == pytest.approx(esperadas), (mapa, inicio, fim)
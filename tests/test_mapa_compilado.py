@@ -0,0 +1,86 @@
+import os
+import json
+import random
+
+import pytest
+
+from algoritmos_procura import _caminhos_CustoUniforme
+from estado_nos import CAMPOS_NO, CAMPOS_METEOROLOGIA
+from mapa_compilado import compilar_mapa, validar_mapa
+
+CARACTERISTICAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data",
+                               "caracteristicas_dos_veiculos.json")
+
+
+def _estado(no):
+    return ([getattr(no, campo) for campo in CAMPOS_NO] +
+            [getattr(no.meteorologia, campo) for campo in CAMPOS_METEOROLOGIA])
+
+
+def _adjacencia(grafo):
+    return {nome: [(vizinho, peso, bloqueada, sorted(permitidos)) for vizinho, peso, bloqueada, permitidos in lista]
+            for nome, lista in grafo.m_graph.items()}
+
+
+@pytest.fixture
+def compilados(mapas, carregar, tmp_path):
+    """
+    Pares (grafo lido do JSON, grafo lido do mapa compilado) de cada mapa.
+    """
+    pares = []
+    for posicao, mapa in enumerate(mapas):
+        pasta = compilar_mapa(mapa, str(tmp_path / f"{posicao}.mapa"), CARACTERISTICAS)
+        pares.append((carregar(mapa, usar_estado_vetorial=True), carregar(pasta)))
+    return pares
+
+
+def test_mapa_compilado_igual_ao_json(compilados):
+    for original, compilado in compilados:
+        assert [no.getNome() for no in compilado.m_nodes] == [no.getNome() for no in original.m_nodes]
+        for no_original, no_compilado in zip(original.m_nodes, compilado.m_nodes):
+            assert _estado(no_compilado) == _estado(no_original), no_original.getNome()
+            assert ([veiculo.get_tipo() for veiculo in no_compilado.get_veiculos()] ==
+                    [veiculo.get_tipo() for veiculo in no_original.get_veiculos()])
+        assert compilado.veiculos_carregados == original.veiculos_carregados
+        assert _adjacencia(compilado) == _adjacencia(original)
+        assert dict(compilado.m_arestas) == dict(original.m_arestas)
+
+
+def test_procuras_e_alteracoes_iguais_ao_json(compilados, consultas, distancias):
+    rng = random.Random(0)
+    for original, compilado in compilados:
+        for inicio, fim in consultas(original, 10):
+            assert (distancias(compilado, inicio, fim, _caminhos_CustoUniforme(compilado, inicio, fim)) ==
+                    distancias(original, inicio, fim, _caminhos_CustoUniforme(original, inicio, fim)))
+
+        arestas = list(original.m_arestas)
+        for _ in range(50):
+            origem, destino = rng.choice(arestas)
+            tipo = rng.choice(original.veiculos_carregados)
+            operacao = rng.randrange(4)
+            for grafo in (original, compilado):
+                if operacao == 0:
+                    grafo.bloquear_aresta(origem, destino)
+                elif operacao == 1:
+                    grafo.desbloquear_aresta(origem, destino)
+                elif operacao == 2:
+                    grafo.permitir_veiculo(origem, destino, tipo)
+                else:
+                    grafo.proibir_veiculo(origem, destino, tipo)
+        assert _adjacencia(compilado) == _adjacencia(original)
+
+        compilado.avancar(3)
+        original.avancar(3)
+        assert [_estado(no) for no in compilado.m_nodes] == [_estado(no) for no in original.m_nodes]
+
+
+def test_mapa_invalido_nao_compila(tmp_path):
+    ficheiro = tmp_path / "invalido.json"
+    ficheiro.write_text(json.dumps({"nos": [{"nome": "A", "populacao": 1, "tempo": 2}],
+                                    "arestas": [{"origem": "A", "destino": "B", "peso": 1, "bloqueada": False,
+                                                 "permitidos": ["carro"]}]}))
+    with open(CARACTERISTICAS) as f:
+        erros, _ = validar_mapa(json.loads(ficheiro.read_text()), json.load(f))
+    assert any("'B'" in erro for erro in erros)
+    with pytest.raises(ValueError):
+        compilar_mapa(str(ficheiro), str(tmp_path / "invalido.mapa"), CARACTERISTICAS)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from matriz_custos import MatrizCustos
+
+
+def _comparar_com_despacho(grafo):
+    matriz = MatrizCustos.a_partir_de_grafo(grafo)
+    comparadas = 0
+    for i, deposito in enumerate(matriz.depositos):
+        linhas = {(linha["destino"], linha["veiculo"]): linha for linha in grafo.despacho(deposito)}
+        for j, zona in enumerate(matriz.zonas):
+            for k, tipo in enumerate(matriz.tipos):
+                linha = linhas.get((zona, tipo))
+                if linha is None:  # Veículo que não existe no depósito, ou a zona é o próprio depósito
+                    continue
+                comparadas += 1
+                assert matriz.viavel[i, j, k] == (linha["motivo"] is None), (deposito, zona, tipo)
+                assert matriz.distancia[i, j, k] == pytest.approx(linha["distancia"]), (deposito, zona, tipo)
+                if linha["motivo"] is None:
+                    assert matriz.custo[i, j, k] == pytest.approx(linha["custo"]), (deposito, zona, tipo)
+                    assert matriz.pessoas[i, j, k] == linha["pessoas_socorridas"], (deposito, zona, tipo)
+                else:
+                    assert np.isinf(matriz.custo[i, j, k])
+    return comparadas
+
+
+def test_igual_ao_despacho(mapas, carregar):
+    assert sum(_comparar_com_despacho(carregar(mapa)) for mapa in mapas) > 0
+
+
+def test_igual_ao_despacho_com_permissoes_alteradas(carregar):
+    grafo = carregar("grafo_grande_sem_restricoes.json")
+    tipos = sorted(grafo.veiculos_carregados)
+    for posicao, (origem, destino) in enumerate(list(grafo.m_arestas)):
+        if posicao % 4 == 0:
+            grafo.bloquear_aresta(origem, destino)
+        elif posicao % 4 == 1:
+            grafo.proibir_veiculo(origem, destino, tipos[posicao % len(tipos)])
+    assert _comparar_com_despacho(grafo) > 0
+
+
+def test_melhor_veiculo_e_o_minimo_por_tipo(carregar):
+    matriz = MatrizCustos.a_partir_de_grafo(carregar("grafo_grande_sem_restricoes.json"))
+    custo, tipos = matriz.melhor_veiculo()
+    assert np.array_equal(custo, matriz.custo.min(axis=2))
+    for (i, j), tipo in np.ndenumerate(tipos):
+        if tipo is None:
+            assert np.isinf(custo[i, j])
+        else:
+            assert matriz.custo[i, j, matriz.tipos.index(tipo)] == custo[i, j]
@@ -0,0 +1,21 @@
+import pytest
+
+from algoritmos_procura import _caminhos_CustoUniforme, _rota_multi_veiculo, escolher_rota
+from benchmark import gerar_consultas
+
+
+def test_custo_igual_ao_do_custo_uniforme(mapas, carregar):
+    resolvidas = 0
+    for mapa in mapas:
+        grafo = carregar(mapa)
+        for inicio, fim in gerar_consultas(grafo, 20, 0):
+            esperada = escolher_rota(grafo, inicio, fim, lambda: _caminhos_CustoUniforme(grafo, inicio, fim))
+            obtida = _rota_multi_veiculo(grafo, inicio, fim)
+            assert (obtida is None) == (esperada is None), (mapa, inicio, fim)
+            if esperada is not None:
+                resolvidas += 1
+                veiculo, caminho, custo, pessoas_socorridas = obtida
+                assert custo == pytest.approx(esperada[2]), (mapa, inicio, fim)
+                assert caminho[0] == inicio and caminho[-1] == fim
+                assert grafo.calcula_custo(caminho, veiculo) == (custo, pessoas_socorridas)
+    assert resolvidas > 0
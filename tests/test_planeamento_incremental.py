@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from algoritmos_procura import _caminhos_CustoUniforme, _caminhos_incremental
+
+
+def _alterar_grafo(grafo, rng, tipos):
+    """
+    Aplica uma alteração aleatória às arestas: bloqueio/desbloqueio, veículo permitido ou
+    proibido, ou uma estrada nova entre nós ainda não ligados (get_arc_cost só vê a primeira
+    de arestas paralelas).
+    """
+    origem, destino = rng.choice(list(grafo.m_arestas))
+    escolha = rng.random()
+    if escolha < 0.4:
+        if grafo.get_aresta(origem, destino)[2]:
+            grafo.desbloquear_aresta(origem, destino)
+        else:
+            grafo.bloquear_aresta(origem, destino)
+    elif escolha < 0.8:
+        if rng.random() < 0.5:
+            grafo.permitir_veiculo(origem, destino, rng.choice(tipos))
+        else:
+            grafo.proibir_veiculo(origem, destino, rng.choice(tipos))
+    else:
+        nomes = [no.getNome() for no in grafo.m_nodes]
+        origem, destino = rng.choice(nomes), rng.choice(nomes)
+        if origem != destino and grafo.get_aresta(origem, destino) is None:
+            grafo.add_edge(origem, destino, rng.randint(1, 50), False, list(tipos))
+
+
+def test_caminhos_iguais_aos_do_custo_uniforme(mapas, carregar, consultas, distancias):
+    for mapa in mapas:
+        grafo = carregar(mapa)
+        for inicio, fim in consultas(grafo, 20):
+            esperadas = distancias(grafo, inicio, fim, _caminhos_CustoUniforme(grafo, inicio, fim))
+            obtidas = distancias(grafo, inicio, fim, _caminhos_incremental(grafo, inicio, fim))
+            assert obtidas == pytest.approx(esperadas), (mapa, inicio, fim)
+
+
+def test_planeador_acompanha_alteracoes_do_grafo(mapas, carregar, distancias):
+    rng = random.Random(3)
+    for mapa in mapas:
+        grafo = carregar(mapa)
+        tipos = sorted(grafo.veiculos_carregados)
+        nomes = [no.getNome() for no in grafo.m_nodes]
+        inicio = next(nome for nome in nomes if grafo.get_veiculos_no(nome))
+        for _ in range(40):
+            _alterar_grafo(grafo, rng, tipos)
+            fim = rng.choice(nomes)
+            esperadas = distancias(grafo, inicio, fim, _caminhos_CustoUniforme(grafo, inicio, fim))
+            obtidas = distancias(grafo, inicio, fim, _caminhos_incremental(grafo, inicio, fim))
+            assert obtidas == pytest.approx(esperadas), (mapa, inicio, fim)
+
+
+def test_planeadores_removidos_da_lru_continuam_corretos(carregar, distancias):
+    rng = random.Random(5)
+    grafo = carregar("grafo_grande_sem_restricoes.json")
+    tipos = sorted(grafo.veiculos_carregados)
+    nomes = [no.getNome() for no in grafo.m_nodes]
+    origens = [nome for nome in nomes if grafo.get_veiculos_no(nome)][:grafo.m_max_planeadores + 2]
+    for _ in range(3):
+        for inicio in origens:
+            _alterar_grafo(grafo, rng, tipos)
+            fim = rng.choice(nomes)
+            esperadas = distancias(grafo, inicio, fim, _caminhos_CustoUniforme(grafo, inicio, fim))
+            obtidas = distancias(grafo, inicio, fim, _caminhos_incremental(grafo, inicio, fim))
+            assert obtidas == pytest.approx(esperadas), (inicio, fim)
+    assert len(grafo.m_planeadores) <= grafo.m_max_planeadores
@@ -1,4 +1,11 @@
 class Veiculo:
+    """
+    Tipo de veículo. As características não mudam depois de carregadas, pelo que uma só
+    instância por tipo é partilhada por todos os nós que têm esse veículo (ver criar_veiculos).
+    """
+
+    __slots__ = ("tipo", "custo", "combustivel_disponivel", "limite_carga", "velocidade")
+
     def __init__(self, tipo, custo, combustivel_disponivel, limite_carga, velocidade):
         self.tipo = tipo
         self.custo = custo
@@ -20,3 +27,20 @@ class Veiculo:
 
     def get_velocidade(self):
         return self.velocidade
+
+
+def criar_veiculos(caracteristicas):
+    """
+    Cria um veículo partilhado (flyweight) por tipo a partir das características carregadas de
+    caracteristicas_dos_veiculos.json. Retorna {tipo: Veiculo}.
+    """
+    return {
+        tipo: Veiculo(
+            tipo=tipo,
+            custo=dados["custo"],
+            combustivel_disponivel=dados["combustivel_disponivel"],
+            limite_carga=dados["limite_carga"],
+            velocidade=dados["velocidade"],
+        )
+        for tipo, dados in caracteristicas.items()
+    }